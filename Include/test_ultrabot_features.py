@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Ultra Trading Bot - Feature Matrix Tests
+Copyright 2025 - Smart Stock Trader
+No row of the batch feature matrix may depend on bars that close after it
+"""
+
+import numpy as np
+import pytest
+
+pytest.importorskip('talib')
+
+from ultrabot_features import D1_TREND_PERIOD, H4_TREND_PERIOD, compute_feature_matrix, higher_tf_trend
+from ultrabot_fakemt5 import RATES_DTYPE
+
+START = 1_600_041_600   # Midnight UTC, so H4 and D1 bars line up with the H1 ones
+
+
+def synthetic_h1(n: int, seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0, 0.004, n)))
+    open_ = np.r_[close[0], close[:-1]]
+    rates = np.zeros(n, dtype=RATES_DTYPE)
+    rates['time'] = START + np.arange(n) * 3600
+    rates['open'] = open_
+    rates['high'] = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.002, n)))
+    rates['low'] = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.002, n)))
+    rates['close'] = close
+    rates['tick_volume'] = rng.integers(100, 1000, n)
+    return rates
+
+
+def aggregate(rates: np.ndarray, hours: int) -> np.ndarray:
+    """Higher-timeframe bars built from complete groups of `hours` H1 bars"""
+    groups = rates[:len(rates) // hours * hours].reshape(-1, hours)
+    out = np.zeros(len(groups), dtype=RATES_DTYPE)
+    out['time'] = groups['time'][:, 0]
+    out['open'] = groups['open'][:, 0]
+    out['high'] = groups['high'].max(axis=1)
+    out['low'] = groups['low'].min(axis=1)
+    out['close'] = groups['close'][:, -1]
+    out['tick_volume'] = groups['tick_volume'].sum(axis=1)
+    return out
+
+
+def test_higher_tf_trend_uses_only_closed_bars():
+    h1 = synthetic_h1(24 * 60, 0)
+    h4 = aggregate(h1, 4)
+    base = higher_tf_trend(h1['time'], h4, H4_TREND_PERIOD)
+
+    # Move one H4 close: only H1 bars closing at or after that H4 bar's close may change
+    k = H4_TREND_PERIOD + 50
+    moved = h4.copy()
+    moved['close'][k] *= 1.05
+    changed = np.nonzero(higher_tf_trend(h1['time'], moved, H4_TREND_PERIOD) != base)[0]
+    assert len(changed) > 0
+    assert h1['time'][changed[0]] + 3600 == h4['time'][k] + 4 * 3600
+
+
+@pytest.mark.parametrize('row', [250, 2399, 5000, 5400])
+def test_rows_ignore_bars_that_close_later(row):
+    h1 = synthetic_h1(24 * (D1_TREND_PERIOD + 30), 1)
+    h4, d1 = aggregate(h1, 4), aggregate(h1, 24)
+    expected = compute_feature_matrix(h1, h4, d1)[row]
+    assert np.isfinite(expected).all()
+
+    # Rewrite everything that closes after bar `row` closes
+    close_time = h1['time'][row] + 3600
+    future = []
+    for rates, seconds in ((h1, 3600), (h4, 4 * 3600), (d1, 86400)):
+        rates = rates.copy()
+        later = rates['time'] + seconds > close_time
+        for column in ('open', 'high', 'low', 'close'):
+            rates[column][later] *= 1.5
+        rates['tick_volume'][later] *= 3
+        future.append(rates)
+
+    np.testing.assert_array_equal(compute_feature_matrix(*future)[row], expected)
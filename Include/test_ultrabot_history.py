@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Ultra Trading Bot - History Store Tests
+Copyright 2025 - Smart Stock Trader
+Crash repair, read-only maps and incremental sync of the columnar store
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+from ultrabot_fakemt5 import RATES_DTYPE, FakeTerminal
+from ultrabot_history import COLUMNS, TIMEFRAMES, HistoryStore
+
+H1 = TIMEFRAMES['H1']
+
+
+def bars(start: int, n: int) -> np.ndarray:
+    rates = np.zeros(n, dtype=RATES_DTYPE)
+    rates['time'] = 1_600_041_600 + (start + np.arange(n)) * 3600
+    for i, column in enumerate(('open', 'high', 'low', 'close')):
+        rates[column] = 100.0 + start + np.arange(n) + i
+    rates['tick_volume'] = start + np.arange(n)
+    return rates
+
+
+def column_sizes(store: HistoryStore, symbol: str) -> dict:
+    return {column: os.path.getsize(store._column_path(symbol, H1, column)) // dtype.itemsize
+            for column, dtype in COLUMNS.items()}
+
+
+def test_interrupted_append_is_repaired(tmp_path):
+    store = HistoryStore(str(tmp_path))
+    assert store.append('AAPL', H1, bars(0, 100)) == 100
+
+    # Crash during the next append: some columns written, one torn mid-row, time not yet
+    torn = bars(100, 50)
+    for column in ('open', 'high', 'low'):
+        with open(store._column_path('AAPL', H1, column), 'ab') as f:
+            f.write(torn[column].tobytes())
+    with open(store._column_path('AAPL', H1, 'close'), 'ab') as f:
+        f.write(torn['close'].tobytes()[:8 * 20 + 3])
+
+    assert store.count('AAPL', H1) == 100
+    assert store.last_time('AAPL', H1) == bars(99, 1)['time'][0]
+    np.testing.assert_array_equal(store.load('AAPL', H1)['close'], bars(0, 100)['close'])
+
+    assert store._repair('AAPL', H1) == 100
+    assert set(column_sizes(store, 'AAPL').values()) == {100}
+
+    assert store.append('AAPL', H1, bars(90, 60)) == 50      # Only bars after the last stored one
+    assert set(column_sizes(store, 'AAPL').values()) == {150}
+    loaded = store.load('AAPL', H1)
+    expected = bars(0, 150)
+    for column in ('time', 'open', 'high', 'low', 'close', 'tick_volume'):
+        np.testing.assert_array_equal(loaded[column], expected[column])
+
+
+def test_load_returns_read_only_maps(tmp_path):
+    store = HistoryStore(str(tmp_path))
+    store.append('AAPL', H1, bars(0, 10))
+    rates = store.load('AAPL', H1, count=5)
+
+    assert len(rates) == 5 and rates['time'][0] == bars(5, 1)['time'][0]
+    for column in COLUMNS:
+        assert isinstance(rates[column], np.memmap)
+        assert not rates[column].flags.writeable
+    with pytest.raises(ValueError):
+        rates['close'][0] = 0.0
+
+
+def test_sync_appends_only_closed_missing_bars(tmp_path, monkeypatch):
+    terminal = FakeTerminal()
+    monkeypatch.setitem(sys.modules, 'MetaTrader5', terminal.module())
+    store = HistoryStore(str(tmp_path))
+
+    assert store.sync('AAPL', H1, bars=500) == 500
+    assert store.sync('AAPL', H1) == 0
+    terminal.advance(3 * 3600)
+    assert store.sync('AAPL', H1) == 3
+
+    forming = terminal.module().copy_rates_from_pos('AAPL', H1, 0, 1)
+    stored = store.load('AAPL', H1)
+    assert len(stored) == 503
+    assert stored['time'][-1] < forming['time'][0]
+    assert np.all(np.diff(stored['time']) == 3600)
+    assert store.symbol_info('AAPL') is not None
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Ultra Trading Bot - Streaming Indicator Tests
+Copyright 2025 - Smart Stock Trader
+StreamingFeatures against the TA-Lib batch engine on seeded synthetic bars
+"""
+
+import numpy as np
+import pytest
+
+pytest.importorskip('talib')
+
+from ultrabot_features import NUM_FEATURES, compute_feature_matrix
+from ultrabot_indicators import StreamingFeatures
+
+RATES_DTYPE = np.dtype([('time', '<i8'), ('open', '<f8'), ('high', '<f8'), ('low', '<f8'),
+                        ('close', '<f8'), ('tick_volume', '<u8'), ('spread', '<i4'),
+                        ('real_volume', '<u8')])
+
+
+def synthetic_rates(n: int, seed: int, price: float = 100.0) -> np.ndarray:
+    """Random-walk H1 bars, with a run of flat closes to exercise the zero-range paths"""
+    rng = np.random.default_rng(seed)
+    close = price * np.exp(np.cumsum(rng.normal(0, 0.004, n)))
+    close[100:110] = close[99]
+    open_ = np.r_[close[0], close[:-1]]
+
+    rates = np.zeros(n, dtype=RATES_DTYPE)
+    rates['time'] = 1_600_041_600 + np.arange(n) * 3600
+    rates['open'] = open_
+    rates['high'] = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.002, n)))
+    rates['low'] = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.002, n)))
+    rates['close'] = close
+    rates['tick_volume'] = rng.integers(100, 1000, n)
+    return rates
+
+
+def stream(rates: np.ndarray) -> np.ndarray:
+    features = StreamingFeatures()
+    return np.array([features.update(bar) for bar in rates])
+
+
+@pytest.mark.parametrize('seed, price', [(1, 100.0), (7, 1.1), (9, 15000.0)])
+def test_streaming_matches_batch(seed, price):
+    rates = synthetic_rates(1500, seed, price)
+    batch = compute_feature_matrix(rates)
+    streamed = stream(rates)
+
+    assert streamed.shape == (len(rates), NUM_FEATURES)
+    # Same warm-up: NaN exactly where the batch engine has NaN
+    np.testing.assert_array_equal(np.isnan(streamed), np.isnan(batch))
+    np.testing.assert_allclose(streamed, batch, rtol=1e-6, atol=1e-9, equal_nan=True)
+
+
+def test_uncommitted_updates_leave_state_unchanged():
+    rates = synthetic_rates(600, 3)
+    expected = stream(rates)
+
+    features = StreamingFeatures()
+    for i, bar in enumerate(rates):
+        # Evaluate a forming bar (a perturbed copy) twice before the bar closes
+        forming = bar.copy()
+        forming['close'] *= 1.01
+        forming['high'] = max(forming['high'], forming['close'])
+        first = features.update(forming, commit=False)
+        second = features.update(forming, commit=False)
+        np.testing.assert_array_equal(first, second)
+
+        np.testing.assert_array_equal(features.update(bar), expected[i])
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Ultra Trading Bot - NumPy Inference Tests
+Copyright 2025 - Smart Stock Trader
+The NumPy export must reproduce the Keras model it was taken from
+"""
+
+import numpy as np
+import pytest
+
+pytest.importorskip('tensorflow')
+preprocessing = pytest.importorskip('sklearn.preprocessing')
+
+try:
+    import MetaTrader5  # noqa: F401
+except ImportError:
+    import ultrabot_fakemt5
+    ultrabot_fakemt5.install()
+
+from ultrabot_inference import NumpyPredictor
+from ultrabot_python import BotConfig, MLModel
+
+
+def test_numpy_export_matches_keras(tmp_path):
+    rng = np.random.default_rng(0)
+    X = rng.normal(1.0, 3.0, size=(256, 30))
+
+    model = MLModel(BotConfig(verbose=False))
+    model.build_model()
+    model.scaler = preprocessing.StandardScaler().fit(X)
+    path = str(tmp_path / 'model.npz')
+    assert model.export_numpy(path)
+
+    X_scaled = model.scaler.transform(X).astype(np.float32)
+    expected = model.model.predict_on_batch(X_scaled)
+    predicted = NumpyPredictor.load(path).predict_on_batch(X_scaled)
+    np.testing.assert_allclose(predicted, expected, atol=1e-4)
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Ultra Trading Bot - Model Registry Tests
+Copyright 2025 - Smart Stock Trader
+Lazy loading, LRU eviction, hot swap and group fallback on tiny exports
+"""
+
+import numpy as np
+import pytest
+
+from ultrabot_history import TIMEFRAMES
+from ultrabot_inference import NumpyPredictor, NumpyScaler
+from ultrabot_registry import ModelRegistry, predictor_nbytes
+
+H1 = TIMEFRAMES['H1']
+
+
+def export(path, favoured: int) -> str:
+    """A two-layer export that always predicts class `favoured`"""
+    bias = np.zeros(3)
+    bias[favoured] = 5.0
+    layers = [(np.full((30, 4), 0.01), np.zeros(4), 'relu'), (np.zeros((4, 3)), bias, 'softmax')]
+    NumpyPredictor(layers, NumpyScaler(np.zeros(30), np.ones(30)), 0.5).save_npz(str(path))
+    return str(path)
+
+
+def predicted(predictor: NumpyPredictor) -> int:
+    return int(np.argmax(predictor.predict_proba(np.zeros((1, 30)))[0]))
+
+
+@pytest.fixture
+def exports(tmp_path):
+    return export(tmp_path / 'buy.npz', 0), export(tmp_path / 'sell.npz', 1)
+
+
+def test_loads_on_first_get(tmp_path, exports):
+    registry = ModelRegistry(str(tmp_path / 'registry'))
+    registry.publish('AAPL', H1, exports[0])
+    assert registry.stats()['loaded'] == 0
+
+    first = registry.get('AAPL', H1)
+    assert predicted(first) == 0
+    assert registry.get('AAPL', H1) is first
+    assert registry.stats() == {'loaded': 1, 'bytes': predictor_nbytes(first), 'hits': 1,
+                                'misses': 1, 'evictions': 0, 'swaps': 0}
+    assert registry.get('MSFT', H1) is None
+
+
+def test_evicts_least_recently_used(tmp_path, exports):
+    size = predictor_nbytes(NumpyPredictor.load(exports[0]))
+    registry = ModelRegistry(str(tmp_path / 'registry'), max_bytes=2 * size)
+    for symbol in ('AAPL', 'MSFT', 'GOOGL'):
+        registry.publish(symbol, H1, exports[0])
+
+    aapl = registry.get('AAPL', H1)
+    registry.get('MSFT', H1)
+    assert registry.get('AAPL', H1) is aapl        # AAPL is now the most recently used
+    registry.get('GOOGL', H1)
+
+    stats = registry.stats()
+    assert (stats['loaded'], stats['bytes'], stats['evictions']) == (2, 2 * size, 1)
+    assert registry.get('AAPL', H1) is aapl
+    assert registry.stats()['misses'] == 3         # MSFT was the one evicted
+    registry.get('MSFT', H1)
+    assert registry.stats()['misses'] == 4
+
+
+def test_refresh_swaps_to_activated_version(tmp_path, exports):
+    registry = ModelRegistry(str(tmp_path / 'registry'))
+    registry.publish('AAPL', H1, exports[0])
+    old = registry.get('AAPL', H1)
+
+    registry.publish('AAPL', H1, exports[1])
+    assert registry.get('AAPL', H1) is old         # Not picked up until refresh()
+    assert registry.refresh() == 1
+
+    new = registry.get('AAPL', H1)
+    assert predicted(new) == 1
+    assert predicted(old) == 0                     # Handed-out predictors stay usable
+    stats = registry.stats()
+    assert (stats['loaded'], stats['swaps']) == (1, 1)
+    assert registry.refresh() == 0
+
+    registry.activate('AAPL', H1, 1)               # Roll back
+    registry.refresh()
+    assert predicted(registry.get('AAPL', H1)) == 0
+    assert registry.get('AAPL', H1, version=2) is not None
+
+
+def test_retired_version_is_not_cached_again(tmp_path, exports):
+    registry = ModelRegistry(str(tmp_path / 'registry'))
+    registry.publish('AAPL', H1, exports[0])
+    registry.get('AAPL', H1)
+    registry.publish('AAPL', H1, exports[1])
+    registry.refresh()
+
+    # A get() that read v1 as live before the swap finishes loading it afterwards
+    assert registry._insert(('AAPL', H1, 1), NumpyPredictor.load(exports[0])) is None
+    assert registry.stats()['loaded'] == 1
+    assert registry._insert(('AAPL', H1, 1), NumpyPredictor.load(exports[0]), pinned=True) is not None
+
+
+def test_symbols_fall_back_to_their_group(tmp_path, exports):
+    registry = ModelRegistry(str(tmp_path / 'registry'), {'metals': ['XAUUSD', 'XAGUSD']})
+    registry.publish('metals', H1, exports[0])
+    assert registry.resolve('XAUUSD', H1) == 'metals'
+    assert registry.resolve('AAPL', H1) is None
+    assert registry.get('XAUUSD', H1) is registry.get('XAGUSD', H1)
+
+    # A symbol's own model takes over once routes are recomputed
+    registry.publish('XAUUSD', H1, exports[1])
+    registry.refresh()
+    assert registry.resolve('XAUUSD', H1) == 'XAUUSD'
+    assert registry.resolve('XAGUSD', H1) == 'metals'
+    assert predicted(registry.get('XAUUSD', H1)) == 1
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Ultra Trading Bot - Training Pipeline Tests
+Copyright 2025 - Smart Stock Trader
+Chunked featurization against the whole series, and the purged time split
+"""
+
+import numpy as np
+import pytest
+
+pytest.importorskip('talib')
+
+import ultrabot_training
+from ultrabot_features import LABEL_HORIZON, compute_feature_matrix, make_labels, valid_rows
+from ultrabot_fakemt5 import RATES_DTYPE
+from ultrabot_training import TrainingSet
+
+
+def synthetic_h1(n: int, seed: int, start: int = 1_600_041_600) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0, 0.004, n)))
+    open_ = np.r_[close[0], close[:-1]]
+    rates = np.zeros(n, dtype=RATES_DTYPE)
+    rates['time'] = start + np.arange(n) * 3600
+    rates['open'] = open_
+    rates['high'] = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.002, n)))
+    rates['low'] = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.002, n)))
+    rates['close'] = close
+    rates['tick_volume'] = rng.integers(100, 1000, n)
+    return rates
+
+
+@pytest.fixture
+def small_chunks(monkeypatch):
+    """Chunks much shorter than the series, so several chunk boundaries are crossed"""
+    monkeypatch.setattr(ultrabot_training, 'CHUNK_BARS', 700)
+
+
+def test_chunked_rows_equal_whole_series(tmp_path, small_chunks):
+    rates = synthetic_h1(4000, 0)
+    dataset = TrainingSet(str(tmp_path), ['AAPL'])
+    kept = dataset.add_rates('AAPL', rates)
+    dataset.close()
+
+    X = compute_feature_matrix(rates)
+    y = make_labels(rates['close'])
+    mask = valid_rows(X) & np.isfinite(y).all(axis=1)
+
+    assert kept == dataset.rows == mask.sum()
+    np.testing.assert_array_equal(dataset.columns['time'], rates['time'][mask])
+    np.testing.assert_array_equal(dataset.columns['label'], np.argmax(y[mask], axis=1))
+    np.testing.assert_allclose(dataset.columns['features'], X[mask].astype(np.float32),
+                               rtol=1e-5, atol=1e-6)
+    dataset.release()
+
+
+def test_split_holds_out_newest_bars_and_purges(tmp_path, small_chunks):
+    # Two symbols with overlapping but different date ranges
+    symbols = {'AAPL': synthetic_h1(3000, 1), 'MSFT': synthetic_h1(2000, 2, start=1_600_041_600 + 900 * 3600)}
+    dataset = TrainingSet(str(tmp_path), list(symbols))
+    for symbol, rates in symbols.items():
+        dataset.add_rates(symbol, rates)
+    dataset.close()
+
+    train, validation = dataset.split(0.2)
+    times = dataset.columns['time']
+    cutoff = min(times[start] for start, _ in validation)
+    assert all(times[stop - 1] < cutoff for _, stop in train)
+    assert all(np.all(times[start:stop] >= cutoff) for start, stop in validation)
+    assert 0.15 < ultrabot_training.count_rows(validation) / dataset.rows < 0.25
+
+    # Each symbol loses exactly LABEL_HORIZON rows between training and validation
+    for (segment_start, segment_stop), (train_start, train_stop), (val_start, val_stop) in zip(
+            dataset.segments, train, validation):
+        assert train_start == segment_start and val_stop == segment_stop
+        assert val_start - train_stop == LABEL_HORIZON
+    dataset.release()
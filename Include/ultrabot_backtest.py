@@ -0,0 +1,445 @@
+#!/usr/bin/env python3
+"""
+Ultra Trading Bot - Vectorized Backtester
+Copyright 2025 - Smart Stock Trader
+Replays the live signal, risk and exit rules over whole arrays of bars:
+EMA10/SMA50 cross with the RSI band, the ML combine rules, ATR SL/TP adjusted by
+ML confidence, risk-based position sizing and first-touch SL/TP resolution
+"""
+
+import heapq
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, Optional
+
+import numpy as np
+
+from ultrabot_features import compute_feature_matrix, symbol_one_hot, valid_rows, talib
+
+if TYPE_CHECKING:
+    from ultrabot_inference import NumpyPredictor
+    from ultrabot_python import BotConfig
+
+# ═══════════════════════════════════════════════════════════════════════════
+# CONSTANTS
+# ═══════════════════════════════════════════════════════════════════════════
+
+BUY, SELL, NEUTRAL = 0, 1, 2      # ML class order, as in MLModel.predict
+EXIT_SL, EXIT_TP, EXIT_END = 0, 1, 2
+
+ML_STRONG_CONFIDENCE = 0.75       # combine_signals trades ML alone above this
+TRADITIONAL_CONFIDENCE = 0.6      # combine_signals confidence of a traditional-only signal
+AGREEMENT_BOOST = 1.2             # combine_signals boost when ML and traditional agree
+
+TOUCH_CELLS = 2_000_000           # Bars x trades examined per first-touch step (bounds memory)
+
+TRADE_DTYPE = np.dtype([
+    ('entry_index', '<i8'), ('exit_index', '<i8'), ('entry_time', '<i8'), ('exit_time', '<i8'),
+    ('direction', '<i1'), ('entry_price', '<f8'), ('exit_price', '<f8'), ('sl', '<f8'), ('tp', '<f8'),
+    ('lots', '<f8'), ('confidence', '<f8'), ('partial_index', '<i8'), ('pnl', '<f8'), ('exit_reason', '<i1'),
+])
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# INPUTS
+# ═══════════════════════════════════════════════════════════════════════════
+
+@dataclass
+class SymbolSpec:
+    """The mt5.symbol_info fields used for sizing and P&L"""
+    point: float = 0.01
+    trade_tick_value: float = 1.0
+    volume_step: float = 0.01
+    volume_min: float = 0.01
+    volume_max: float = 100.0
+
+    @classmethod
+    def from_symbol_info(cls, info) -> 'SymbolSpec':
+        return cls(info.point, info.trade_tick_value, info.volume_step, info.volume_min, info.volume_max)
+
+
+@dataclass
+class MarketData:
+    """
+    Per-bar prices, indicators and ML predictions of one symbol.
+    Everything here is independent of BotConfig, so one MarketData can be
+    backtested under many configurations.
+    """
+    time: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    spread: np.ndarray          # Points
+    ema10: np.ndarray
+    sma50: np.ndarray
+    rsi: np.ndarray
+    atr: np.ndarray
+    ml_direction: np.ndarray    # BUY / SELL / NEUTRAL per bar
+    ml_confidence: np.ndarray   # Calibrated as in MLModel.predict_features
+
+    def __len__(self) -> int:
+        return len(self.close)
+
+    def slice(self, start: int, stop: int) -> 'MarketData':
+        """Bars start..stop-1 (views, no copy) for walk-forward windows"""
+        return MarketData(**{name: value[start:stop] for name, value in vars(self).items()})
+
+
+def ml_predictions(X: np.ndarray, predictor: 'NumpyPredictor', symbol: str = None) -> tuple:
+    """Direction and calibrated confidence per feature row (NEUTRAL, 0 where undefined)"""
+    direction = np.full(len(X), NEUTRAL, dtype=np.int8)
+    confidence = np.zeros(len(X), dtype=np.float64)
+    ok = valid_rows(X)
+    if not ok.any():
+        return direction, confidence
+
+    X = X[ok]
+    if predictor.symbols:
+        X = np.hstack([X, np.repeat(symbol_one_hot(predictor.symbols, [symbol]), len(X), axis=0)])
+    probs = np.asarray(predictor.predict_on_batch(predictor.scaler.transform(X)))
+    best = np.argmax(probs, axis=1)
+    conf = probs[np.arange(len(best)), best]
+    if predictor.accuracy > 0.5:
+        conf = conf * predictor.accuracy
+
+    direction[ok] = best
+    confidence[ok] = conf
+    return direction, confidence
+
+
+def prepare_market_data(rates: np.ndarray,
+                        h4_rates: Optional[np.ndarray] = None,
+                        d1_rates: Optional[np.ndarray] = None,
+                        predictor: Optional['NumpyPredictor'] = None,
+                        symbol: str = None) -> MarketData:
+    """
+    Indicators and (if a predictor is given) ML predictions for every bar of `rates`.
+    `symbol` feeds the symbol-id inputs of models trained with them.
+    """
+    close = np.asarray(rates['close'], dtype=np.float64)
+    high = np.asarray(rates['high'], dtype=np.float64)
+    low = np.asarray(rates['low'], dtype=np.float64)
+
+    if predictor is not None:
+        direction, confidence = ml_predictions(compute_feature_matrix(rates, h4_rates, d1_rates), predictor, symbol)
+    else:
+        direction = np.full(len(rates), NEUTRAL, dtype=np.int8)
+        confidence = np.zeros(len(rates), dtype=np.float64)
+
+    return MarketData(
+        time=np.asarray(rates['time'], dtype=np.int64),
+        open=np.asarray(rates['open'], dtype=np.float64),
+        high=high, low=low, close=close,
+        spread=np.asarray(rates['spread'], dtype=np.float64),
+        ema10=talib.EMA(close, timeperiod=10),
+        sma50=talib.SMA(close, timeperiod=50),
+        rsi=talib.RSI(close, timeperiod=14),
+        atr=talib.ATR(high, low, close, timeperiod=14),
+        ml_direction=direction,
+        ml_confidence=confidence,
+    )
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# SIGNALS AND RISK (array twins of the UltraTradingBot / RiskManager rules)
+# ═══════════════════════════════════════════════════════════════════════════
+
+def traditional_signals(data: MarketData) -> np.ndarray:
+    """get_traditional_signal per closed bar: +1 BUY, -1 SELL, 0 none"""
+    fast, slow, rsi = data.ema10, data.sma50, data.rsi
+    prev_fast = np.concatenate(([np.nan], fast[:-1]))
+    prev_slow = np.concatenate(([np.nan], slow[:-1]))
+
+    with np.errstate(invalid='ignore'):
+        buy = (fast > slow) & (prev_fast <= prev_slow) & (rsi > 50) & (rsi < 70)
+        sell = (fast < slow) & (prev_fast >= prev_slow) & (rsi > 30) & (rsi < 50)
+    return buy.astype(np.int8) - sell.astype(np.int8)
+
+
+def combine_signals(ml_direction: np.ndarray, ml_confidence: np.ndarray,
+                    traditional: np.ndarray, config: 'BotConfig') -> tuple:
+    """UltraTradingBot.combine_signals per bar: (+1/-1/0 signal, confidence)"""
+    signal = np.zeros(len(traditional), dtype=np.int8)
+    confidence = np.zeros(len(traditional), dtype=np.float64)
+
+    # Fall back to traditional if ML is neutral or low confidence
+    fallback = traditional != 0
+    signal[fallback] = traditional[fallback]
+    confidence[fallback] = TRADITIONAL_CONFIDENCE
+
+    # ML with high confidence overrides when it agrees or is strong enough alone
+    for ml_class, side in ((BUY, 1), (SELL, -1)):
+        ml = (ml_direction == ml_class) & (ml_confidence >= config.ml_confidence_threshold)
+        agree = ml & (traditional == side)
+        alone = ml & ~agree & (ml_confidence >= ML_STRONG_CONFIDENCE)
+        signal[agree | alone] = side
+        confidence[agree] = ml_confidence[agree] * AGREEMENT_BOOST
+        confidence[alone] = ml_confidence[alone]
+
+    return signal, confidence
+
+
+def adjust_sl_tp_by_confidence(sl_distance: np.ndarray, tp_distance: np.ndarray,
+                               confidence: np.ndarray, config: 'BotConfig') -> tuple:
+    """RiskManager.adjust_sl_tp_by_confidence per trade"""
+    if not config.use_ml_risk_management:
+        return sl_distance, tp_distance
+
+    high = (confidence != 0) & (confidence >= config.ml_high_conf_threshold)
+    low = (confidence != 0) & (confidence < config.ml_low_conf_threshold)
+    tp_distance = np.where(high, tp_distance * config.ml_high_conf_tp_mult, tp_distance)
+    sl_distance = np.where(low, sl_distance * config.ml_low_conf_sl_mult, sl_distance)
+    return sl_distance, tp_distance
+
+
+def position_size(equity: float, sl_distance: float, risk_per_trade: float, spec: SymbolSpec) -> float:
+    """RiskManager.calculate_position_size for an SL `sl_distance` away in price"""
+    lot_size = equity * risk_per_trade / (sl_distance / spec.point * spec.trade_tick_value)
+    lot_size = round(lot_size / spec.volume_step) * spec.volume_step
+    return max(spec.volume_min, min(lot_size, spec.volume_max))
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# FIRST-TOUCH SEARCH
+# ═══════════════════════════════════════════════════════════════════════════
+
+def first_touch(data: MarketData, point: float, entry: np.ndarray, direction: np.ndarray,
+                stop: np.ndarray, target: np.ndarray) -> tuple:
+    """
+    First bar at or after `entry` whose range reaches `stop` or `target`.
+    Buys trigger on the bid (rates), sells on the ask (bid + spread). A bar that
+    reaches both counts as a stop. Trades are scanned together in growing blocks
+    of bars; unresolved trades end at the last bar with reason EXIT_END.
+    Returns (exit_index, exit_reason).
+    """
+    n_bars = len(data)
+    exit_index = np.full(len(entry), n_bars - 1, dtype=np.int64)
+    reason = np.full(len(entry), EXIT_END, dtype=np.int8)
+    ask_offset = data.spread * point
+
+    pending = np.arange(len(entry))
+    start = entry.astype(np.int64).copy()
+    block = 32
+    while len(pending):
+        block = int(min(max(block, 32), max(TOUCH_CELLS // len(pending), 32), n_bars))
+        idx = start[pending, None] + np.arange(block)
+        in_range = idx < n_bars
+        idx = np.minimum(idx, n_bars - 1)
+
+        long = direction[pending, None] > 0
+        offset = np.where(long, 0.0, ask_offset[idx])
+        high = data.high[idx] + offset
+        low = data.low[idx] + offset
+        stop_p, target_p = stop[pending, None], target[pending, None]
+
+        stop_hit = in_range & np.where(long, low <= stop_p, high >= stop_p)
+        target_hit = in_range & np.where(long, high >= target_p, low <= target_p)
+        hit = stop_hit | target_hit
+
+        resolved = hit.any(axis=1)
+        rows = np.nonzero(resolved)[0]
+        first = hit[rows].argmax(axis=1)
+        exit_index[pending[rows]] = idx[rows, first]
+        reason[pending[rows]] = np.where(stop_hit[rows, first], EXIT_SL, EXIT_TP)
+
+        # Unresolved trades continue from the next block until the data ends
+        more = ~resolved & (start[pending] + block < n_bars)
+        start[pending[more]] += block
+        pending = pending[more]
+        block *= 2
+
+    return exit_index, reason
+
+
+def exit_prices(data: MarketData, point: float, exit_index: np.ndarray, reason: np.ndarray,
+                direction: np.ndarray, stop: np.ndarray, target: np.ndarray) -> np.ndarray:
+    """Fill price of each exit; a bar that opens beyond the level fills at its open"""
+    long = direction > 0
+    bar_open = data.open[exit_index] + np.where(long, 0.0, data.spread[exit_index] * point)
+    at_end = data.close[exit_index] + np.where(long, 0.0, data.spread[exit_index] * point)
+
+    # Adverse gaps through the stop and favourable gaps through the target fill at the open
+    stop_fill = np.where(long, np.minimum(stop, bar_open), np.maximum(stop, bar_open))
+    target_fill = np.where(long, np.maximum(target, bar_open), np.minimum(target, bar_open))
+    return np.select([reason == EXIT_SL, reason == EXIT_TP], [stop_fill, target_fill], at_end)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# BACKTEST
+# ═══════════════════════════════════════════════════════════════════════════
+
+@dataclass
+class BacktestResult:
+    """Trade list, per-bar equity and summary statistics of one run"""
+    trades: np.ndarray       # TRADE_DTYPE records, in entry order
+    equity: np.ndarray       # Marked to market at every bar close
+    drawdown: np.ndarray     # Fraction below the running equity peak (<= 0)
+    time: np.ndarray
+    initial_equity: float
+
+    def stats(self) -> Dict[str, float]:
+        pnl = self.trades['pnl']
+        wins, losses = pnl[pnl > 0], pnl[pnl <= 0]
+        final = float(self.equity[-1]) if len(self.equity) else self.initial_equity
+        if losses.sum() < 0:
+            profit_factor = float(wins.sum() / -losses.sum())
+        else:
+            profit_factor = float('inf') if len(wins) else 0.0
+        return {
+            'trades': int(len(pnl)),
+            'net_profit': float(pnl.sum()),
+            'return': final / self.initial_equity - 1.0,
+            'win_rate': float(len(wins) / len(pnl)) if len(pnl) else 0.0,
+            'profit_factor': profit_factor,
+            'max_drawdown': float(-self.drawdown.min()) if len(self.drawdown) else 0.0,
+            'final_equity': final,
+        }
+
+
+def backtest(data: MarketData, config: 'BotConfig', spec: SymbolSpec = None,
+             initial_equity: float = 10_000.0, partial_closes: bool = False) -> BacktestResult:
+    """
+    Run the bot's rules over `data`. Signals are taken on closed bars and filled
+    at the next bar's open (ask for buys, bid for sells). Up to config.max_positions
+    trades are open at once, each sized from the balance at entry.
+    Partial closes are off by default because the live bot does not execute them yet
+    (close_partial_position is a stub). With `partial_closes` and use_smart_scaling,
+    partial_close_percent of the volume is closed when price first reaches
+    partial_close_rr times the risk.
+    """
+    spec = spec or SymbolSpec()
+    n = len(data)
+
+    # Signals on closed bars, filled at the next bar's open
+    ml_direction, ml_confidence = data.ml_direction, data.ml_confidence
+    if not config.use_ml:
+        ml_direction = np.full(n, NEUTRAL, dtype=np.int8)
+        ml_confidence = np.zeros(n)
+    signal, confidence = combine_signals(ml_direction, ml_confidence, traditional_signals(data), config)
+
+    bars = np.nonzero((signal != 0) & (confidence >= config.ml_confidence_threshold) &
+                      np.isfinite(data.atr) & (data.atr > 0))[0]
+    bars = bars[bars + 1 < n]
+    entry = bars + 1
+    direction = signal[bars].astype(np.int8)
+    confidence = confidence[bars]
+
+    # ATR SL/TP, adjusted by ML confidence
+    sl_distance, tp_distance = adjust_sl_tp_by_confidence(
+        data.atr[bars] * config.atr_sl_multiplier, data.atr[bars] * config.atr_tp_multiplier,
+        confidence, config
+    )
+    price = data.open[entry] + np.where(direction > 0, data.spread[entry] * spec.point, 0.0)
+    sl = price - direction * sl_distance
+    tp = price + direction * tp_distance
+
+    exit_index, reason = first_touch(data, spec.point, entry, direction, sl, tp)
+    exit_price = exit_prices(data, spec.point, exit_index, reason, direction, sl, tp)
+
+    # Partial close at partial_close_rr x risk, if reached before the exit
+    partial_index = np.full(len(entry), -1, dtype=np.int64)
+    partial_share = config.partial_close_percent if partial_closes and config.use_smart_scaling else 0.0
+    partial_price = price + direction * sl_distance * config.partial_close_rr
+    if partial_share > 0 and len(entry):
+        touch, touch_reason = first_touch(data, spec.point, entry, direction, sl, partial_price)
+        reached = (touch_reason == EXIT_TP) & (touch <= exit_index)
+        partial_index[reached] = touch[reached]
+
+    value = spec.trade_tick_value / spec.point   # Account currency per 1.0 price move per lot
+    partial_pnl = np.where(partial_index >= 0, partial_share * direction * (partial_price - price), 0.0) * value
+    final_share = np.where(partial_index >= 0, 1.0 - partial_share, 1.0)
+    final_pnl = final_share * direction * (exit_price - price) * value
+
+    lots = _accept_and_size(entry, exit_index, partial_index, sl_distance, partial_pnl, final_pnl,
+                            config, spec, initial_equity)
+    taken = lots > 0
+
+    trades = np.zeros(int(taken.sum()), dtype=TRADE_DTYPE)
+    trades['entry_index'] = entry[taken]
+    trades['exit_index'] = exit_index[taken]
+    trades['entry_time'] = data.time[entry[taken]]
+    trades['exit_time'] = data.time[exit_index[taken]]
+    trades['direction'] = direction[taken]
+    trades['entry_price'] = price[taken]
+    trades['exit_price'] = exit_price[taken]
+    trades['sl'] = sl[taken]
+    trades['tp'] = tp[taken]
+    trades['lots'] = lots[taken]
+    trades['confidence'] = confidence[taken]
+    trades['partial_index'] = partial_index[taken]
+    trades['pnl'] = lots[taken] * (partial_pnl[taken] + final_pnl[taken])
+    trades['exit_reason'] = reason[taken]
+
+    equity = _equity_curve(data, spec, trades, partial_share, lots[taken] * partial_pnl[taken],
+                           lots[taken] * final_pnl[taken], initial_equity)
+    peak = np.maximum.accumulate(equity) if n else equity
+    drawdown = equity / peak - 1.0 if n else equity
+    return BacktestResult(trades, equity, drawdown, data.time, initial_equity)
+
+
+def _accept_and_size(entry, exit_index, partial_index, sl_distance, partial_pnl, final_pnl,
+                     config: 'BotConfig', spec: SymbolSpec, initial_equity: float) -> np.ndarray:
+    """
+    Walk candidate trades in entry order, skipping those that would exceed
+    max_positions and sizing the rest from the balance realized before entry.
+    Returns lots per candidate (0 = not taken).
+    """
+    lots = np.zeros(len(entry), dtype=np.float64)
+    open_exits = []     # Exit bars of open trades
+    cash = []           # (bar, amount) of P&L not yet realized
+    balance = initial_equity
+
+    for i in range(len(entry)):
+        bar = entry[i]
+        while open_exits and open_exits[0] < bar:
+            heapq.heappop(open_exits)
+        while cash and cash[0][0] < bar:
+            balance += heapq.heappop(cash)[1]
+        if len(open_exits) >= config.max_positions:
+            continue
+
+        size = position_size(balance, sl_distance[i], config.risk_per_trade, spec)
+        lots[i] = size
+        heapq.heappush(open_exits, exit_index[i])
+        heapq.heappush(cash, (exit_index[i], size * final_pnl[i]))
+        if partial_index[i] >= 0:
+            heapq.heappush(cash, (partial_index[i], size * partial_pnl[i]))
+
+    return lots
+
+
+def _equity_curve(data: MarketData, spec: SymbolSpec, trades: np.ndarray, partial_share: float,
+                  partial_pnl: np.ndarray, final_pnl: np.ndarray, initial_equity: float) -> np.ndarray:
+    """Balance plus open P&L at every bar close, from per-bar exposure deltas"""
+    n = len(data)
+    realized = np.zeros(n)
+    np.add.at(realized, trades['exit_index'], final_pnl)
+    partial = trades['partial_index'] >= 0
+    np.add.at(realized, trades['partial_index'][partial], partial_pnl[partial])
+
+    # Longs are marked at the bid, shorts at the ask
+    open_pnl = np.zeros(n)
+    for side, mark in ((1, data.close), (-1, data.close + data.spread * spec.point)):
+        held = trades[trades['direction'] == side]
+        lots = np.zeros(n + 1)      # Lots held from the entry bar until the exit bar
+        cost = np.zeros(n + 1)      # Lots x entry price
+        _hold(lots, cost, held['entry_index'], held['exit_index'], held['lots'], held['entry_price'])
+
+        # After a partial close only the remainder is held until the exit
+        scaled = held[held['partial_index'] >= 0]
+        _hold(lots, cost, scaled['partial_index'], scaled['exit_index'],
+              -scaled['lots'] * partial_share, scaled['entry_price'])
+
+        lots, cost = np.cumsum(lots[:n]), np.cumsum(cost[:n])
+        open_pnl += side * (lots * mark - cost)
+
+    return initial_equity + np.cumsum(realized) + open_pnl * spec.trade_tick_value / spec.point
+
+
+def _hold(lots: np.ndarray, cost: np.ndarray, start: np.ndarray, stop: np.ndarray,
+          volume: np.ndarray, price: np.ndarray):
+    """Add `volume` held over bars start..stop-1 to the lots/cost delta arrays"""
+    np.add.at(lots, start, volume)
+    np.add.at(lots, stop, -volume)
+    np.add.at(cost, start, volume * price)
+    np.add.at(cost, stop, -volume * price)
@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Ultra Trading Bot - Benchmark Suite
+Copyright 2025 - Smart Stock Trader
+Throughput and latency percentiles for the hot paths, run against the fake
+MetaTrader5 terminal so results are reproducible without a live terminal.
+
+    python ultrabot_bench.py                        # run everything, compare with the baseline
+    python ultrabot_bench.py bot_cycle bridge       # run a subset
+    python ultrabot_bench.py --save-baseline        # record the current numbers as the baseline
+
+Baselines are machine-specific; re-record them when the benchmark host changes.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from ultrabot_fakemt5 import (
+    FakeTerminal, TIMEFRAME_H1, TRADE_ACTION_DEAL, install, symbols as make_symbols
+)
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BRIDGE_DIR = os.path.join(HERE, '..', 'NewBot')
+BASELINE_PATH = os.path.join(HERE, 'ultrabot_bench_baseline.json')
+DEFAULT_TOLERANCE = 0.25    # Fractional slowdown (throughput or p95) reported as a regression
+
+
+@dataclass
+class BenchResult:
+    """Timings of one benchmark; `samples` are seconds per operation"""
+    name: str
+    params: Dict
+    samples: List[float] = field(default_factory=list)
+    elapsed: float = 0.0     # Wall time of the timed section (throughput denominator)
+
+    @property
+    def throughput(self) -> float:
+        return len(self.samples) / self.elapsed if self.elapsed > 0 else 0.0
+
+    def percentile(self, q: float) -> float:
+        return float(np.percentile(self.samples, q)) * 1000.0 if self.samples else 0.0
+
+    def summary(self) -> Dict:
+        return {
+            'params': self.params,
+            'ops': len(self.samples),
+            'ops_per_sec': round(self.throughput, 3),
+            'p50_ms': round(self.percentile(50), 4),
+            'p95_ms': round(self.percentile(95), 4),
+            'p99_ms': round(self.percentile(99), 4),
+        }
+
+
+def time_calls(result: BenchResult, fn: Callable[[], None], iterations: int,
+               before: Callable[[], None] = None) -> BenchResult:
+    """Call fn `iterations` times, timing each call (and not `before`) into result"""
+    for _ in range(iterations):
+        if before is not None:
+            before()
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        result.samples.append(elapsed)
+        result.elapsed += elapsed
+    return result
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# BENCHMARKS
+# ═══════════════════════════════════════════════════════════════════════════
+
+def bench_extract_features(terminal: FakeTerminal, args) -> BenchResult:
+    """MLModel.extract_features on one symbol, one simulated minute per call"""
+    from ultrabot_python import BotConfig, MLModel
+
+    config = BotConfig(symbols=make_symbols(1), verbose=False, bar_cache_max_age=0.0)
+    model = MLModel(config)
+    symbol = config.symbols[0]
+    model.extract_features(symbol, TIMEFRAME_H1)    # Prime the cache and streams
+
+    result = BenchResult('extract_features', {'iterations': args.iterations})
+    return time_calls(result, lambda: model.extract_features(symbol, TIMEFRAME_H1),
+                      args.iterations, before=lambda: terminal.advance(60))
+
+
+def bench_train(terminal: FakeTerminal, args) -> BenchResult:
+    """MLModel.train from scratch (feature matrix, scaler and network fit)"""
+    from ultrabot_python import BotConfig, MLModel, tf
+
+    config = BotConfig(symbols=make_symbols(1), verbose=False)
+    result = BenchResult('train', {'repeats': args.train_repeats, 'bars': args.train_bars})
+    # Same initial weights every repeat, so early stopping ends at the same epoch
+    return time_calls(result, lambda: MLModel(config).train(config.symbols[0], TIMEFRAME_H1, args.train_bars),
+                      args.train_repeats, before=lambda: tf.keras.utils.set_random_seed(0))
+
+
+def bench_bot_cycle(terminal: FakeTerminal, args) -> BenchResult:
+    """UltraTradingBot.process_signals over N symbols, one closed H1 bar per cycle"""
+    from ultrabot_python import BotConfig, UltraTradingBot
+    from ultrabot_inference import NumpyPredictor, NumpyScaler
+
+    config = BotConfig(symbols=make_symbols(args.symbols), verbose=False, log_file=os.devnull,
+                       scan_workers=args.workers, bar_cache_max_age=0.0)
+    bot = UltraTradingBot(config)
+
+    # Fixed random weights: the cycle cost does not depend on what the model learned
+    rng = np.random.default_rng(0)
+    scaler = NumpyScaler(np.zeros(30), np.ones(30))
+    bot.ml_model.model = NumpyPredictor([(rng.normal(0, 0.3, (30, 20)), np.zeros(20), 'relu'),
+                                         (rng.normal(0, 0.3, (20, 3)), np.zeros(3), 'softmax')], scaler)
+    bot.ml_model.scaler = scaler
+
+    bot.start_executor()
+    try:
+        bot.process_signals(config.symbols)     # Prime caches and streams
+        result = BenchResult('bot_cycle', {'symbols': args.symbols, 'workers': args.workers,
+                                           'cycles': args.cycles})
+        return time_calls(result, lambda: bot.process_signals(config.symbols),
+                          args.cycles, before=lambda: terminal.advance(3600))
+    finally:
+        if bot.executor is not None:
+            bot.executor.shutdown(wait=True)
+
+
+def bench_bridge(terminal: FakeTerminal, args) -> BenchResult:
+    """MT5Bridge request/reply round trips over N concurrent WebSocket clients"""
+    with tempfile.TemporaryDirectory() as scratch:
+        os.environ['OUTBOX_PATH'] = os.path.join(scratch, 'outbox.jsonl')
+        sys.path.insert(0, os.path.abspath(BRIDGE_DIR))
+
+        # The bridge opens its dated log file on import; keep it out of the tree
+        cwd = os.getcwd()
+        os.chdir(scratch)
+        try:
+            import mt5_bridge
+        finally:
+            os.chdir(cwd)
+        import websockets
+
+        # A few open positions so get_positions carries a realistic payload
+        for i, symbol in enumerate(make_symbols(10)):
+            terminal.order_send({'action': TRADE_ACTION_DEAL, 'symbol': symbol,
+                                 'volume': 0.1, 'type': i % 2, 'magic': 234000})
+
+        result = BenchResult('bridge', {'clients': args.clients, 'messages': args.messages})
+        asyncio.run(_drive_bridge(mt5_bridge, websockets, result, args))
+        return result
+
+
+async def _drive_bridge(mt5_bridge, websockets, result: BenchResult, args):
+    bridge = mt5_bridge.MT5Bridge()
+    bridge.running = True
+    await bridge.initialize_mt5()
+
+    server = await websockets.serve(bridge.handle_client, '127.0.0.1', 0)
+    port = server.sockets[0].getsockname()[1]
+    requests = ('heartbeat', 'get_positions', 'get_account_info', 'get_stats')
+
+    async def client(index: int) -> List[float]:
+        samples = []
+        async with websockets.connect(f"ws://127.0.0.1:{port}/") as ws:
+            await ws.recv()     # Welcome frame
+            for i in range(args.messages):
+                start = time.perf_counter()
+                await ws.send(json.dumps({'type': requests[(index + i) % len(requests)], 'id': i}))
+                while json.loads(await ws.recv()).get('id') != i:
+                    pass        # Skip broadcasts
+                samples.append(time.perf_counter() - start)
+        return samples
+
+    try:
+        start = time.perf_counter()
+        per_client = await asyncio.gather(*[client(i) for i in range(args.clients)])
+        result.elapsed = time.perf_counter() - start
+        result.samples = [s for samples in per_client for s in samples]
+    finally:
+        server.close()
+        await server.wait_closed()
+        await bridge.shutdown()
+
+
+BENCHMARKS = {
+    'extract_features': bench_extract_features,
+    'train': bench_train,
+    'bot_cycle': bench_bot_cycle,
+    'bridge': bench_bridge,
+}
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# BASELINES
+# ═══════════════════════════════════════════════════════════════════════════
+
+def load_baseline(path: str) -> Dict:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def save_baseline(path: str, results: Dict[str, Dict]):
+    baseline = load_baseline(path)
+    baseline.update({'python': platform.python_version(), 'machine': platform.machine(),
+                     'numpy': np.__version__})
+    baseline.setdefault('results', {}).update(results)
+    with open(path, 'w') as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def compare(current: Dict, baseline: Optional[Dict], tolerance: float) -> str:
+    """Verdict of one result against its baseline entry"""
+    if not baseline:
+        return 'no baseline'
+    if baseline.get('params') != current['params']:
+        return 'params differ'
+
+    speed = current['ops_per_sec'] / baseline['ops_per_sec'] if baseline['ops_per_sec'] else 1.0
+    p95 = current['p95_ms'] / baseline['p95_ms'] if baseline['p95_ms'] else 1.0
+    verdict = f"{speed:5.2f}x ops/s, {p95:5.2f}x p95"
+    if speed < 1.0 - tolerance or p95 > 1.0 + tolerance:
+        return verdict + '  REGRESSION'
+    return verdict
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# MAIN EXECUTION
+# ═══════════════════════════════════════════════════════════════════════════
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Ultra Trading Bot benchmarks (fake MT5 terminal)")
+    parser.add_argument('benchmarks', nargs='*', metavar='benchmark',
+                        help=f"Benchmarks to run (default: all of {', '.join(BENCHMARKS)})")
+    parser.add_argument('--latency', type=float, default=0.0, help="Seconds slept per terminal call")
+    parser.add_argument('--iterations', type=int, default=2000, help="extract_features calls")
+    parser.add_argument('--train-repeats', type=int, default=3)
+    parser.add_argument('--train-bars', type=int, default=1000)
+    parser.add_argument('--symbols', type=int, default=20, help="Symbols per bot cycle")
+    parser.add_argument('--workers', type=int, default=0, help="BotConfig.scan_workers for bot_cycle")
+    parser.add_argument('--cycles', type=int, default=50)
+    parser.add_argument('--clients', type=int, default=50, help="Concurrent bridge WebSocket clients")
+    parser.add_argument('--messages', type=int, default=200, help="Requests per bridge client")
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument('--json', action='store_true', help="Print results as JSON")
+    args = parser.parse_args(argv)
+    unknown = set(args.benchmarks) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(sorted(unknown))}")
+
+    # Quiet the bot and bridge; their basicConfig calls become no-ops
+    logging.basicConfig(level=logging.ERROR)
+    os.environ.setdefault('TF_CPP_MIN_LOG_LEVEL', '3')
+
+    terminal = install(latency=args.latency)
+    baseline = load_baseline(args.baseline).get('results', {})
+
+    results = {}
+    for name in args.benchmarks or list(BENCHMARKS):
+        result = BENCHMARKS[name](terminal, args)
+        result.params['latency'] = args.latency     # Only like-for-like runs are compared
+        results[name] = result.summary()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'benchmark':<18} {'ops/s':>10} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10}   vs baseline")
+        for name, summary in results.items():
+            print(f"{name:<18} {summary['ops_per_sec']:>10.1f} {summary['p50_ms']:>10.3f} "
+                  f"{summary['p95_ms']:>10.3f} {summary['p99_ms']:>10.3f}   "
+                  f"{compare(summary, baseline.get(name), args.tolerance)}")
+
+    if args.save_baseline:
+        save_baseline(args.baseline, results)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    regressions = [name for name, summary in results.items()
+                   if compare(summary, baseline.get(name), args.tolerance).endswith('REGRESSION')]
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+Ultra Trading Bot - Fake MetaTrader5 Terminal
+Copyright 2025 - Smart Stock Trader
+In-process stand-in for the MetaTrader5 package: deterministic synthetic rates
+and ticks, an in-memory account with positions, and configurable call latency.
+Call install() before importing ultrabot_python or mt5_bridge.
+"""
+
+import sys
+import threading
+import time
+import types
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ultrabot_history import timeframe_seconds
+
+# ═══════════════════════════════════════════════════════════════════════════
+# CONSTANTS (values match the MetaTrader5 package)
+# ═══════════════════════════════════════════════════════════════════════════
+
+TIMEFRAME_M1 = 1
+TIMEFRAME_M5 = 5
+TIMEFRAME_M15 = 15
+TIMEFRAME_M30 = 30
+TIMEFRAME_H1 = 0x4000 | 1
+TIMEFRAME_H4 = 0x4000 | 4
+TIMEFRAME_D1 = 0x4000 | 24
+
+ORDER_TYPE_BUY = 0
+ORDER_TYPE_SELL = 1
+POSITION_TYPE_BUY = 0
+POSITION_TYPE_SELL = 1
+TRADE_ACTION_DEAL = 1
+ORDER_TIME_GTC = 0
+ORDER_FILLING_IOC = 1
+TRADE_RETCODE_DONE = 10009
+TRADE_RETCODE_INVALID = 10013
+
+_CONSTANTS = {name: value for name, value in globals().items() if name.isupper()}
+
+# Same record layout as MetaTrader5.copy_rates_*
+RATES_DTYPE = np.dtype([('time', '<i8'), ('open', '<f8'), ('high', '<f8'), ('low', '<f8'),
+                        ('close', '<f8'), ('tick_volume', '<u8'), ('spread', '<i4'),
+                        ('real_volume', '<u8')])
+
+DEFAULT_NOW = 1_735_689_600       # 2025-01-01 00:00 UTC, a fixed and reproducible clock
+HISTORY_BARS = 20_000             # Bars of history available before DEFAULT_NOW per timeframe
+_CHUNK = 4096                     # Random draws are made in fixed blocks so series never depend on read order
+QUOTE_TIMEFRAME = TIMEFRAME_H1    # Ticks, fills and position profit follow this timeframe's series
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# SYNTHETIC PRICES
+# ═══════════════════════════════════════════════════════════════════════════
+
+class SyntheticSeries:
+    """
+    Seeded random-walk OHLCV bars of one (symbol, timeframe), grown on demand.
+    Bar k opens at origin + k * period; the same seed always yields the same bars.
+    """
+
+    def __init__(self, seed: Tuple[int, ...], period: int, origin: int, base_price: float):
+        self.rng = np.random.Generator(np.random.PCG64(seed))
+        self.period = period
+        self.origin = origin
+        self.base_price = base_price
+        self.bars = np.zeros(0, dtype=RATES_DTYPE)
+        self.lock = threading.Lock()
+
+    def ensure(self, count: int):
+        """Generate bars until at least `count` exist"""
+        with self.lock:
+            self._generate(count)
+
+    def _generate(self, count: int):
+        while len(self.bars) < count:
+            n = _CHUNK
+            returns = self.rng.normal(0.0, 0.004, n) + 0.002 * np.sin(
+                np.arange(len(self.bars), len(self.bars) + n) / 150.0)
+            wicks = np.abs(self.rng.normal(0.0, 0.002, (2, n)))
+            volume = self.rng.integers(50, 5000, n)
+
+            last = self.bars['close'][-1] if len(self.bars) else self.base_price
+            close = last * np.exp(np.cumsum(returns))
+            open_ = np.concatenate(([last], close[:-1]))
+
+            chunk = np.zeros(n, dtype=RATES_DTYPE)
+            chunk['time'] = self.origin + np.arange(len(self.bars), len(self.bars) + n) * self.period
+            chunk['open'] = open_
+            chunk['close'] = close
+            chunk['high'] = np.maximum(open_, close) * (1 + wicks[0])
+            chunk['low'] = np.minimum(open_, close) * (1 - wicks[1])
+            chunk['tick_volume'] = volume
+            chunk['spread'] = 10
+            self.bars = np.concatenate((self.bars, chunk))
+
+    def index(self, timestamp: int) -> int:
+        """Index of the bar containing `timestamp`"""
+        return (int(timestamp) - self.origin) // self.period
+
+    def window(self, first: int, last: int, now: int) -> np.ndarray:
+        """Bars first..last (inclusive), with the bar containing `now` still forming"""
+        first = max(first, 0)
+        last = min(last, self.index(now))
+        if last < first:
+            return np.zeros(0, dtype=RATES_DTYPE)
+
+        self.ensure(last + 1)
+        rates = self.bars[first:last + 1].copy()
+        if last == self.index(now):
+            # Forming bar: interpolate towards its final values by elapsed fraction
+            bar = rates[-1]
+            open_, final = float(bar['open']), float(bar['close'])
+            elapsed = (now - int(bar['time']) + 1) / self.period
+            close = open_ + (final - open_) * elapsed
+            bar['close'] = close
+            bar['high'] = max(open_, close) + (bar['high'] - max(open_, final)) * elapsed
+            bar['low'] = min(open_, close) - (min(open_, final) - bar['low']) * elapsed
+            bar['tick_volume'] = max(1, int(bar['tick_volume'] * elapsed))
+            rates[-1] = bar
+        return rates
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# FAKE TERMINAL
+# ═══════════════════════════════════════════════════════════════════════════
+
+class FakeTerminal:
+    """
+    The MetaTrader5 module API backed by synthetic data.
+    `latency` is slept on every call (seconds); `latencies` overrides it per
+    function name, e.g. {'order_send': 0.05}. The clock only moves via advance().
+    """
+
+    def __init__(self, seed: int = 0, now: int = DEFAULT_NOW, latency: float = 0.0,
+                 latencies: Dict[str, float] = None, balance: float = 100_000.0):
+        self.seed = seed
+        self.now = now
+        self.latency = latency
+        self.latencies = dict(latencies or {})
+        self.balance = balance
+        self.series: Dict[tuple, SyntheticSeries] = {}
+        self.positions: Dict[int, types.SimpleNamespace] = {}
+        self.next_ticket = 1
+        self.calls: Dict[str, int] = {}
+        self.lock = threading.Lock()
+        self.error = (1, 'Success')
+
+    # ── clock and bookkeeping ────────────────────────────────────────────
+
+    def advance(self, seconds: float):
+        """Move the terminal clock forward"""
+        self.now += int(seconds)
+
+    def _call(self, name: str):
+        with self.lock:
+            self.calls[name] = self.calls.get(name, 0) + 1
+        delay = self.latencies.get(name, self.latency)
+        if delay > 0:
+            time.sleep(delay)
+
+    def _series(self, symbol: str, timeframe: int) -> SyntheticSeries:
+        key = (symbol, timeframe)
+        series = self.series.get(key)
+        if series is not None:
+            return series
+
+        with self.lock:
+            series = self.series.get(key)
+            if series is None:
+                period = timeframe_seconds(timeframe)
+                origin = DEFAULT_NOW - DEFAULT_NOW % period - HISTORY_BARS * period
+                symbol_seed = zlib.crc32(symbol.encode())
+                series = SyntheticSeries((self.seed, symbol_seed, timeframe), period, origin,
+                                         50.0 + symbol_seed % 450)
+                self.series[key] = series
+        return series
+
+    def _price(self, symbol: str) -> float:
+        series = self._series(symbol, QUOTE_TIMEFRAME)
+        rates = series.window(series.index(self.now), series.index(self.now), self.now)
+        return float(rates['close'][-1]) if len(rates) else 0.0
+
+    # ── connection ───────────────────────────────────────────────────────
+
+    def initialize(self, *args, **kwargs) -> bool:
+        self._call('initialize')
+        return True
+
+    def login(self, *args, **kwargs) -> bool:
+        self._call('login')
+        return True
+
+    def shutdown(self):
+        self._call('shutdown')
+
+    def last_error(self):
+        return self.error
+
+    # ── market data ──────────────────────────────────────────────────────
+
+    def copy_rates_from_pos(self, symbol: str, timeframe: int, start_pos: int, count: int) -> np.ndarray:
+        self._call('copy_rates_from_pos')
+        series = self._series(symbol, timeframe)
+        last = series.index(self.now) - start_pos
+        return series.window(last - count + 1, last, self.now)
+
+    def copy_rates_range(self, symbol: str, timeframe: int, date_from, date_to) -> np.ndarray:
+        self._call('copy_rates_range')
+        series = self._series(symbol, timeframe)
+        first = -(-(int(_timestamp(date_from)) - series.origin) // series.period)
+        return series.window(first, series.index(_timestamp(date_to)), self.now)
+
+    def symbol_info_tick(self, symbol: str):
+        self._call('symbol_info_tick')
+        bid = self._price(symbol)
+        return types.SimpleNamespace(time=self.now, time_msc=self.now * 1000, bid=bid,
+                                     ask=bid + 10 * 0.01, last=bid, volume=1)
+
+    def symbol_info(self, symbol: str):
+        self._call('symbol_info')
+        bid = self._price(symbol)
+        return types.SimpleNamespace(
+            name=symbol, visible=True, digits=2, point=0.01, spread=10,
+            bid=bid, ask=bid + 10 * 0.01,
+            trade_tick_value=1.0, trade_tick_size=0.01, trade_contract_size=100.0,
+            volume_min=0.01, volume_max=100.0, volume_step=0.01
+        )
+
+    def symbol_select(self, symbol: str, enable: bool = True) -> bool:
+        self._call('symbol_select')
+        return True
+
+    # ── account and trading ──────────────────────────────────────────────
+
+    def _refresh(self, position: types.SimpleNamespace):
+        price = self._price(position.symbol)
+        direction = 1.0 if position.type == POSITION_TYPE_BUY else -1.0
+        position.price_current = price
+        position.profit = round(direction * (price - position.price_open) * position.volume * 100.0, 2)
+
+    def positions_get(self, symbol: str = None, ticket: int = None, group: str = None):
+        self._call('positions_get')
+        with self.lock:
+            positions = [p for p in self.positions.values()
+                         if (symbol is None or p.symbol == symbol) and (ticket is None or p.ticket == ticket)]
+        for position in positions:
+            self._refresh(position)
+        return tuple(types.SimpleNamespace(**vars(p)) for p in positions)
+
+    def account_info(self):
+        self._call('account_info')
+        with self.lock:
+            positions = list(self.positions.values())
+        for position in positions:
+            self._refresh(position)
+        profit = sum(p.profit for p in positions)
+        margin = sum(p.price_open * p.volume for p in positions)
+        equity = self.balance + profit
+        return types.SimpleNamespace(
+            login=1000001, server='FakeMT5-Demo', name='Fake Account', currency='USD', leverage=100,
+            balance=self.balance, equity=equity, profit=profit, margin=margin,
+            margin_free=equity - margin, margin_level=equity / margin * 100 if margin else 0.0
+        )
+
+    def order_send(self, request: Dict):
+        self._call('order_send')
+        volume = float(request.get('volume', 0))
+        if request.get('action') != TRADE_ACTION_DEAL or volume <= 0:
+            return types.SimpleNamespace(retcode=TRADE_RETCODE_INVALID, comment='Invalid request',
+                                         order=0, deal=0, volume=0.0, price=0.0)
+
+        symbol = request['symbol']
+        bid = self._price(symbol)
+        price = bid + 0.1 if request.get('type') == ORDER_TYPE_BUY else bid
+
+        with self.lock:
+            ticket = self.next_ticket
+            self.next_ticket += 1
+            closing = self.positions.get(request.get('position'))
+            if closing is not None:
+                direction = 1.0 if closing.type == POSITION_TYPE_BUY else -1.0
+                self.balance += direction * (price - closing.price_open) * closing.volume * 100.0
+                if volume >= closing.volume:
+                    del self.positions[closing.ticket]
+                else:
+                    closing.volume = round(closing.volume - volume, 2)
+            else:
+                self.positions[ticket] = types.SimpleNamespace(
+                    ticket=ticket, symbol=symbol, time=self.now,
+                    type=POSITION_TYPE_BUY if request.get('type') == ORDER_TYPE_BUY else POSITION_TYPE_SELL,
+                    volume=volume, price_open=price, price_current=price,
+                    sl=float(request.get('sl', 0.0)), tp=float(request.get('tp', 0.0)),
+                    profit=0.0, swap=0.0, comment=request.get('comment', ''),
+                    magic=int(request.get('magic', 0))
+                )
+
+        return types.SimpleNamespace(retcode=TRADE_RETCODE_DONE, comment='Request executed',
+                                     order=ticket, deal=ticket, volume=volume, price=price)
+
+    # ── module ───────────────────────────────────────────────────────────
+
+    def module(self) -> types.ModuleType:
+        """A module object exposing this terminal as the MetaTrader5 API"""
+        module = types.ModuleType('MetaTrader5', 'Fake MetaTrader5 terminal (ultrabot_fakemt5)')
+        module.__dict__.update(_CONSTANTS)
+        for name in ('initialize', 'login', 'shutdown', 'last_error', 'copy_rates_from_pos',
+                     'copy_rates_range', 'symbol_info_tick', 'symbol_info', 'symbol_select',
+                     'positions_get', 'account_info', 'order_send'):
+            setattr(module, name, getattr(self, name))
+        module.terminal = self
+        return module
+
+
+def _timestamp(value) -> int:
+    """Epoch seconds from an int or a datetime"""
+    return int(value.timestamp()) if hasattr(value, 'timestamp') else int(value)
+
+
+def install(terminal: Optional[FakeTerminal] = None, **kwargs) -> FakeTerminal:
+    """
+    Register a fake terminal as the MetaTrader5 module and return it.
+    Modules that already imported MetaTrader5 keep their reference, so call this first.
+    """
+    terminal = terminal or FakeTerminal(**kwargs)
+    sys.modules['MetaTrader5'] = terminal.module()
+    return terminal
+
+
+def symbols(count: int, prefix: str = 'SYM') -> List[str]:
+    """Deterministic symbol names for benchmarks"""
+    return [f"{prefix}{i:03d}" for i in range(count)]
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Ultra Trading Bot - Batch Feature Engine
+Copyright 2025 - Smart Stock Trader
+Computes the 30 ML features for every bar of a rates array in one vectorized pass
+"""
+
+import numpy as np
+from typing import Optional, Sequence, Tuple
+
+from ultrabot_startup import lazy_import
+
+talib = lazy_import('talib')  # Only the batch (training) path needs TA-Lib
+
+# ═══════════════════════════════════════════════════════════════════════════
+# CONSTANTS
+# ═══════════════════════════════════════════════════════════════════════════
+
+NUM_FEATURES = 30
+FEATURE_WINDOW = 100     # Bars OBV/AD are accumulated over
+WARMUP_BARS = 200        # Bars needed before every feature is defined (SMA200)
+H4_TREND_PERIOD = 50
+D1_TREND_PERIOD = 200
+
+LABEL_HORIZON = 5        # Bars ahead used to label a sample
+LABEL_THRESHOLD = 0.5    # % move that counts as BUY/SELL
+
+# Features that fall back to 0 instead of NaN when history is too short
+_OPTIONAL_FEATURES = (9, 28, 29)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# HELPERS
+# ═══════════════════════════════════════════════════════════════════════════
+
+def _ratio(num: np.ndarray, den: np.ndarray, default: float = 0.0) -> np.ndarray:
+    """Element-wise num / den, using default where den <= 0 or undefined"""
+    num = np.broadcast_to(np.asarray(num, dtype=np.float64), np.shape(den))
+    den = np.asarray(den, dtype=np.float64)
+    out = np.full(den.shape, default, dtype=np.float64)
+    ok = np.isfinite(den) & (den > 0)
+    np.divide(num, den, out=out, where=ok)
+    # Propagate warm-up NaNs from the numerator
+    out[np.isnan(den) | np.isnan(num)] = np.nan
+    return out
+
+
+def _shift(values: np.ndarray, n: int) -> np.ndarray:
+    """Value n bars back, NaN where not available"""
+    out = np.full(values.shape, np.nan, dtype=np.float64)
+    if n < len(values):
+        out[n:] = values[:len(values) - n]
+    return out
+
+
+def _rolling_sum(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing sum over window bars, NaN until the window is full"""
+    out = np.full(values.shape, np.nan, dtype=np.float64)
+    if len(values) >= window:
+        csum = np.concatenate(([0.0], np.cumsum(values, dtype=np.float64)))
+        out[window - 1:] = csum[window:] - csum[:-window]
+    return out
+
+
+def bar_seconds(times: np.ndarray) -> int:
+    """Bar period in seconds inferred from a time column"""
+    diffs = np.diff(np.asarray(times, dtype=np.int64))
+    diffs = diffs[diffs > 0]
+    return int(diffs.min()) if len(diffs) else 0
+
+
+def higher_tf_trend(times: np.ndarray, htf_rates: Optional[np.ndarray], period: int) -> np.ndarray:
+    """
+    Distance of the higher-timeframe close from its SMA(period), aligned to each bar.
+    Only higher-timeframe bars that had closed by the time the base bar closed are used,
+    so no row sees the future. Bars without enough higher-timeframe history get 0.
+    """
+    out = np.zeros(len(times), dtype=np.float64)
+    if htf_rates is None or len(htf_rates) < period or len(times) == 0:
+        return out
+
+    htf_close = np.asarray(htf_rates['close'], dtype=np.float64)
+    htf_time = np.asarray(htf_rates['time'], dtype=np.int64)
+    htf_ma = talib.SMA(htf_close, timeperiod=period)
+    htf_trend = np.nan_to_num(_ratio(htf_close - htf_ma, htf_ma), nan=0.0)
+
+    base_close_time = np.asarray(times, dtype=np.int64) + bar_seconds(times)
+    htf_close_time = htf_time + bar_seconds(htf_time)
+    idx = np.searchsorted(htf_close_time, base_close_time, side='right') - 1
+
+    has_bar = idx >= 0
+    out[has_bar] = htf_trend[idx[has_bar]]
+    return out
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# FEATURE MATRIX
+# ═══════════════════════════════════════════════════════════════════════════
+
+def compute_feature_matrix(rates: np.ndarray,
+                           h4_rates: Optional[np.ndarray] = None,
+                           d1_rates: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Compute all 30 features for every bar of a structured MT5 rates array.
+    Returns an (n_bars x 30) matrix; row i only uses data up to bar i.
+    Rows still in indicator warm-up contain NaN.
+    """
+    n = len(rates)
+    X = np.full((n, NUM_FEATURES), np.nan, dtype=np.float64)
+    if n == 0:
+        return X
+
+    open_ = np.asarray(rates['open'], dtype=np.float64)
+    high = np.asarray(rates['high'], dtype=np.float64)
+    low = np.asarray(rates['low'], dtype=np.float64)
+    close = np.asarray(rates['close'], dtype=np.float64)
+    volume = np.asarray(rates['tick_volume'], dtype=np.float64)
+
+    # CATEGORY 1: TREND INDICATORS (10 features)
+    X[:, 0] = talib.RSI(close, timeperiod=14) / 100.0
+    slowk, _ = talib.STOCH(high, low, close, fastk_period=14, slowk_period=3, slowd_period=3)
+    X[:, 1] = slowk / 100.0
+    X[:, 2] = (talib.WILLR(high, low, close, timeperiod=14) + 100) / 100.0
+    X[:, 3] = talib.ADX(high, low, close, timeperiod=14) / 100.0
+    X[:, 4] = talib.PLUS_DI(high, low, close, timeperiod=14) / 100.0
+    X[:, 5] = talib.MINUS_DI(high, low, close, timeperiod=14) / 100.0
+    X[:, 6] = (talib.CCI(high, low, close, timeperiod=14) + 200) / 400.0
+
+    ma10 = talib.EMA(close, timeperiod=10)
+    X[:, 7] = _ratio(close - ma10, ma10)
+    ma50 = talib.SMA(close, timeperiod=50)
+    X[:, 8] = _ratio(close - ma50, ma50)
+    ma200 = talib.SMA(close, timeperiod=200)
+    X[:, 9] = np.nan_to_num(_ratio(close - ma200, ma200), nan=0.0)
+
+    # CATEGORY 2: MOMENTUM INDICATORS (5 features)
+    macd, signal, _ = talib.MACD(close, fastperiod=12, slowperiod=26, signalperiod=9)
+    X[:, 10] = _ratio(macd, close)
+    X[:, 11] = _ratio(signal, close)
+    close_9 = _shift(close, 9)       # close[-10] relative to the current bar
+    close_19 = _shift(close, 19)     # close[-20] relative to the current bar
+    X[:, 12] = _ratio(close - close_9, close_9)
+    X[:, 13] = _ratio(close - close_19, close_19)
+    X[:, 14] = _ratio(talib.MOM(close, timeperiod=10), close)
+
+    # CATEGORY 3: VOLATILITY INDICATORS (5 features)
+    X[:, 15] = _ratio(talib.ATR(high, low, close, timeperiod=14), close)
+    upper, _, lower = talib.BBANDS(close, timeperiod=20, nbdevup=2, nbdevdn=2)
+    band = upper - lower
+    X[:, 16] = _ratio(band, close)
+    X[:, 17] = _ratio(close - lower, band, default=0.5)
+    X[:, 18] = _ratio(talib.STDDEV(close, timeperiod=20), close)
+    X[:, 19] = talib.NATR(high, low, close, timeperiod=14) / 100.0
+
+    # CATEGORY 4: VOLUME INDICATORS (3 features)
+    avg_vol = _rolling_sum(volume, 20) / 20.0
+    X[:, 20] = _ratio(volume, avg_vol, default=1.0)
+
+    # OBV/AD are cumulative, so express them over a fixed FEATURE_WINDOW bars
+    # instead of over however much history happened to be loaded
+    obv = talib.OBV(close, volume)
+    obv_window = obv.copy()
+    w = FEATURE_WINDOW
+    if n > w:
+        obv_window[w:] = obv[w:] - obv[1:n - w + 1] + volume[1:n - w + 1]
+    X[:, 21] = obv_window / 1000000.0
+
+    ad = talib.AD(high, low, close, volume)
+    ad_window = ad.copy()
+    if n > w:
+        ad_window[w:] = ad[w:] - ad[:n - w]
+    X[:, 22] = ad_window / 1000000.0
+
+    # CATEGORY 5: PRICE ACTION PATTERNS (5 features)
+    body = np.abs(close - open_)
+    range_val = high - low
+    X[:, 23] = _ratio(body, range_val, default=0.5)
+    X[:, 24] = _ratio(high - np.maximum(open_, close), range_val)
+    X[:, 25] = _ratio(np.minimum(open_, close) - low, range_val)
+
+    # Bullish score (last 5 candles)
+    candle = np.where(close > open_, 1.0, -1.0)
+    X[:, 26] = (_rolling_sum(candle, 5) + 5) / 10.0
+
+    # Structure score (higher highs/lower lows over the last 4 bar pairs)
+    prev_high = _shift(high, 1)
+    prev_low = _shift(low, 1)
+    step = np.where((high > prev_high) & (low > prev_low), 1.0,
+                    np.where((high < prev_high) & (low < prev_low), -1.0, 0.0))
+    step[0] = 0.0
+    X[:, 27] = (_rolling_sum(step, 4) + 4) / 8.0
+    X[:4, 27] = np.nan    # First bar has no previous bar to compare with
+
+    # CATEGORY 6: MULTI-TIMEFRAME (2 features)
+    times = np.asarray(rates['time'], dtype=np.int64)
+    X[:, 28] = higher_tf_trend(times, h4_rates, H4_TREND_PERIOD)
+    X[:, 29] = higher_tf_trend(times, d1_rates, D1_TREND_PERIOD)
+
+    return X
+
+
+def valid_rows(X: np.ndarray) -> np.ndarray:
+    """Boolean mask of rows whose required features are all defined"""
+    required = np.ones(X.shape[1], dtype=bool)
+    required[list(_OPTIONAL_FEATURES)] = False
+    return np.isfinite(X[:, required]).all(axis=1)
+
+
+def symbol_one_hot(vocabulary: Sequence[str], symbols: Sequence[str]) -> np.ndarray:
+    """Symbol-id feature columns: one-hot over the training symbols, all zero for unknown ones"""
+    index = {symbol: i for i, symbol in enumerate(vocabulary)}
+    out = np.zeros((len(symbols), len(vocabulary)), dtype=np.float64)
+    for row, symbol in enumerate(symbols):
+        if symbol in index:
+            out[row, index[symbol]] = 1.0
+    return out
+
+
+def make_labels(close: np.ndarray, horizon: int = LABEL_HORIZON,
+                threshold: float = LABEL_THRESHOLD) -> np.ndarray:
+    """
+    One-hot labels (BUY, SELL, NEUTRAL) from the % move `horizon` bars ahead.
+    The last `horizon` rows have no outcome yet and are NaN.
+    """
+    close = np.asarray(close, dtype=np.float64)
+    y = np.full((len(close), 3), np.nan, dtype=np.float64)
+    if len(close) <= horizon:
+        return y
+
+    current = close[:-horizon]
+    change = _ratio(close[horizon:] - current, current) * 100.0
+    y[:-horizon] = 0.0
+    y[:-horizon, 0] = change > threshold
+    y[:-horizon, 1] = change < -threshold
+    y[:-horizon, 2] = np.abs(change) <= threshold
+    return y
+
+
+def build_training_set(rates: np.ndarray,
+                       h4_rates: Optional[np.ndarray] = None,
+                       d1_rates: Optional[np.ndarray] = None,
+                       horizon: int = LABEL_HORIZON,
+                       threshold: float = LABEL_THRESHOLD) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Aligned feature matrix and one-hot labels for every usable bar.
+    Drops warm-up rows and the trailing bars that have no outcome yet.
+    """
+    X = compute_feature_matrix(rates, h4_rates, d1_rates)
+    y = make_labels(rates['close'], horizon, threshold)
+
+    mask = valid_rows(X) & np.isfinite(y).all(axis=1)
+    return X[mask], y[mask]
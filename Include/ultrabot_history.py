@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""
+Ultra Trading Bot - Local History Store
+Copyright 2025 - Smart Stock Trader
+Append-only columnar bar files per (symbol, timeframe), memory-mapped on load so
+training, backtests and feature building read years of bars without copying them
+or asking the terminal again. `sync` appends only the bars closed since the last
+stored one.
+
+    python ultrabot_history.py sync AAPL MSFT --timeframes H1 H4 D1 --bars 100000
+    python ultrabot_history.py sync EURUSD --timeframes M1 --since 2015-01-01
+    python ultrabot_history.py info
+
+Layout: <root>/<SYMBOL>/<TIMEFRAME>/<column>.bin holds raw little-endian values,
+one file per column, plus <root>/<SYMBOL>/symbol.json with the contract specs.
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+import types
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ultrabot_features import D1_TREND_PERIOD, H4_TREND_PERIOD
+
+# ═══════════════════════════════════════════════════════════════════════════
+# CONSTANTS
+# ═══════════════════════════════════════════════════════════════════════════
+
+# Stored columns, in the dtypes MetaTrader5.copy_rates_* returns them
+COLUMNS = {
+    'time': np.dtype('<i8'),
+    'open': np.dtype('<f8'),
+    'high': np.dtype('<f8'),
+    'low': np.dtype('<f8'),
+    'close': np.dtype('<f8'),
+    'tick_volume': np.dtype('<u8'),
+    'spread': np.dtype('<i4'),
+}
+
+# MT5 TIMEFRAME_* values by name (fixed by the MetaTrader5 package)
+TIMEFRAMES = {
+    'M1': 1, 'M2': 2, 'M3': 3, 'M4': 4, 'M5': 5, 'M6': 6, 'M10': 10, 'M12': 12,
+    'M15': 15, 'M20': 20, 'M30': 30,
+    'H1': 0x4001, 'H2': 0x4002, 'H3': 0x4003, 'H4': 0x4004, 'H6': 0x4006,
+    'H8': 0x4008, 'H12': 0x400C, 'D1': 0x4018, 'W1': 0x8001, 'MN1': 0xC001,
+}
+TIMEFRAME_NAMES = {value: name for name, value in TIMEFRAMES.items()}
+
+SPEC_FIELDS = ('point', 'digits', 'trade_tick_value', 'trade_tick_size', 'trade_contract_size',
+               'volume_min', 'volume_max', 'volume_step')
+
+DEFAULT_SYNC_BARS = 100_000     # History fetched by the first sync of a (symbol, timeframe)
+SYNC_CHUNK_BARS = 100_000       # Bars requested per copy_rates_range call
+
+
+def timeframe_seconds(timeframe: int) -> int:
+    """Bar length of an MT5 TIMEFRAME_* constant"""
+    if timeframe < 0x4000:
+        return timeframe * 60                   # M1 .. M30 (value is minutes)
+    if timeframe & 0xC000 == 0x4000:
+        return (timeframe & 0x3FFF) * 3600      # H1 .. D1 (low bits are hours)
+    if timeframe & 0xC000 == 0x8000:
+        return 7 * 86400                        # W1
+    return 30 * 86400                           # MN1 (approximate)
+
+
+def parse_timeframe(value) -> int:
+    """'H1', 'h1' or 16385 to the MT5 constant"""
+    if isinstance(value, int):
+        return value
+    name = str(value).upper()
+    if name in TIMEFRAMES:
+        return TIMEFRAMES[name]
+    if name.isdigit():
+        return int(name)
+    raise ValueError(f"Unknown timeframe: {value}")
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# COLUMNAR RATES
+# ═══════════════════════════════════════════════════════════════════════════
+
+class ColumnarRates:
+    """
+    Read-only bars held as separate column arrays (memory-mapped by HistoryStore).
+    Indexed like an MT5 rates array - rates['close'], len(rates), rates[a:b] - so it
+    can be passed wherever compute_feature_matrix or prepare_market_data take rates.
+    """
+
+    __slots__ = ('columns',)
+
+    def __init__(self, columns: Dict[str, np.ndarray]):
+        self.columns = columns
+
+    def __len__(self) -> int:
+        return len(self.columns['time'])
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return self.columns[key]
+        if isinstance(key, slice):
+            return ColumnarRates({name: column[key] for name, column in self.columns.items()})
+        raise TypeError("ColumnarRates is indexed by column name or slice")
+
+    @property
+    def dtype(self) -> np.dtype:
+        return np.dtype([(name, column.dtype) for name, column in self.columns.items()])
+
+    def between(self, start: int = None, end: int = None) -> 'ColumnarRates':
+        """Bars with start <= time <= end (views, no copy)"""
+        times = self.columns['time']
+        first = 0 if start is None else int(np.searchsorted(times, start, side='left'))
+        last = len(times) if end is None else int(np.searchsorted(times, end, side='right'))
+        return self[first:last]
+
+    def to_records(self) -> np.ndarray:
+        """Copy into a structured array shaped like copy_rates_* output"""
+        out = np.empty(len(self), dtype=self.dtype)
+        for name, column in self.columns.items():
+            out[name] = column
+        return out
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# HISTORY STORE
+# ═══════════════════════════════════════════════════════════════════════════
+
+class HistoryStore:
+    """
+    Append-only bar files under one root directory.
+    Readers map the bars that exist when they load; a concurrent sync only grows
+    the files, so earlier maps stay valid. A sync interrupted between columns is
+    repaired by truncating every column to the shortest on the next append.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self.logger = logging.getLogger(__name__)
+
+    def path(self, symbol: str, timeframe: int) -> str:
+        return os.path.join(self.root, symbol, TIMEFRAME_NAMES.get(timeframe, str(timeframe)))
+
+    def _column_path(self, symbol: str, timeframe: int, column: str) -> str:
+        return os.path.join(self.path(symbol, timeframe), column + '.bin')
+
+    def count(self, symbol: str, timeframe: int) -> int:
+        """Complete bars stored (rows present in every column)"""
+        sizes = []
+        for column, dtype in COLUMNS.items():
+            try:
+                sizes.append(os.path.getsize(self._column_path(symbol, timeframe, column)) // dtype.itemsize)
+            except FileNotFoundError:
+                return 0
+        return min(sizes)
+
+    def last_time(self, symbol: str, timeframe: int) -> Optional[int]:
+        """Open time of the newest stored bar, None if nothing is stored"""
+        count = self.count(symbol, timeframe)
+        if count == 0:
+            return None
+        with open(self._column_path(symbol, timeframe, 'time'), 'rb') as f:
+            f.seek((count - 1) * COLUMNS['time'].itemsize)
+            return int(np.frombuffer(f.read(COLUMNS['time'].itemsize), dtype=COLUMNS['time'])[0])
+
+    def contents(self) -> List[Tuple[str, int]]:
+        """Every stored (symbol, timeframe)"""
+        if not os.path.isdir(self.root):
+            return []
+        keys = []
+        for symbol in sorted(os.listdir(self.root)):
+            if not os.path.isdir(os.path.join(self.root, symbol)):
+                continue
+            for name in sorted(os.listdir(os.path.join(self.root, symbol))):
+                if name in TIMEFRAMES or name.isdigit():
+                    keys.append((symbol, parse_timeframe(name)))
+        return keys
+
+    def load(self, symbol: str, timeframe: int, count: int = None,
+             start: int = None, end: int = None) -> Optional[ColumnarRates]:
+        """
+        Stored bars as memory-mapped columns (no bars are read until used).
+        `start`/`end` bound the open time; `count` keeps the newest bars of that range.
+        """
+        stored = self.count(symbol, timeframe)
+        if stored == 0:
+            return None
+
+        rates = ColumnarRates({
+            column: np.memmap(self._column_path(symbol, timeframe, column), dtype=dtype,
+                              mode='r', shape=(stored,))
+            for column, dtype in COLUMNS.items()
+        })
+        if start is not None or end is not None:
+            rates = rates.between(start, end)
+        if count is not None:
+            rates = rates[max(len(rates) - count, 0):]
+        return rates if len(rates) else None
+
+    def higher_timeframes(self, symbol: str, timeframe: int,
+                          rates: ColumnarRates) -> Tuple[Optional[ColumnarRates], Optional[ColumnarRates]]:
+        """Stored H4/D1 bars covering `rates` for the multi-timeframe features"""
+        first, last = int(rates['time'][0]), int(rates['time'][-1])
+        h4 = None
+        if timeframe == TIMEFRAMES['H1']:
+            h4 = self.load(symbol, TIMEFRAMES['H4'], start=first - (H4_TREND_PERIOD + 1) * 4 * 3600, end=last)
+        d1 = self.load(symbol, TIMEFRAMES['D1'], start=first - (D1_TREND_PERIOD + 1) * 86400, end=last)
+        return h4, d1
+
+    def symbol_info(self, symbol: str):
+        """Contract specs saved by the last sync (attributes as mt5.symbol_info), or None"""
+        try:
+            with open(os.path.join(self.root, symbol, 'symbol.json')) as f:
+                return types.SimpleNamespace(**json.load(f))
+        except FileNotFoundError:
+            return None
+
+    def append(self, symbol: str, timeframe: int, rates: np.ndarray) -> int:
+        """Append the bars newer than the last stored one; returns how many were written"""
+        if rates is None or len(rates) == 0:
+            return 0
+
+        os.makedirs(self.path(symbol, timeframe), exist_ok=True)
+        stored = self._repair(symbol, timeframe)
+        last = self.last_time(symbol, timeframe)
+        if last is not None:
+            rates = rates[rates['time'] > last]
+        if len(rates) == 0:
+            return 0
+        if np.any(np.diff(rates['time']) <= 0):
+            raise ValueError(f"{symbol}: bars to append are not in time order")
+
+        names = rates.dtype.names
+        # Time goes last: until it is written, the partial row does not count
+        for column in sorted(COLUMNS, key=lambda name: name == 'time'):
+            values = rates[column] if column in names else np.zeros(len(rates))
+            with open(self._column_path(symbol, timeframe, column), 'ab') as f:
+                f.write(np.ascontiguousarray(values, dtype=COLUMNS[column]).tobytes())
+
+        self.logger.debug(f"{symbol} {TIMEFRAME_NAMES.get(timeframe, timeframe)}: "
+                          f"{stored} + {len(rates)} bars")
+        return len(rates)
+
+    def _repair(self, symbol: str, timeframe: int) -> int:
+        """Truncate columns left longer than the rest by an interrupted append"""
+        stored = self.count(symbol, timeframe)
+        for column, dtype in COLUMNS.items():
+            path = self._column_path(symbol, timeframe, column)
+            if not os.path.exists(path):
+                open(path, 'wb').close()
+            elif os.path.getsize(path) != stored * dtype.itemsize:
+                with open(path, 'r+b') as f:
+                    f.truncate(stored * dtype.itemsize)
+        return stored
+
+    def save_symbol_info(self, symbol: str, info):
+        os.makedirs(os.path.join(self.root, symbol), exist_ok=True)
+        spec = {name: getattr(info, name) for name in SPEC_FIELDS if hasattr(info, name)}
+        with open(os.path.join(self.root, symbol, 'symbol.json'), 'w') as f:
+            json.dump(spec, f, indent=2)
+
+    def sync(self, symbol: str, timeframe: int, bars: int = DEFAULT_SYNC_BARS,
+             since: int = None) -> int:
+        """
+        Append the closed bars the store is missing from the MT5 terminal.
+        An empty key starts from `since` (a timestamp) if given, else the newest `bars`.
+        The caller must have initialized the terminal.
+        """
+        import MetaTrader5 as mt5
+
+        info = mt5.symbol_info(symbol)
+        if info is not None:
+            self.save_symbol_info(symbol, info)
+
+        # Position 0 is the forming bar; only bars opened before it are final
+        forming = mt5.copy_rates_from_pos(symbol, timeframe, 0, 1)
+        if forming is None or len(forming) == 0:
+            self.logger.warning(f"{symbol}: no bars from the terminal ({mt5.last_error()})")
+            return 0
+        forming_time = int(forming['time'][0])
+
+        last = self.last_time(symbol, timeframe)
+        if last is None and since is None:
+            return self.append(symbol, timeframe, mt5.copy_rates_from_pos(symbol, timeframe, 1, bars))
+
+        # Walk forward in bounded chunks so a long gap is never one huge request
+        start = last + 1 if last is not None else since
+        step = SYNC_CHUNK_BARS * timeframe_seconds(timeframe)
+        appended = 0
+        while start < forming_time:
+            stop = min(start + step, forming_time - 1)
+            rates = mt5.copy_rates_range(symbol, timeframe, start, stop)
+            if rates is not None and len(rates):
+                appended += self.append(symbol, timeframe, rates[rates['time'] < forming_time])
+            start = stop + 1
+        return appended
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# MAIN EXECUTION
+# ═══════════════════════════════════════════════════════════════════════════
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Local memory-mapped bar history")
+    parser.add_argument('--root', default='history', help="Store directory")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    sync = commands.add_parser('sync', help="Append missing closed bars from the MT5 terminal")
+    sync.add_argument('symbols', nargs='+')
+    sync.add_argument('--timeframes', nargs='+', default=['H1', 'H4', 'D1'])
+    sync.add_argument('--bars', type=int, default=DEFAULT_SYNC_BARS, help="First sync depth")
+    sync.add_argument('--since', help="First sync start date (YYYY-MM-DD, UTC); overrides --bars")
+
+    commands.add_parser('info', help="List stored symbols and ranges")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(message)s')
+    logger = logging.getLogger(__name__)
+    store = HistoryStore(args.root)
+
+    if args.command == 'info':
+        for symbol, timeframe in store.contents():
+            count = store.count(symbol, timeframe)
+            if count == 0:
+                continue
+            times = store.load(symbol, timeframe)['time']
+            print(f"{symbol:<12} {TIMEFRAME_NAMES.get(timeframe, timeframe):<4} {count:>10} bars  "
+                  f"{datetime.fromtimestamp(int(times[0]), timezone.utc):%Y-%m-%d %H:%M} .. "
+                  f"{datetime.fromtimestamp(int(times[-1]), timezone.utc):%Y-%m-%d %H:%M}")
+        return 0
+
+    import MetaTrader5 as mt5
+    if not mt5.initialize():
+        logger.error(f"MT5 initialization failed: {mt5.last_error()}")
+        return 1
+
+    since = None
+    if args.since:
+        since = int(datetime.strptime(args.since, '%Y-%m-%d').replace(tzinfo=timezone.utc).timestamp())
+
+    try:
+        timeframes = [parse_timeframe(name) for name in args.timeframes]
+        for symbol in args.symbols:
+            for timeframe in timeframes:
+                started = time.perf_counter()
+                appended = store.sync(symbol, timeframe, args.bars, since)
+                logger.info(f"{symbol} {TIMEFRAME_NAMES.get(timeframe, timeframe)}: +{appended} bars "
+                            f"({store.count(symbol, timeframe)} stored, {time.perf_counter() - started:.2f}s)")
+    finally:
+        mt5.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
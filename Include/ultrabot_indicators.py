@@ -0,0 +1,553 @@
+#!/usr/bin/env python3
+"""
+Ultra Trading Bot - Streaming Indicator Engine
+Copyright 2025 - Smart Stock Trader
+Stateful indicators that update in constant time per bar and match TA-Lib's batch output
+"""
+
+import math
+from collections import deque
+from typing import Dict, Optional
+
+import numpy as np
+
+from ultrabot_features import NUM_FEATURES, FEATURE_WINDOW
+
+NAN = float('nan')
+
+
+def _is_zero(value: float) -> bool:
+    """TA-Lib's TA_IS_ZERO"""
+    return -0.00000001 < value < 0.00000001
+
+
+def _ratio(num: float, den: float, default: float = 0.0) -> float:
+    """num / den, using default where den <= 0 (scalar twin of the batch helper)"""
+    if math.isnan(num) or math.isnan(den):
+        return NAN
+    if math.isfinite(den) and den > 0:
+        return num / den
+    return default
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# INDICATORS
+# ═══════════════════════════════════════════════════════════════════════════
+# Every indicator takes commit=False to evaluate a bar that is still forming
+# without changing its state, and returns NaN until it is warmed up.
+
+class SMA:
+    """Simple moving average"""
+
+    def __init__(self, period: int):
+        self.period = period
+        self.window = deque()
+        self.total = 0.0
+
+    def update(self, value: float, commit: bool = True) -> float:
+        total = self.total + value
+        size = len(self.window) + 1
+        if size > self.period:
+            total -= self.window[0]
+            size = self.period
+
+        if commit:
+            self.window.append(value)
+            if len(self.window) > self.period:
+                self.window.popleft()
+            self.total = total
+
+        return total / self.period if size == self.period else NAN
+
+
+class EMA:
+    """Exponential moving average seeded with the SMA of its first `period` inputs"""
+
+    def __init__(self, period: int, skip: int = 0):
+        self.k = 2.0 / (period + 1)
+        self.seed = SMA(period)
+        self.skip = skip    # Inputs ignored before seeding starts (TA-Lib MACD alignment)
+        self.value = NAN
+
+    def update(self, value: float, commit: bool = True) -> float:
+        if self.skip > 0:
+            if commit:
+                self.skip -= 1
+            return NAN
+
+        if math.isnan(self.value):
+            result = self.seed.update(value, commit)
+        else:
+            result = self.value + self.k * (value - self.value)
+
+        if commit:
+            self.value = result
+        return result
+
+
+class RSI:
+    """Wilder's relative strength index"""
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.prev_close = None
+        self.changes = 0
+        self.avg_gain = 0.0     # Running sums until warmed up
+        self.avg_loss = 0.0
+
+    def update(self, close: float, commit: bool = True) -> float:
+        if self.prev_close is None:
+            if commit:
+                self.prev_close = close
+            return NAN
+
+        diff = close - self.prev_close
+        gain = diff if diff > 0 else 0.0
+        loss = -diff if diff < 0 else 0.0
+        changes = self.changes + 1
+        p = self.period
+
+        if changes < p:
+            avg_gain, avg_loss = self.avg_gain + gain, self.avg_loss + loss
+            result = NAN
+        else:
+            if changes == p:
+                avg_gain, avg_loss = (self.avg_gain + gain) / p, (self.avg_loss + loss) / p
+            else:
+                avg_gain = (self.avg_gain * (p - 1) + gain) / p
+                avg_loss = (self.avg_loss * (p - 1) + loss) / p
+            total = avg_gain + avg_loss
+            result = 100.0 * (avg_gain / total) if not _is_zero(total) else 0.0
+
+        if commit:
+            self.prev_close = close
+            self.changes = changes
+            self.avg_gain, self.avg_loss = avg_gain, avg_loss
+        return result
+
+
+class ATR:
+    """Wilder's average true range"""
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.prev_close = None
+        self.count = 0
+        self.value = 0.0    # Running TR sum until warmed up
+
+    def update(self, high: float, low: float, close: float, commit: bool = True) -> float:
+        if self.prev_close is None:
+            if commit:
+                self.prev_close = close
+            return NAN
+
+        tr = max(high - low, abs(high - self.prev_close), abs(low - self.prev_close))
+        count = self.count + 1
+        p = self.period
+
+        if count < p:
+            value, result = self.value + tr, NAN
+        elif count == p:
+            value = (self.value + tr) / p
+            result = value
+        else:
+            value = (self.value * (p - 1) + tr) / p
+            result = value
+
+        if commit:
+            self.prev_close = close
+            self.count = count
+            self.value = value
+        return result
+
+
+class DirectionalMovement:
+    """Wilder's +DI, -DI and ADX sharing one smoothing pass"""
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.prev = None        # (high, low, close)
+        self.count = 0
+        self.plus_dm = 0.0
+        self.minus_dm = 0.0
+        self.tr = 0.0
+        self.sum_dx = 0.0
+        self.adx = NAN
+
+    def update(self, high: float, low: float, close: float, commit: bool = True):
+        """Returns (plus_di, minus_di, adx)"""
+        if self.prev is None:
+            if commit:
+                self.prev = (high, low, close)
+            return NAN, NAN, NAN
+
+        prev_high, prev_low, prev_close = self.prev
+        diff_p = high - prev_high
+        diff_m = prev_low - low
+        plus = diff_p if diff_p > 0 and diff_p > diff_m else 0.0
+        minus = diff_m if diff_m > 0 and diff_m > diff_p else 0.0
+        tr = max(high - low, abs(high - prev_close), abs(low - prev_close))
+
+        p = self.period
+        count = self.count + 1
+        plus_dm, minus_dm, sum_tr = self.plus_dm, self.minus_dm, self.tr
+        sum_dx, adx = self.sum_dx, self.adx
+        plus_di = minus_di = result_adx = NAN
+
+        if count < p:
+            plus_dm, minus_dm, sum_tr = plus_dm + plus, minus_dm + minus, sum_tr + tr
+        else:
+            plus_dm = plus_dm - plus_dm / p + plus
+            minus_dm = minus_dm - minus_dm / p + minus
+            sum_tr = sum_tr - sum_tr / p + tr
+
+            dx = None
+            if not _is_zero(sum_tr):
+                plus_di = 100.0 * (plus_dm / sum_tr)
+                minus_di = 100.0 * (minus_dm / sum_tr)
+                di_sum = plus_di + minus_di
+                if not _is_zero(di_sum):
+                    dx = 100.0 * (abs(minus_di - plus_di) / di_sum)
+            else:
+                plus_di = minus_di = 0.0
+
+            if count < 2 * p:
+                sum_dx += dx or 0.0
+                if count == 2 * p - 1:
+                    adx = sum_dx / p
+            elif dx is not None:
+                adx = (adx * (p - 1) + dx) / p
+            result_adx = adx
+
+        if commit:
+            self.prev = (high, low, close)
+            self.count = count
+            self.plus_dm, self.minus_dm, self.tr = plus_dm, minus_dm, sum_tr
+            self.sum_dx, self.adx = sum_dx, adx
+        return plus_di, minus_di, result_adx
+
+
+class Stochastic:
+    """Slow stochastic %K (SMA-smoothed), aligned with TA-Lib's STOCH output"""
+
+    def __init__(self, fastk_period: int = 14, slowk_period: int = 3, slowd_period: int = 3):
+        self.fastk_period = fastk_period
+        self.highs = deque(maxlen=fastk_period - 1)
+        self.lows = deque(maxlen=fastk_period - 1)
+        self.slowk = SMA(slowk_period)
+        self.slowd = SMA(slowd_period)
+
+    def update(self, high: float, low: float, close: float, commit: bool = True) -> float:
+        slowk = NAN
+        if len(self.highs) == self.fastk_period - 1:
+            highest = max(max(self.highs), high)
+            lowest = min(min(self.lows), low)
+            diff = (highest - lowest) / 100.0
+            fastk = (close - lowest) / diff if diff != 0 else 0.0
+            slowk = self.slowk.update(fastk, commit)
+            if not math.isnan(slowk):
+                # TA-Lib only reports %K once %D is defined as well
+                if math.isnan(self.slowd.update(slowk, commit)):
+                    slowk = NAN
+
+        if commit:
+            self.highs.append(high)
+            self.lows.append(low)
+        return slowk
+
+
+class WilliamsR:
+    """Williams %R"""
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.highs = deque(maxlen=period - 1)
+        self.lows = deque(maxlen=period - 1)
+
+    def update(self, high: float, low: float, close: float, commit: bool = True) -> float:
+        result = NAN
+        if len(self.highs) == self.period - 1:
+            highest = max(max(self.highs), high)
+            lowest = min(min(self.lows), low)
+            diff = (highest - lowest) / -100.0
+            result = (highest - close) / diff if diff != 0 else 0.0
+
+        if commit:
+            self.highs.append(high)
+            self.lows.append(low)
+        return result
+
+
+class CCI:
+    """Commodity channel index"""
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.prices = deque(maxlen=period - 1)
+
+    def update(self, high: float, low: float, close: float, commit: bool = True) -> float:
+        typical = (high + low + close) / 3.0
+        result = NAN
+        if len(self.prices) == self.period - 1:
+            window = list(self.prices) + [typical]
+            average = sum(window) / self.period
+            deviation = sum(abs(x - average) for x in window)
+            diff = typical - average
+            if diff != 0.0 and deviation != 0.0:
+                result = diff / (0.015 * (deviation / self.period))
+            else:
+                result = 0.0
+
+        if commit:
+            self.prices.append(typical)
+        return result
+
+
+class StdDev:
+    """Population standard deviation over a window"""
+
+    def __init__(self, period: int = 20):
+        self.period = period
+        self.window = deque()
+        self.total = 0.0
+        self.total_sq = 0.0
+
+    def update(self, value: float, commit: bool = True):
+        """Returns (mean, stddev)"""
+        total, total_sq = self.total + value, self.total_sq + value * value
+        size = len(self.window) + 1
+        if size > self.period:
+            oldest = self.window[0]
+            total, total_sq = total - oldest, total_sq - oldest * oldest
+            size = self.period
+
+        if commit:
+            self.window.append(value)
+            if len(self.window) > self.period:
+                self.window.popleft()
+            self.total, self.total_sq = total, total_sq
+
+        if size < self.period:
+            return NAN, NAN
+        mean = total / self.period
+        variance = total_sq / self.period - mean * mean
+        return mean, math.sqrt(variance) if variance >= 0.00000001 else 0.0
+
+
+class BollingerBands:
+    """Bollinger Bands over an SMA middle band"""
+
+    def __init__(self, period: int = 20, nbdev: float = 2.0):
+        self.nbdev = nbdev
+        self.stddev = StdDev(period)
+
+    def update(self, close: float, commit: bool = True):
+        """Returns (upper, middle, lower)"""
+        middle, sd = self.stddev.update(close, commit)
+        return middle + self.nbdev * sd, middle, middle - self.nbdev * sd
+
+
+class MACD:
+    """MACD line and signal, seeded the way TA-Lib seeds them"""
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        # TA-Lib seeds the fast EMA on the bars just before the slow EMA's first value
+        self.fast = EMA(fast, skip=slow - fast)
+        self.slow = EMA(slow)
+        self.signal = EMA(signal)
+
+    def update(self, close: float, commit: bool = True):
+        """Returns (macd, signal)"""
+        fast = self.fast.update(close, commit)
+        slow = self.slow.update(close, commit)
+        if math.isnan(slow):
+            return NAN, NAN
+
+        macd = fast - slow
+        signal = self.signal.update(macd, commit)
+        if math.isnan(signal):
+            return NAN, NAN
+        return macd, signal
+
+
+class OBV:
+    """On-balance volume"""
+
+    def __init__(self):
+        self.prev_close = None
+        self.value = 0.0
+
+    def update(self, close: float, volume: float, commit: bool = True) -> float:
+        if self.prev_close is None:
+            value = volume
+        elif close > self.prev_close:
+            value = self.value + volume
+        elif close < self.prev_close:
+            value = self.value - volume
+        else:
+            value = self.value
+
+        if commit:
+            self.prev_close = close
+            self.value = value
+        return value
+
+
+class AD:
+    """Chaikin accumulation/distribution line"""
+
+    def __init__(self):
+        self.value = 0.0
+
+    def update(self, high: float, low: float, close: float, volume: float,
+               commit: bool = True) -> float:
+        value = self.value
+        span = high - low
+        if span > 0.0:
+            value += (((close - low) - (high - close)) / span) * volume
+
+        if commit:
+            self.value = value
+        return value
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# STREAMING FEATURES
+# ═══════════════════════════════════════════════════════════════════════════
+
+class StreamingFeatures:
+    """
+    Incremental twin of ultrabot_features.compute_feature_matrix for one
+    (symbol, timeframe). Feed closed bars with commit=True and evaluate the
+    forming bar with commit=False; each update is O(1) in the history length.
+    """
+
+    def __init__(self):
+        self.rsi = RSI(14)
+        self.stoch = Stochastic(14, 3, 3)
+        self.willr = WilliamsR(14)
+        self.dm = DirectionalMovement(14)
+        self.cci = CCI(14)
+        self.ema10 = EMA(10)
+        self.sma50 = SMA(50)
+        self.sma200 = SMA(200)
+        self.macd = MACD(12, 26, 9)
+        self.atr = ATR(14)
+        self.bbands = BollingerBands(20, 2.0)
+        self.stddev = StdDev(20)
+        self.volume = SMA(20)
+        self.obv = OBV()
+        self.ad = AD()
+
+        self.closes = deque(maxlen=19)                  # For close[-10], close[-20], MOM(10)
+        self.obv_window = deque(maxlen=FEATURE_WINDOW)  # (obv, volume) of recent bars
+        self.ad_window = deque(maxlen=FEATURE_WINDOW)
+        self.candles = deque(maxlen=4)
+        self.steps = deque(maxlen=3)
+        self.prev_bar = None                            # (high, low)
+
+        self.bars = 0
+        self.last_time = None
+        self.closed: Dict[str, float] = {}   # Indicator values as of the last committed bar
+        self.current: Dict[str, float] = {}  # Indicator values as of the last update
+
+    def update(self, bar, commit: bool = True,
+               h4_trend: float = 0.0, d1_trend: float = 0.0) -> np.ndarray:
+        """Feed one rates record and return its 30-feature row"""
+        open_, high, low, close = float(bar['open']), float(bar['high']), float(bar['low']), float(bar['close'])
+        volume = float(bar['tick_volume'])
+
+        rsi = self.rsi.update(close, commit)
+        slowk = self.stoch.update(high, low, close, commit)
+        willr = self.willr.update(high, low, close, commit)
+        plus_di, minus_di, adx = self.dm.update(high, low, close, commit)
+        cci = self.cci.update(high, low, close, commit)
+        ema10 = self.ema10.update(close, commit)
+        sma50 = self.sma50.update(close, commit)
+        sma200 = self.sma200.update(close, commit)
+        macd, signal = self.macd.update(close, commit)
+        atr = self.atr.update(high, low, close, commit)
+        upper, _, lower = self.bbands.update(close, commit)
+        _, stddev = self.stddev.update(close, commit)
+        avg_vol = self.volume.update(volume, commit)
+        obv = self.obv.update(close, volume, commit)
+        ad = self.ad.update(high, low, close, volume, commit)
+
+        closes = self.closes
+        close_9 = closes[-9] if len(closes) >= 9 else NAN
+        close_10 = closes[-10] if len(closes) >= 10 else NAN
+        close_19 = closes[-19] if len(closes) >= 19 else NAN
+
+        # OBV/AD relative to the last FEATURE_WINDOW bars (see the batch engine)
+        if self.obv_window:
+            base_obv, base_vol = self.obv_window[1 if len(self.obv_window) == FEATURE_WINDOW else 0]
+            obv_window = obv - base_obv + base_vol
+        else:
+            obv_window = obv
+        ad_window = ad - self.ad_window[0] if len(self.ad_window) == FEATURE_WINDOW else ad
+
+        candle = 1.0 if close > open_ else -1.0
+        step = None
+        if self.prev_bar is not None:
+            prev_high, prev_low = self.prev_bar
+            if high > prev_high and low > prev_low:
+                step = 1.0
+            elif high < prev_high and low < prev_low:
+                step = -1.0
+            else:
+                step = 0.0
+
+        f = np.full(NUM_FEATURES, NAN)
+        f[0] = rsi / 100.0
+        f[1] = slowk / 100.0
+        f[2] = (willr + 100) / 100.0
+        f[3] = adx / 100.0
+        f[4] = plus_di / 100.0
+        f[5] = minus_di / 100.0
+        f[6] = (cci + 200) / 400.0
+        f[7] = _ratio(close - ema10, ema10)
+        f[8] = _ratio(close - sma50, sma50)
+        ma200 = _ratio(close - sma200, sma200)
+        f[9] = 0.0 if math.isnan(ma200) else ma200
+        f[10] = _ratio(macd, close)
+        f[11] = _ratio(signal, close)
+        f[12] = _ratio(close - close_9, close_9)
+        f[13] = _ratio(close - close_19, close_19)
+        f[14] = _ratio(close - close_10, close)
+        f[15] = _ratio(atr, close)
+        f[16] = _ratio(upper - lower, close)
+        f[17] = _ratio(close - lower, upper - lower, default=0.5)
+        f[18] = _ratio(stddev, close)
+        f[19] = atr / close if not _is_zero(close) else 0.0
+        f[20] = _ratio(volume, avg_vol, default=1.0)
+        f[21] = obv_window / 1000000.0
+        f[22] = ad_window / 1000000.0
+
+        range_val = high - low
+        f[23] = _ratio(abs(close - open_), range_val, default=0.5)
+        f[24] = _ratio(high - max(open_, close), range_val)
+        f[25] = _ratio(min(open_, close) - low, range_val)
+        if len(self.candles) == 4:
+            f[26] = (sum(self.candles) + candle + 5) / 10.0
+        if step is not None and len(self.steps) == 3:
+            f[27] = (sum(self.steps) + step + 4) / 8.0
+        f[28] = h4_trend
+        f[29] = d1_trend
+
+        self.current = {
+            'rsi': rsi, 'ema10': ema10, 'sma50': sma50, 'sma200': sma200,
+            'atr': atr, 'macd': macd, 'macd_signal': signal, 'adx': adx,
+        }
+        if commit:
+            closes.append(close)
+            self.obv_window.append((obv, volume))
+            self.ad_window.append(ad)
+            self.candles.append(candle)
+            if step is not None:
+                self.steps.append(step)
+            self.prev_bar = (high, low)
+            self.bars += 1
+            self.last_time = int(bar['time'])
+            self.closed = self.current
+
+        return f
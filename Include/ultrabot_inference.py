@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Ultra Trading Bot - NumPy Inference Engine
+Copyright 2025 - Smart Stock Trader
+Runs the exported 30 → 20 → 3 network and scaler without TensorFlow or scikit-learn
+"""
+
+import numpy as np
+from typing import List, Sequence, Tuple
+
+# Activations supported by the exported Dense layers
+ACTIVATIONS = {
+    'linear': lambda x: x,
+    'relu': lambda x: np.maximum(x, 0.0),
+    'tanh': np.tanh,
+    'sigmoid': lambda x: 1.0 / (1.0 + np.exp(-x)),
+}
+
+
+def softmax(x: np.ndarray) -> np.ndarray:
+    """Row-wise softmax"""
+    e = np.exp(x - x.max(axis=1, keepdims=True))
+    return e / e.sum(axis=1, keepdims=True)
+
+
+ACTIVATIONS['softmax'] = softmax
+
+
+class NumpyScaler:
+    """StandardScaler.transform from exported mean/scale"""
+
+    def __init__(self, mean: np.ndarray, scale: np.ndarray):
+        self.mean_ = np.asarray(mean, dtype=np.float64)
+        self.scale_ = np.asarray(scale, dtype=np.float64)
+
+    def transform(self, X: np.ndarray) -> np.ndarray:
+        return (np.asarray(X, dtype=np.float64) - self.mean_) / self.scale_
+
+
+class NumpyPredictor:
+    """
+    Dense network forward pass in plain NumPy.
+    Exposes predict_on_batch so MLModel can use it in place of the Keras model.
+    `symbols` lists the symbol-id input columns when the model was trained with them.
+    """
+
+    def __init__(self, layers: List[Tuple[np.ndarray, np.ndarray, str]],
+                 scaler: NumpyScaler, accuracy: float = 0.0, symbols: Sequence[str] = ()):
+        for _, _, activation in layers:
+            if activation not in ACTIVATIONS:
+                raise ValueError(f"Unsupported activation: {activation}")
+        self.layers = layers
+        self.scaler = scaler
+        self.accuracy = accuracy
+        self.symbols = list(symbols)
+
+    @classmethod
+    def load(cls, path: str) -> 'NumpyPredictor':
+        """Load weights, biases and scaler parameters written by save_npz"""
+        with np.load(path) as data:
+            activations = [str(a) for a in data['activations']]
+            layers = [(data[f'W{i}'], data[f'b{i}'], activation)
+                      for i, activation in enumerate(activations)]
+            scaler = NumpyScaler(data['scaler_mean'], data['scaler_scale'])
+            accuracy = float(data['accuracy'])
+            symbols = [str(s) for s in data['symbols']] if 'symbols' in data.files else []
+        return cls(layers, scaler, accuracy, symbols)
+
+    def save_npz(self, path: str):
+        """Write the network and scaler to a compact .npz"""
+        arrays = {}
+        for i, (W, b, _) in enumerate(self.layers):
+            arrays[f'W{i}'] = W
+            arrays[f'b{i}'] = b
+        np.savez_compressed(
+            path,
+            activations=np.array([activation for _, _, activation in self.layers]),
+            scaler_mean=self.scaler.mean_,
+            scaler_scale=self.scaler.scale_,
+            accuracy=np.float64(self.accuracy),
+            symbols=np.array(self.symbols, dtype=str),
+            **arrays
+        )
+
+    def predict_on_batch(self, X_scaled: np.ndarray) -> np.ndarray:
+        """Class probabilities for already-scaled rows"""
+        out = np.asarray(X_scaled, dtype=np.float64)
+        for W, b, activation in self.layers:
+            out = ACTIVATIONS[activation](out @ W + b)
+        return out
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """Class probabilities (BUY, SELL, NEUTRAL) for raw feature rows"""
+        X = np.atleast_2d(X)
+        return self.predict_on_batch(self.scaler.transform(X))
@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+"""
+Ultra Trading Bot - Walk-Forward Parameter Optimizer
+Copyright 2025 - Smart Stock Trader
+Grid or random search over BotConfig fields, scored with the vectorized
+backtester on rolling train/test windows across a process pool. Price history
+and indicators are prepared once and shared with workers as read-only
+memory-mapped files, so a task is only a small dict of parameters.
+
+    python ultrabot_optimize.py AAPL MSFT --bars 20000 --workers 8 --output results.csv
+    python ultrabot_optimize.py AAPL --search random --samples 2000 \\
+        --param atr_sl_multiplier=0.5:3.0 --param atr_tp_multiplier=2:10
+"""
+
+import argparse
+import csv
+import itertools
+import logging
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, fields, replace
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from ultrabot_backtest import MarketData, SymbolSpec, backtest, prepare_market_data
+from ultrabot_python import BotConfig
+
+# ═══════════════════════════════════════════════════════════════════════════
+# SEARCH SPACE
+# ═══════════════════════════════════════════════════════════════════════════
+
+
+@dataclass(frozen=True)
+class Uniform:
+    """Continuous range sampled by random search"""
+    low: float
+    high: float
+
+
+ParamSpace = Dict[str, Union[Tuple, Uniform]]
+
+# 900 grid points around the shipped defaults
+DEFAULT_SPACE: ParamSpace = {
+    'atr_sl_multiplier': (0.75, 1.0, 1.5, 2.0, 2.5),
+    'atr_tp_multiplier': (2.0, 3.0, 4.5, 6.0, 8.0),
+    'ml_confidence_threshold': (0.55, 0.6, 0.65, 0.7),
+    'ml_high_conf_threshold': (0.7, 0.75, 0.8),
+    'ml_low_conf_sl_mult': (0.6, 0.8, 1.0),
+}
+
+OBJECTIVES = ('calmar', 'return', 'profit_factor', 'win_rate')
+MIN_DRAWDOWN = 0.01       # Floor for the calmar denominator
+MAX_PROFIT_FACTOR = 100.0  # Cap so loss-free runs do not dominate averages
+
+
+def parse_param(spec: str) -> Tuple[str, Union[Tuple, Uniform]]:
+    """'name=1,2,3' (values) or 'name=low:high' (range, random search only)"""
+    name, _, values = spec.partition('=')
+    name = name.strip()
+    if name not in {f.name for f in fields(BotConfig)}:
+        raise ValueError(f"Unknown BotConfig field: {name}")
+
+    if ':' in values:
+        low, high = (float(v) for v in values.split(':'))
+        return name, Uniform(low, high)
+
+    kind = type(getattr(BotConfig(), name))
+    cast = (lambda v: v.lower() in ('1', 'true', 'yes')) if kind is bool else kind
+    return name, tuple(cast(v) for v in values.split(','))
+
+
+def grid_configs(space: ParamSpace) -> List[Dict]:
+    """Every combination of the discrete values"""
+    for name, values in space.items():
+        if isinstance(values, Uniform):
+            raise ValueError(f"Grid search needs discrete values for {name}")
+    names = list(space)
+    return [dict(zip(names, combo)) for combo in itertools.product(*space.values())]
+
+
+def random_configs(space: ParamSpace, samples: int, seed: int = 0) -> List[Dict]:
+    """`samples` independent draws (uniform over ranges, choice over values)"""
+    rng = random.Random(seed)
+    draw = {
+        name: (lambda v=values: round(rng.uniform(v.low, v.high), 4)) if isinstance(values, Uniform)
+        else (lambda v=values: rng.choice(v))
+        for name, values in space.items()
+    }
+    return [{name: sample() for name, sample in draw.items()} for _ in range(samples)]
+
+
+def walk_forward_splits(n_bars: int, train_bars: int, test_bars: int) -> List[Tuple[int, int, int]]:
+    """Rolling (train_start, test_start, test_end) windows; each test window follows its train window"""
+    splits = []
+    start = 0
+    while start + train_bars + test_bars <= n_bars:
+        splits.append((start, start + train_bars, start + train_bars + test_bars))
+        start += test_bars
+    return splits
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# SHARED HISTORY
+# ═══════════════════════════════════════════════════════════════════════════
+
+def share_market_data(data: Dict[str, MarketData], directory: str) -> Dict[str, List[str]]:
+    """Write every array to `directory` as .npy; returns the layout workers need to map it"""
+    layout = {}
+    for symbol, market in data.items():
+        layout[symbol] = []
+        for name, values in vars(market).items():
+            np.save(os.path.join(directory, f"{symbol}.{name}.npy"), np.ascontiguousarray(values))
+            layout[symbol].append(name)
+    return layout
+
+
+def map_market_data(directory: str, layout: Dict[str, List[str]]) -> Dict[str, MarketData]:
+    """Read-only memory maps of the arrays written by share_market_data (no copies)"""
+    return {
+        symbol: MarketData(**{
+            name: np.load(os.path.join(directory, f"{symbol}.{name}.npy"), mmap_mode='r')
+            for name in names
+        })
+        for symbol, names in layout.items()
+    }
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# EVALUATION
+# ═══════════════════════════════════════════════════════════════════════════
+
+def score(stats: Dict[str, float], objective: str, min_trades: int) -> float:
+    """Objective value of one backtest (0 when it traded too little to judge)"""
+    if stats['trades'] < min_trades:
+        return 0.0
+    if objective == 'calmar':
+        return stats['return'] / max(stats['max_drawdown'], MIN_DRAWDOWN)
+    if objective == 'profit_factor':
+        return min(stats['profit_factor'], MAX_PROFIT_FACTOR)
+    return stats[objective]
+
+
+@dataclass
+class OptimizerJob:
+    """Everything a worker needs besides the shared arrays (pickled once per worker)"""
+    directory: str
+    layout: Dict[str, List[str]]
+    splits: Dict[str, List[Tuple[int, int, int]]]
+    specs: Dict[str, SymbolSpec]
+    base_config: Dict
+    objective: str
+    min_trades: int
+    initial_equity: float
+
+
+_job: Optional[OptimizerJob] = None
+_data: Dict[str, MarketData] = {}
+
+
+def _init_worker(job: OptimizerJob):
+    """Map the shared history once per worker process"""
+    global _job, _data
+    _job = job
+    _data = map_market_data(job.directory, job.layout)
+
+
+def evaluate(params: Dict) -> Dict:
+    """In-sample and out-of-sample scores of one configuration over every symbol and fold"""
+    config = replace(BotConfig(**_job.base_config), **params)
+    n_folds = max(len(s) for s in _job.splits.values())
+    fold_is = [[] for _ in range(n_folds)]
+    fold_oos = [[] for _ in range(n_folds)]
+    oos = []
+
+    for symbol, market in _data.items():
+        spec = _job.specs[symbol]
+        for fold, (start, middle, end) in enumerate(_job.splits[symbol]):
+            train = backtest(market.slice(start, middle), config, spec, _job.initial_equity).stats()
+            test = backtest(market.slice(middle, end), config, spec, _job.initial_equity).stats()
+            fold_is[fold].append(score(train, _job.objective, _job.min_trades))
+            fold_oos[fold].append(score(test, _job.objective, _job.min_trades))
+            oos.append(test)
+
+    def mean(values):
+        return float(np.mean(values)) if values else float('-inf')
+
+    return {
+        'params': params,
+        'is_score': mean([s for scores in fold_is for s in scores]),
+        'oos_score': mean([s for scores in fold_oos for s in scores]),
+        'oos_return': mean([s['return'] for s in oos]),
+        'oos_max_drawdown': max((s['max_drawdown'] for s in oos), default=0.0),
+        'oos_trades': int(sum(s['trades'] for s in oos)),
+        'oos_win_rate': mean([s['win_rate'] for s in oos]),
+        'oos_profit_factor': mean([min(s['profit_factor'], MAX_PROFIT_FACTOR) for s in oos]),
+        'fold_is': [mean(scores) for scores in fold_is],
+        'fold_oos': [mean(scores) for scores in fold_oos],
+    }
+
+
+def optimize(data: Dict[str, MarketData], configs: Sequence[Dict], base_config: BotConfig,
+             train_bars: int, test_bars: int, specs: Dict[str, SymbolSpec] = None,
+             workers: int = 0, objective: str = 'calmar', min_trades: int = 5,
+             initial_equity: float = 10_000.0) -> List[Dict]:
+    """
+    Score every configuration with walk-forward splits, best out-of-sample first.
+    workers=0 uses one process per CPU.
+    """
+    splits = {symbol: walk_forward_splits(len(market), train_bars, test_bars)
+              for symbol, market in data.items()}
+    splits = {symbol: s for symbol, s in splits.items() if s}
+    if not splits:
+        raise ValueError(f"No symbol has {train_bars + test_bars} bars for one train/test window")
+
+    directory = tempfile.mkdtemp(prefix='ultrabot-optimize-')
+    try:
+        job = OptimizerJob(
+            directory=directory,
+            layout=share_market_data({symbol: data[symbol] for symbol in splits}, directory),
+            splits=splits,
+            specs={symbol: (specs or {}).get(symbol) or SymbolSpec() for symbol in splits},
+            base_config=asdict(base_config),
+            objective=objective,
+            min_trades=min_trades,
+            initial_equity=initial_equity,
+        )
+        workers = workers or os.cpu_count() or 1
+        chunksize = max(1, len(configs) // (workers * 16))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(job,)) as pool:
+            results = list(pool.map(evaluate, configs, chunksize=chunksize))
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    results.sort(key=lambda r: r['oos_score'], reverse=True)
+    for rank, result in enumerate(results, 1):
+        result['rank'] = rank
+    return results
+
+
+def walk_forward_selection(results: List[Dict]) -> List[Dict]:
+    """Per fold, the configuration with the best in-sample score and how it did out of sample"""
+    if not results:
+        return []
+    selection = []
+    for fold in range(len(results[0]['fold_is'])):
+        best = max(results, key=lambda r: r['fold_is'][fold])
+        selection.append({'fold': fold, 'params': best['params'],
+                          'is_score': best['fold_is'][fold], 'oos_score': best['fold_oos'][fold]})
+    return selection
+
+
+def write_table(results: List[Dict], path: str):
+    """Ranked results as CSV: rank, parameters, then scores"""
+    if not results:
+        return
+    names = list(results[0]['params'])
+    columns = ['is_score', 'oos_score', 'oos_return', 'oos_max_drawdown', 'oos_trades',
+               'oos_win_rate', 'oos_profit_factor']
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['rank'] + names + columns)
+        for result in results:
+            writer.writerow([result['rank']] + [result['params'][name] for name in names] +
+                            [result[column] for column in columns])
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# HISTORY SOURCES
+# ═══════════════════════════════════════════════════════════════════════════
+
+def load_from_terminal(symbols: List[str], timeframe: int, bars: int,
+                       predictor=None) -> Tuple[Dict[str, MarketData], Dict[str, SymbolSpec]]:
+    """Closed bars (plus H4/D1 context) for each symbol from the MT5 terminal"""
+    import MetaTrader5 as mt5
+    from ultrabot_features import D1_TREND_PERIOD, H4_TREND_PERIOD
+
+    if not mt5.initialize():
+        raise RuntimeError(f"MT5 initialization failed: {mt5.last_error()}")
+
+    data, specs = {}, {}
+    for symbol in symbols:
+        rates = mt5.copy_rates_from_pos(symbol, timeframe, 1, bars)
+        if rates is None or len(rates) == 0:
+            logging.warning(f"No history for {symbol}; skipped")
+            continue
+
+        span = int(rates['time'][-1] - rates['time'][0])
+        h4 = None
+        if timeframe == mt5.TIMEFRAME_H1:
+            h4 = mt5.copy_rates_from_pos(symbol, mt5.TIMEFRAME_H4, 1, H4_TREND_PERIOD + 1 + span // (4 * 3600))
+        d1 = mt5.copy_rates_from_pos(symbol, mt5.TIMEFRAME_D1, 1, D1_TREND_PERIOD + 1 + span // 86400)
+
+        data[symbol] = prepare_market_data(rates, h4, d1, predictor, symbol)
+        info = mt5.symbol_info(symbol)
+        specs[symbol] = SymbolSpec.from_symbol_info(info) if info else SymbolSpec()
+    return data, specs
+
+
+def load_from_store(root: str, symbols: List[str], timeframe: int, bars: int,
+                    predictor=None) -> Tuple[Dict[str, MarketData], Dict[str, SymbolSpec]]:
+    """The same inputs as load_from_terminal, memory-mapped from an ultrabot_history store"""
+    from ultrabot_history import HistoryStore
+
+    store = HistoryStore(root)
+    data, specs = {}, {}
+    for symbol in symbols:
+        rates = store.load(symbol, timeframe, bars)
+        if rates is None:
+            logging.warning(f"No stored history for {symbol} in {root}; skipped")
+            continue
+
+        h4, d1 = store.higher_timeframes(symbol, timeframe, rates)
+        data[symbol] = prepare_market_data(rates, h4, d1, predictor, symbol)
+        info = store.symbol_info(symbol)
+        specs[symbol] = SymbolSpec.from_symbol_info(info) if info else SymbolSpec()
+    return data, specs
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# MAIN EXECUTION
+# ═══════════════════════════════════════════════════════════════════════════
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Walk-forward BotConfig optimizer")
+    parser.add_argument('symbols', nargs='+')
+    parser.add_argument('--bars', type=int, default=20_000, help="History per symbol")
+    parser.add_argument('--source', choices=('terminal', 'store'), default='terminal',
+                        help="Read bars from the MT5 terminal or the ultrabot_history store")
+    parser.add_argument('--history', default='history', help="History store directory (--source store)")
+    parser.add_argument('--train-bars', type=int, default=4_000)
+    parser.add_argument('--test-bars', type=int, default=1_000)
+    parser.add_argument('--search', choices=('grid', 'random'), default='grid')
+    parser.add_argument('--samples', type=int, default=1_000, help="Random search draws")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--param', action='append', default=[],
+                        help="name=v1,v2,... or name=low:high (replaces the default search space)")
+    parser.add_argument('--objective', choices=OBJECTIVES, default='calmar')
+    parser.add_argument('--min-trades', type=int, default=5, help="Per window, below which a score is 0")
+    parser.add_argument('--model', help="NumPy model export (.npz) for ML signals")
+    parser.add_argument('--workers', type=int, default=0, help="Processes (0 = one per CPU)")
+    parser.add_argument('--output', default='optimize_results.csv')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(message)s')
+    logger = logging.getLogger(__name__)
+
+    space = dict(parse_param(spec) for spec in args.param) if args.param else DEFAULT_SPACE
+    configs = grid_configs(space) if args.search == 'grid' else random_configs(space, args.samples, args.seed)
+
+    predictor = None
+    if args.model:
+        from ultrabot_inference import NumpyPredictor
+        predictor = NumpyPredictor.load(args.model)
+
+    base_config = BotConfig(symbols=args.symbols, use_ml=predictor is not None, verbose=False)
+    if args.source == 'store':
+        data, specs = load_from_store(args.history, args.symbols, base_config.timeframe, args.bars, predictor)
+    else:
+        data, specs = load_from_terminal(args.symbols, base_config.timeframe, args.bars, predictor)
+
+    logger.info(f"Evaluating {len(configs)} configurations on {len(data)} symbol(s)")
+    started = time.perf_counter()
+    results = optimize(data, configs, base_config, args.train_bars, args.test_bars, specs,
+                       args.workers, args.objective, args.min_trades)
+    logger.info(f"Done in {time.perf_counter() - started:.1f}s")
+
+    write_table(results, args.output)
+    logger.info(f"Ranked results written to {args.output}")
+
+    for result in results[:10]:
+        logger.info(f"#{result['rank']:<4} OOS {result['oos_score']:9.3f}  IS {result['is_score']:9.3f}  "
+                    f"{result['params']}")
+    for fold in walk_forward_selection(results):
+        logger.info(f"Fold {fold['fold']}: best in-sample {fold['is_score']:.3f} -> "
+                    f"out-of-sample {fold['oos_score']:.3f} with {fold['params']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,22 +5,38 @@ Copyright 2025 - Smart Stock Trader
 ML-Powered Trading System with Advanced Risk Management
 """
 
-from datetime import datetime, timedelta
+import time
+_import_started = time.perf_counter()
+
 import MetaTrader5 as mt5
-import tensorflow as tf
 import numpy as np
-import pandas as pd
-import time
+import atexit
 import logging
-from dataclasses import dataclass
+import tempfile
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
+from dataclasses import dataclass, field
 from typing import List, Dict, Tuple, Optional
-from sklearn.preprocessing import StandardScaler
-import talib
+
+from ultrabot_startup import STARTUP, lazy_import
+from ultrabot_features import (
+    WARMUP_BARS, H4_TREND_PERIOD, D1_TREND_PERIOD,
+    bar_seconds, valid_rows, symbol_one_hot
+)
+from ultrabot_history import HistoryStore, timeframe_seconds
+from ultrabot_indicators import StreamingFeatures
+from ultrabot_inference import NumpyPredictor, NumpyScaler
+from ultrabot_registry import ModelRegistry
+from ultrabot_training import VALIDATION_BATCH, TrainingSet, count_rows
+
+# Heavy dependencies are only imported when training or loading a Keras model.
+# No terminal connection is made at import time; see UltraTradingBot.initialize.
+tf = lazy_import('tensorflow')
+preprocessing = lazy_import('sklearn.preprocessing')
 
 # ═══════════════════════════════════════════════════════════════════════════
 # CONFIGURATION
 # ═══════════════════════════════════════════════════════════════════════════
-mt5.initialize()
 
 
 @dataclass
@@ -38,7 +54,19 @@ class BotConfig:
     use_ml: bool = True
     ml_confidence_threshold: float = 0.65
     ml_model_path: str = "models/ultra_bot_model.h5"
-    training_bars: int = 1000
+    ml_export_path: str = "models/ultra_bot_model.npz"
+    use_numpy_inference: bool = True  # Serve predictions without TensorFlow
+    training_bars: int = 1000      # Per symbol; initialize() trains on every configured symbol
+    validation_fraction: float = 0.2  # Newest share of bars (across all symbols) held out
+    symbol_features: bool = False  # Append one-hot symbol-id columns to the model inputs
+    history_path: str = ""  # ultrabot_history store to train from ("" = fetch from the terminal)
+    batch_inference: bool = True  # Score all symbols in one forward pass per cycle
+
+    # Model Registry (per-symbol / per-group models; symbols without one use the model above)
+    model_registry_path: str = ""      # ultrabot_registry root ("" = one model for every symbol)
+    model_groups: Dict[str, List[str]] = None  # Group name -> symbols sharing a registry model
+    model_cache_mb: float = 256.0      # Memory budget of loaded registry models (LRU)
+    model_refresh_interval: float = 30.0  # Seconds between checks for newly activated versions
 
     # Trading Parameters
     atr_sl_multiplier: float = 1.5
@@ -62,6 +90,20 @@ class BotConfig:
     # Timeframe
     timeframe: int = mt5.TIMEFRAME_H1
 
+    # Symbol Scan
+    scan_workers: int = 0              # 0 = evaluate symbols one after another
+    scan_executor: str = "thread"      # "thread" (overlaps terminal I/O) or "process" (uses all cores)
+
+    # Scheduling
+    bar_close_delay: float = 0.5      # Seconds after a bar boundary before the first probe
+    bar_probe_interval: float = 1.0   # Tick-probe cadence while waiting for bars to close
+    bar_probe_timeout: float = 30.0   # Stop probing after this (symbols with no ticks)
+    manage_interval: float = 60.0     # Seconds between manage_positions passes
+
+    # Bar Cache
+    bar_cache_size: int = 500        # Bars kept per (symbol, timeframe)
+    bar_cache_max_age: float = 1.0   # Seconds before a read re-syncs with the terminal
+
     # Logging
     verbose: bool = True
     log_file: str = "ultrabot.log"
@@ -88,6 +130,287 @@ def setup_logging(config: BotConfig):
     return logging.getLogger(__name__)
 
 
+# ═══════════════════════════════════════════════════════════════════════════
+# BAR CACHE
+# ═══════════════════════════════════════════════════════════════════════════
+
+class KeyedLocks:
+    """One lock per key, so workers only contend on the same (symbol, timeframe)"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.locks: Dict[Tuple[str, int], threading.Lock] = {}
+
+    def get(self, key: Tuple[str, int]) -> threading.Lock:
+        with self.lock:
+            return self.locks.setdefault(key, threading.Lock())
+
+
+class BarRing:
+    """
+    Preallocated ring buffer of MT5 rates.
+    Every bar is written twice (at i and i + capacity) so the latest N bars
+    are always one contiguous slice and can be handed out without copying.
+    """
+
+    def __init__(self, dtype: np.dtype, capacity: int):
+        self.capacity = capacity
+        self.data = np.zeros(2 * capacity, dtype=dtype)
+        self.count = 0      # Bars written so far
+        self.synced_at = 0.0
+
+    def __len__(self) -> int:
+        return min(self.count, self.capacity)
+
+    @property
+    def last_time(self) -> int:
+        return int(self.data[(self.count - 1) % self.capacity]['time'])
+
+    def append(self, rates: np.ndarray):
+        """Append bars, keeping only the newest `capacity`"""
+        rates = rates[-self.capacity:]
+        pos = self.count % self.capacity
+        first = min(len(rates), self.capacity - pos)
+        self.data[pos:pos + first] = rates[:first]
+        self.data[pos + self.capacity:pos + self.capacity + first] = rates[:first]
+        if first < len(rates):
+            # Wrap around to the start of both halves
+            rest = len(rates) - first
+            self.data[:rest] = rates[first:]
+            self.data[self.capacity:self.capacity + rest] = rates[first:]
+        self.count += len(rates)
+
+    def replace_last(self, bar: np.ndarray):
+        """Overwrite the newest bar (the one still forming)"""
+        pos = (self.count - 1) % self.capacity
+        self.data[pos] = bar
+        self.data[pos + self.capacity] = bar
+
+    def view(self, count: int) -> np.ndarray:
+        """Read-only view of the newest `count` bars, oldest first"""
+        count = min(count, len(self))
+        end = self.count % self.capacity + self.capacity
+        view = self.data[end - count:end]
+        view.flags.writeable = False
+        return view
+
+
+class BarCache:
+    """
+    Incremental OHLCV cache keyed by (symbol, timeframe) shared by every MT5 rates read.
+    The full window is fetched once; later syncs only pull bars from the last cached
+    bar onwards. Views stay valid until the next sync of the same key.
+    """
+
+    def __init__(self, config: BotConfig):
+        self.config = config
+        self.rings: Dict[Tuple[str, int], BarRing] = {}
+        self.locks = KeyedLocks()
+        self.logger = logging.getLogger(__name__)
+
+    def get(self, symbol: str, timeframe: int, count: int) -> Optional[np.ndarray]:
+        """Newest `count` bars (zero-copy view), syncing with the terminal if stale"""
+        key = (symbol, timeframe)
+        with self.locks.get(key):
+            ring = self.rings.get(key)
+
+            if ring is None or ring.capacity < count:
+                ring = self._load(symbol, timeframe, max(count, self.config.bar_cache_size))
+                if ring is None:
+                    return None
+            elif time.monotonic() - ring.synced_at >= self.config.bar_cache_max_age:
+                ring = self._sync(symbol, timeframe, ring)
+
+            return ring.view(count)
+
+    def invalidate(self, symbol: str = None, timeframe: int = None):
+        """Drop cached bars so the next read refetches the full window"""
+        for key in list(self.rings):
+            if (symbol is None or key[0] == symbol) and (timeframe is None or key[1] == timeframe):
+                with self.locks.get(key):
+                    self.rings.pop(key, None)
+
+    def _load(self, symbol: str, timeframe: int, capacity: int) -> Optional[BarRing]:
+        """Fetch the full window for a new (or grown) key"""
+        rates = mt5.copy_rates_from_pos(symbol, timeframe, 0, capacity)
+        if rates is None or len(rates) == 0:
+            return None
+
+        ring = BarRing(rates.dtype, capacity)
+        ring.append(rates)
+        ring.synced_at = time.monotonic()
+        self.rings[(symbol, timeframe)] = ring
+        return ring
+
+    def _sync(self, symbol: str, timeframe: int, ring: BarRing) -> BarRing:
+        """Pull only the bars from the last cached timestamp onwards; returns the ring to read"""
+        # Bar times are broker server time; a far bound covers any server offset
+        date_to = int(time.time()) + 2 * 86400
+        rates = mt5.copy_rates_range(symbol, timeframe, ring.last_time, date_to)
+        ring.synced_at = time.monotonic()
+        if rates is None or len(rates) == 0:
+            return ring
+
+        if rates[0]['time'] == ring.last_time:
+            # The last cached bar may have been forming; refresh it
+            ring.replace_last(rates[0])
+            rates = rates[1:]
+        elif rates[0]['time'] < ring.last_time:
+            rates = rates[rates['time'] > ring.last_time]
+
+        if len(rates) >= ring.capacity:
+            # More new bars than the ring holds (e.g. after a weekend): refetch the window
+            return self._load(symbol, timeframe, ring.capacity) or ring
+        if len(rates):
+            ring.append(rates)
+        return ring
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# STREAMING FEATURES
+# ═══════════════════════════════════════════════════════════════════════════
+
+@dataclass
+class SymbolSnapshot:
+    """Features and indicator values of one symbol at its forming bar"""
+    features: Optional[np.ndarray] = None                   # None until all features are defined
+    current: Dict[str, float] = field(default_factory=dict)   # Forming bar
+    previous: Dict[str, float] = field(default_factory=dict)  # Last closed bar
+
+
+class FeatureStreams:
+    """
+    Streaming indicator state per (symbol, timeframe), fed from the bar cache.
+    Closed bars are committed once; the forming bar is re-evaluated on every read,
+    so the cost of a read does not depend on how much history is loaded.
+    """
+
+    def __init__(self, config: BotConfig, bar_cache: BarCache):
+        self.config = config
+        self.bars = bar_cache
+        self.streams: Dict[Tuple[str, int], StreamingFeatures] = {}
+        self.locks = KeyedLocks()
+
+    def update(self, symbol: str, timeframe: int) -> Optional[Tuple[StreamingFeatures, np.ndarray]]:
+        """Catch the stream up with the cache and return it with the forming bar's features"""
+        with self.locks.get((symbol, timeframe)):
+            return self._update(symbol, timeframe)
+
+    def snapshot(self, symbol: str, timeframe: int) -> Optional[SymbolSnapshot]:
+        """Picklable copy of the forming bar's features and indicator values"""
+        with self.locks.get((symbol, timeframe)):
+            state = self._update(symbol, timeframe)
+            if state is None:
+                return None
+
+            stream, features = state
+            if not valid_rows(features.reshape(1, -1))[0]:
+                features = None
+            return SymbolSnapshot(features, dict(stream.current), dict(stream.closed))
+
+    def _update(self, symbol: str, timeframe: int) -> Optional[Tuple[StreamingFeatures, np.ndarray]]:
+        rates = self.bars.get(symbol, timeframe, self.config.bar_cache_size)
+        if rates is None or len(rates) < 2:
+            return None
+
+        key = (symbol, timeframe)
+        times = rates['time']
+        stream = self.streams.get(key)
+
+        if stream is None or stream.last_time is None or not times[0] <= stream.last_time < times[-1]:
+            # First read, or more bars arrived than the cache holds: prime from scratch
+            stream = StreamingFeatures()
+            self.streams[key] = stream
+            start = 0
+        else:
+            start = int(np.searchsorted(times, stream.last_time, side='right'))
+
+        # Commit closed bars; the last bar is still forming
+        for bar in rates[start:-1]:
+            stream.update(bar)
+
+        forming = rates[-1]
+        close_time = int(forming['time']) + bar_seconds(times)
+        h4_trend = 0.0
+        if timeframe == mt5.TIMEFRAME_H1:
+            h4_trend = self.higher_tf_trend(symbol, mt5.TIMEFRAME_H4, H4_TREND_PERIOD, close_time)
+        d1_trend = self.higher_tf_trend(symbol, mt5.TIMEFRAME_D1, D1_TREND_PERIOD, close_time)
+
+        features = stream.update(forming, commit=False, h4_trend=h4_trend, d1_trend=d1_trend)
+        return stream, features
+
+    def higher_tf_trend(self, symbol: str, timeframe: int, period: int, close_time: int) -> float:
+        """Distance of the last closed higher-timeframe close from its SMA(period)"""
+        rates = self.bars.get(symbol, timeframe, period + 1)
+        if rates is None or len(rates) < period:
+            return 0.0
+
+        closed = rates[rates['time'] + bar_seconds(rates['time']) <= close_time][-period:]
+        if len(closed) < period:
+            return 0.0
+
+        ma = closed['close'].mean()
+        return (closed['close'][-1] - ma) / ma if ma > 0 else 0.0
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# BAR SCHEDULER
+# ═══════════════════════════════════════════════════════════════════════════
+
+class BarScheduler:
+    """
+    Decides when the signal pipeline runs: once per closed bar per symbol.
+    Sleeps until the next bar boundary, then tick-probes symbols until each one
+    shows a tick in the new bar (or the probe window times out).
+    """
+
+    def __init__(self, config: BotConfig):
+        self.config = config
+        self.period = timeframe_seconds(config.timeframe)
+        self.last_bar: Dict[str, int] = {}   # Open time of the newest bar seen per symbol
+        self.server_offset = 0               # Broker server time minus local UTC
+        self.logger = logging.getLogger(__name__)
+
+    def closed_bars(self, symbols: List[str]) -> List[str]:
+        """Symbols whose bar has closed since the last call (all of them on the first call)"""
+        closed = []
+        latest_tick = 0
+        for symbol in symbols:
+            tick = mt5.symbol_info_tick(symbol)
+            if tick is None:
+                continue
+
+            latest_tick = max(latest_tick, tick.time)
+            bar = tick.time - tick.time % self.period
+            if bar > self.last_bar.get(symbol, -1):
+                self.last_bar[symbol] = bar
+                closed.append(symbol)
+
+        if latest_tick:
+            # Bar times are server time; offsets are whole quarter-hours, which absorbs latency
+            self.server_offset = round((latest_tick - time.time()) / 900) * 900
+
+        if closed:
+            self.logger.debug(f"Bar closed for {len(closed)} symbol(s)")
+        return closed
+
+    def server_time(self) -> float:
+        return time.time() + self.server_offset
+
+    def sleep_time(self, symbols: List[str]) -> float:
+        """Seconds to sleep before the next closed_bars() probe"""
+        now = self.server_time()
+        boundary = now - now % self.period
+        since_boundary = now - boundary
+
+        # Keep probing right after a boundary until every symbol has rolled over
+        waiting = any(self.last_bar.get(symbol, -1) < boundary for symbol in symbols)
+        if waiting and since_boundary < self.config.bar_probe_timeout:
+            return self.config.bar_probe_interval
+
+        return boundary + self.period - now + self.config.bar_close_delay
+
+
 # ═══════════════════════════════════════════════════════════════════════════
 # NEURAL NETWORK MODEL
 # ═══════════════════════════════════════════════════════════════════════════
@@ -95,10 +418,17 @@ def setup_logging(config: BotConfig):
 class MLModel:
     """Enhanced Neural Network for Trade Prediction"""
 
-    def __init__(self, config: BotConfig):
+    def __init__(self, config: BotConfig, bar_cache: BarCache = None,
+                 feature_streams: FeatureStreams = None):
         self.config = config
+        self.bars = bar_cache or BarCache(config)
+        self.streams = feature_streams or FeatureStreams(config, self.bars)
         self.model = None
-        self.scaler = StandardScaler()
+        self.scaler = None  # Fitted in train() or restored by load_model()
+        self.symbol_ids: List[str] = []  # Symbol-id input columns, when trained with symbol_features
+        self.registry = (ModelRegistry(config.model_registry_path, config.model_groups,
+                                       int(config.model_cache_mb * 2**20))
+                         if config.model_registry_path else None)
         self.accuracy = 0.0
         self.logger = logging.getLogger(__name__)
 
@@ -127,186 +457,116 @@ class MLModel:
         self.logger.info("✓ Neural network built: 30 → 20 → 3")
         return self.model
 
-    def extract_features(self, symbol: str, timeframe: int, count: int = 100) -> np.ndarray:
-        """Extract 30 technical features for ML"""
-        # Get price data
-        rates = mt5.copy_rates_from_pos(symbol, timeframe, 0, count)
-        if rates is None or len(rates) < 50:
+    def extract_features(self, symbol: str, timeframe: int) -> np.ndarray:
+        """Extract 30 technical features for ML (latest bar)"""
+        state = self.streams.update(symbol, timeframe)
+        if state is None:
             return None
 
-        df = pd.DataFrame(rates)
-        df['time'] = pd.to_datetime(df['time'], unit='s')
-
-        features = []
-
-        # Calculate indicators using TA-Lib
-        close = df['close'].values
-        high = df['high'].values
-        low = df['low'].values
-        volume = df['tick_volume'].values
-
-        # CATEGORY 1: TREND INDICATORS (10 features)
-        features.append(talib.RSI(close, timeperiod=14)[-1] / 100.0)  # 0
-        slowk, slowd = talib.STOCH(high, low, close, fastk_period=14, slowk_period=3, slowd_period=3)
-        features.append(slowk[-1] / 100.0)  # 1
-        features.append((talib.WILLR(high, low, close, timeperiod=14)[-1] + 100) / 100.0)  # 2
-        features.append(talib.ADX(high, low, close, timeperiod=14)[-1] / 100.0)  # 3
-        features.append(talib.PLUS_DI(high, low, close, timeperiod=14)[-1] / 100.0)  # 4
-        features.append(talib.MINUS_DI(high, low, close, timeperiod=14)[-1] / 100.0)  # 5
-        features.append((talib.CCI(high, low, close, timeperiod=14)[-1] + 200) / 400.0)  # 6
-
-        ma10 = talib.EMA(close, timeperiod=10)[-1]
-        features.append((close[-1] - ma10) / ma10 if ma10 > 0 else 0)  # 7
-
-        ma50 = talib.SMA(close, timeperiod=50)[-1]
-        features.append((close[-1] - ma50) / ma50 if ma50 > 0 else 0)  # 8
-
-        ma200 = talib.SMA(close, timeperiod=200)[-1] if len(close) >= 200 else close[-1]
-        features.append((close[-1] - ma200) / ma200 if ma200 > 0 else 0)  # 9
-
-        # CATEGORY 2: MOMENTUM INDICATORS (5 features)
-        macd, signal, hist = talib.MACD(close, fastperiod=12, slowperiod=26, signalperiod=9)
-        features.append(macd[-1] / close[-1] if close[-1] > 0 else 0)  # 10
-        features.append(signal[-1] / close[-1] if close[-1] > 0 else 0)  # 11
-        features.append((close[-1] - close[-10]) / close[-10] if close[-10] > 0 else 0)  # 12
-        features.append((close[-1] - close[-20]) / close[-20] if close[-20] > 0 else 0)  # 13
-        features.append(talib.MOM(close, timeperiod=10)[-1] / close[-1] if close[-1] > 0 else 0)  # 14
-
-        # CATEGORY 3: VOLATILITY INDICATORS (5 features)
-        atr = talib.ATR(high, low, close, timeperiod=14)[-1]
-        features.append(atr / close[-1] if close[-1] > 0 else 0)  # 15
-
-        upper, middle, lower = talib.BBANDS(close, timeperiod=20, nbdevup=2, nbdevdn=2)
-        features.append((upper[-1] - lower[-1]) / close[-1] if close[-1] > 0 else 0)  # 16
-        features.append((close[-1] - lower[-1]) / (upper[-1] - lower[-1]) if upper[-1] != lower[-1] else 0.5)  # 17
-        features.append(talib.STDDEV(close, timeperiod=20)[-1] / close[-1] if close[-1] > 0 else 0)  # 18
-        features.append(talib.NATR(high, low, close, timeperiod=14)[-1] / 100.0)  # 19
-
-        # CATEGORY 4: VOLUME INDICATORS (3 features)
-        avg_vol = np.mean(volume[-20:])
-        features.append(volume[-1] / avg_vol if avg_vol > 0 else 1.0)  # 20
-        features.append(talib.OBV(close, volume)[-1] / 1000000.0)  # 21 (normalized)
-        features.append(talib.AD(high, low, close, volume)[-1] / 1000000.0)  # 22
-
-        # CATEGORY 5: PRICE ACTION PATTERNS (5 features)
-        body = abs(df['close'].iloc[-1] - df['open'].iloc[-1])
-        range_val = df['high'].iloc[-1] - df['low'].iloc[-1]
-        features.append(body / range_val if range_val > 0 else 0.5)  # 23
-
-        upper_shadow = df['high'].iloc[-1] - max(df['open'].iloc[-1], df['close'].iloc[-1])
-        features.append(upper_shadow / range_val if range_val > 0 else 0)  # 24
-
-        lower_shadow = min(df['open'].iloc[-1], df['close'].iloc[-1]) - df['low'].iloc[-1]
-        features.append(lower_shadow / range_val if range_val > 0 else 0)  # 25
-
-        # Bullish score (last 5 candles)
-        bullish = sum([1 if df['close'].iloc[-i] > df['open'].iloc[-i] else -1 for i in range(1, 6)])
-        features.append((bullish + 5) / 10.0)  # 26
-
-        # Structure score (higher highs/lower lows)
-        structure = 0
-        for i in range(1, 5):
-            if df['high'].iloc[-i] > df['high'].iloc[-i-1] and df['low'].iloc[-i] > df['low'].iloc[-i-1]:
-                structure += 1
-            elif df['high'].iloc[-i] < df['high'].iloc[-i-1] and df['low'].iloc[-i] < df['low'].iloc[-i-1]:
-                structure -= 1
-        features.append((structure + 4) / 8.0)  # 27
-
-        # CATEGORY 6: MULTI-TIMEFRAME (2 features)
-        # H4 trend (if on H1)
-        if timeframe == mt5.TIMEFRAME_H1:
-            h4_rates = mt5.copy_rates_from_pos(symbol, mt5.TIMEFRAME_H4, 0, 50)
-            if h4_rates is not None and len(h4_rates) >= 50:
-                h4_close = h4_rates[-1]['close']
-                h4_ma50 = np.mean([r['close'] for r in h4_rates[-50:]])
-                features.append((h4_close - h4_ma50) / h4_ma50 if h4_ma50 > 0 else 0)  # 28
-            else:
-                features.append(0)
-        else:
-            features.append(0)
-
-        # D1 trend
-        d1_rates = mt5.copy_rates_from_pos(symbol, mt5.TIMEFRAME_D1, 0, 200)
-        if d1_rates is not None and len(d1_rates) >= 200:
-            d1_close = d1_rates[-1]['close']
-            d1_ma200 = np.mean([r['close'] for r in d1_rates[-200:]])
-            features.append((d1_close - d1_ma200) / d1_ma200 if d1_ma200 > 0 else 0)  # 29
-        else:
-            features.append(0)
-
-        return np.array(features)
-
-    def train(self, symbol: str, timeframe: int, bars: int = 1000):
-        """Train the neural network on historical data"""
-        self.logger.info(f"🧠 Training neural network on {bars} bars of {symbol}...")
-
-        # Get historical data
-        rates = mt5.copy_rates_from_pos(symbol, timeframe, 0, bars + 50)
-        if rates is None or len(rates) < bars:
-            self.logger.error(f"Not enough data for training (need {bars}, got {len(rates) if rates else 0})")
-            return False
+        _, features = state
+        if not valid_rows(features.reshape(1, -1))[0]:
+            return None
 
-        X = []
-        y = []
+        return features
 
-        # Extract features and labels
-        for i in range(50, len(rates) - 5):
-            # Get features at this point
-            features = self.extract_features(symbol, timeframe, i)
-            if features is None:
-                continue
+    def get_higher_tf_rates(self, symbol: str, timeframe: int,
+                            rates: np.ndarray) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+        """Fetch the H4/D1 history covering `rates` for the multi-timeframe features"""
+        span = int(rates['time'][-1] - rates['time'][0])
 
-            # Determine actual outcome (5 bars ahead)
-            current_price = rates[i]['close']
-            future_price = rates[i + 5]['close']
-            price_change = (future_price - current_price) / current_price * 100.0
-
-            # Create label (BUY, SELL, NEUTRAL)
-            if price_change > 0.5:
-                label = [1, 0, 0]  # BUY
-            elif price_change < -0.5:
-                label = [0, 1, 0]  # SELL
-            else:
-                label = [0, 0, 1]  # NEUTRAL
+        # H4 trend (if on H1); one extra bar so enough closed bars exist while the last forms
+        h4_rates = None
+        if timeframe == mt5.TIMEFRAME_H1:
+            h4_rates = self.bars.get(symbol, mt5.TIMEFRAME_H4,
+                                     H4_TREND_PERIOD + 1 + span // (4 * 3600))
 
-            X.append(features)
-            y.append(label)
+        # D1 trend
+        d1_rates = self.bars.get(symbol, mt5.TIMEFRAME_D1,
+                                 D1_TREND_PERIOD + 1 + span // 86400)
 
-        if len(X) < 100:
-            self.logger.error("Not enough valid training samples")
-            return False
+        return h4_rates, d1_rates
 
-        X = np.array(X)
-        y = np.array(y)
+    def training_rates(self, symbol: str, timeframe: int, count: int) -> tuple:
+        """Bars plus H4/D1 context for training: memory-mapped from the history store if configured"""
+        if self.config.history_path:
+            store = HistoryStore(self.config.history_path)
+            rates = store.load(symbol, timeframe, count)
+            if rates is not None:
+                return (rates,) + store.higher_timeframes(symbol, timeframe, rates)
+            self.logger.warning(f"{symbol} not in history store {self.config.history_path}; using the terminal")
 
-        # Normalize features
-        X = self.scaler.fit_transform(X)
+        rates = self.bars.get(symbol, timeframe, count)
+        if rates is None:
+            return None, None, None
+        return (rates,) + self.get_higher_tf_rates(symbol, timeframe, rates)
 
-        # Build model if not exists
-        if self.model is None:
-            self.build_model(input_shape=X.shape[1])
+    def train(self, symbol: str, timeframe: int, bars: int = 1000):
+        """Train the neural network on historical data of one symbol"""
+        return self.train_symbols([symbol], timeframe, bars)
 
-        # Train with early stopping
-        early_stop = tf.keras.callbacks.EarlyStopping(
-            monitor='val_loss',
-            patience=5,
-            restore_best_weights=True
-        )
+    def train_symbols(self, symbols: List[str], timeframe: int, bars: int = 1000):
+        """
+        Train the neural network on historical data of several symbols.
+        Rows are spilled to a scratch directory and streamed in batches, so memory
+        does not grow with the number of symbols or bars.
+        """
+        self.logger.info(f"🧠 Training neural network on {bars} bars of {', '.join(symbols)}...")
+
+        with tempfile.TemporaryDirectory(prefix='ultrabot_train_') as scratch:
+            dataset = TrainingSet(scratch, symbols, self.config.symbol_features)
+            for symbol in symbols:
+                # Get historical data (plus warm-up so every indicator is defined)
+                rates, h4_rates, d1_rates = self.training_rates(symbol, timeframe, bars + WARMUP_BARS)
+                if rates is None or len(rates) < bars:
+                    self.logger.error(f"Not enough data for training {symbol} (need {bars}, got {len(rates) if rates is not None else 0})")
+                    continue
 
-        # Train
-        history = self.model.fit(
-            X, y,
-            epochs=50,
-            batch_size=32,
-            validation_split=0.2,
-            callbacks=[early_stop],
-            verbose=1 if self.config.verbose else 0
-        )
+                # Extract features and labels for every bar, chunk by chunk
+                dataset.add_rates(symbol, rates, h4_rates, d1_rates)
+                if not self.config.history_path:
+                    # Drop the training-sized windows; the scan loop refetches its own
+                    self.bars.invalidate(symbol)
+            dataset.close()
+
+            train, validation = dataset.split(self.config.validation_fraction)
+            if count_rows(train) < 100 or not validation:
+                self.logger.error("Not enough valid training samples")
+                dataset.release()
+                return False
+
+            # Normalize features
+            self.scaler = dataset.fit_scaler(train)
+            self.symbol_ids = list(symbols) if self.config.symbol_features else []
+
+            # Build model if not exists
+            if (self.model is None or isinstance(self.model, NumpyPredictor) or
+                    self.model.input_shape[-1] != dataset.width):
+                self.build_model(input_shape=dataset.width)
+
+            # Train with early stopping
+            early_stop = tf.keras.callbacks.EarlyStopping(
+                monitor='val_loss',
+                patience=5,
+                restore_best_weights=True
+            )
+
+            # Train on shuffled batches, validate on the newest bars
+            history = self.model.fit(
+                dataset.dataset(train, 32, self.scaler, seed=0),
+                epochs=50,
+                shuffle=False,  # The dataset shuffles within a bounded window
+                validation_data=dataset.dataset(validation, VALIDATION_BATCH, self.scaler),
+                callbacks=[early_stop],
+                verbose=1 if self.config.verbose else 0
+            )
+            dataset.release()
 
         # Get final accuracy
         self.accuracy = history.history['val_accuracy'][-1]
+        self.logger.debug(f"Trained {len(history.history['val_accuracy'])} epochs")
 
-        self.logger.info(f"✓ Training complete - Validation Accuracy: {self.accuracy*100:.1f}%")
+        self.logger.info(f"✓ Training complete on {count_rows(train)} samples - "
+                         f"Validation Accuracy: {self.accuracy*100:.1f}%")
         return True
 
     def predict(self, symbol: str, timeframe: int) -> Tuple[int, float]:
@@ -316,44 +576,118 @@ class MLModel:
         direction: 0=BUY, 1=SELL, 2=NEUTRAL
         confidence: 0.0-1.0
         """
-        if self.model is None:
-            return 2, 0.0  # NEUTRAL with no confidence
+        return self.predict_batch([symbol], timeframe)[symbol]
+
+    def predict_batch(self, symbols: List[str], timeframe: int) -> Dict[str, Tuple[int, float]]:
+        """
+        Predict trade direction for several symbols in one forward pass
+        Returns: {symbol: (direction, confidence)} as in predict()
+        """
+        if self.model is None and self.registry is None:
+            return {symbol: (2, 0.0) for symbol in symbols}  # NEUTRAL with no confidence
 
         # Extract features
-        features = self.extract_features(symbol, timeframe)
-        if features is None:
-            return 2, 0.0
+        return self.predict_features({
+            symbol: self.extract_features(symbol, timeframe) for symbol in symbols
+        }, timeframe)
 
-        # Normalize
-        features_scaled = self.scaler.transform(features.reshape(1, -1))
+    def predict_features(self, features: Dict[str, Optional[np.ndarray]],
+                         timeframe: int = None) -> Dict[str, Tuple[int, float]]:
+        """
+        Score precomputed feature rows (None rows stay NEUTRAL).
+        One forward pass per model: each registry model scores its symbols and the
+        default model scores the rest.
+        """
+        results = {symbol: (2, 0.0) for symbol in features}  # NEUTRAL with no confidence
+        scored = [symbol for symbol, row in features.items() if row is not None]
+
+        # Route symbols to their registry model, falling back to the default model
+        routes: Dict[int, Tuple[object, List[str]]] = {}
+        for symbol in scored:
+            model = None
+            if self.registry is not None:
+                model = self.registry.get(symbol, timeframe or self.config.timeframe)
+            model = model or self.model
+            if model is not None:
+                routes.setdefault(id(model), (model, []))[1].append(symbol)
+
+        for model, symbols in routes.values():
+            if isinstance(model, NumpyPredictor) and model is not self.model:
+                scaler, accuracy, symbol_ids = model.scaler, model.accuracy, model.symbols
+            else:
+                scaler, accuracy, symbol_ids = self.scaler, self.accuracy, self.symbol_ids
+            results.update(self._score(model, scaler, accuracy, symbol_ids, features, symbols))
+
+        return results
+
+    @staticmethod
+    def _score(model, scaler, accuracy: float, symbol_ids: List[str],
+               features: Dict[str, np.ndarray], symbols: List[str]) -> Dict[str, Tuple[int, float]]:
+        """One forward pass of `model` over the rows of `symbols`"""
+        rows = np.vstack([features[symbol] for symbol in symbols])
+        if symbol_ids:
+            rows = np.hstack([rows, symbol_one_hot(symbol_ids, symbols)])
 
-        # Predict
-        prediction = self.model.predict(features_scaled, verbose=0)[0]
+        # Normalize and predict every row at once
+        features_scaled = scaler.transform(rows)
+        predictions = np.asarray(model.predict_on_batch(features_scaled))
 
         # Get direction and confidence
-        direction = np.argmax(prediction)
-        confidence = prediction[direction]
+        directions = np.argmax(predictions, axis=1)
+        confidences = predictions[np.arange(len(directions)), directions]
 
         # Calibrate confidence based on historical accuracy
-        if self.accuracy > 0.5:
-            confidence = confidence * self.accuracy
+        if accuracy > 0.5:
+            confidences = confidences * accuracy
 
-        return direction, confidence
+        return {symbol: (int(direction), float(confidence))
+                for symbol, direction, confidence in zip(symbols, directions, confidences)}
 
     def save_model(self, path: str = None):
         """Save trained model"""
-        if self.model is None:
+        if self.model is None or isinstance(self.model, NumpyPredictor):
             return
 
         path = path or self.config.ml_model_path
         self.model.save(path)
         self.logger.info(f"✓ Model saved to {path}")
 
+    def export_numpy(self, path: str = None) -> bool:
+        """Export weights, biases and scaler parameters for the NumPy-only predictor"""
+        if self.model is None or not hasattr(self.scaler, 'mean_'):
+            self.logger.warning("Nothing to export - model or scaler not trained")
+            return False
+
+        path = path or self.config.ml_export_path
+        if isinstance(self.model, NumpyPredictor):
+            self.model.save_npz(path)
+        else:
+            layers = []
+            for layer in self.model.layers:
+                weights = layer.get_weights()
+                if not weights:
+                    continue  # Dropout is a no-op at inference
+                kernel, bias = weights
+                layers.append((kernel, bias, layer.get_config().get('activation', 'linear')))
+
+            scaler = NumpyScaler(self.scaler.mean_, self.scaler.scale_)
+            NumpyPredictor(layers, scaler, self.accuracy, self.symbol_ids).save_npz(path)
+
+        self.logger.info(f"✓ NumPy model exported to {path}")
+        return True
+
     def load_model(self, path: str = None):
-        """Load trained model"""
+        """Load trained model (.npz exports load into the NumPy predictor)"""
         path = path or self.config.ml_model_path
         try:
-            self.model = tf.keras.models.load_model(path)
+            if path.endswith('.npz'):
+                predictor = NumpyPredictor.load(path)
+                self.model = predictor
+                self.scaler = predictor.scaler
+                self.accuracy = predictor.accuracy
+                self.symbol_ids = list(predictor.symbols)
+            else:
+                self.model = tf.keras.models.load_model(path)
             self.logger.info(f"✓ Model loaded from {path}")
             return True
         except:
@@ -455,8 +789,12 @@ class UltraTradingBot:
     def __init__(self, config: BotConfig):
         self.config = config
         self.logger = setup_logging(config)
-        self.ml_model = MLModel(config) if config.use_ml else None
+        self.bar_cache = BarCache(config)
+        self.feature_streams = FeatureStreams(config, self.bar_cache)
+        self.ml_model = MLModel(config, self.bar_cache, self.feature_streams) if config.use_ml else None
         self.risk_manager = RiskManager(config)
+        self.executor: Optional[Executor] = None
+        self.scheduler = BarScheduler(config)
         self.positions = {}
         self.running = False
 
@@ -466,33 +804,53 @@ class UltraTradingBot:
         self.logger.info("🚀 ULTRA TRADING BOT - Python Version")
         self.logger.info("=" * 60)
 
-        # Initialize MT5
-        if not mt5.initialize():
+        # Initialize MT5 (process scan workers attach separately, for reads only)
+        with STARTUP.phase("mt5.initialize"):
+            connected = mt5.initialize()
+        if not connected:
             self.logger.error("❌ MT5 initialization failed")
             return False
 
         self.logger.info("✓ MT5 connected")
 
         # Login info
-        account_info = mt5.account_info()
+        with STARTUP.phase("mt5.account_info"):
+            account_info = mt5.account_info()
         if account_info:
             self.logger.info(f"✓ Account: {account_info.login} | Balance: ${account_info.balance:.2f}")
 
         # Train or load ML model
         if self.config.use_ml and self.ml_model:
-            # Try to load existing model
-            if not self.ml_model.load_model():
-                # Train new model on first symbol
+            # Try to load existing model (NumPy export first if enabled)
+            with STARTUP.phase("load model"):
+                loaded = (self.config.use_numpy_inference and
+                          self.ml_model.load_model(self.config.ml_export_path))
+                loaded = loaded or self.ml_model.load_model()
+
+            if not loaded:
+                # Train new model on every configured symbol
                 self.logger.info("No existing model found, training new model...")
                 if self.config.symbols:
-                    self.ml_model.train(
-                        self.config.symbols[0],
-                        self.config.timeframe,
-                        self.config.training_bars
-                    )
-                    self.ml_model.save_model()
+                    with STARTUP.phase("train model"):
+                        self.ml_model.train_symbols(
+                            self.config.symbols,
+                            self.config.timeframe,
+                            self.config.training_bars
+                        )
+                        self.ml_model.save_model()
+
+                        # Serve the freshly trained model through the NumPy predictor
+                        if self.ml_model.export_numpy() and self.config.use_numpy_inference:
+                            self.ml_model.load_model(self.config.ml_export_path)
+
+        # Pick up newly activated registry versions in the background
+        if self.ml_model and self.ml_model.registry is not None:
+            self.ml_model.registry.start_watcher(self.config.model_refresh_interval)
+
+        self.start_executor()
 
         self.logger.info("✓ Ultra Bot initialized successfully")
+        self.logger.info("⏱ Startup time by phase:\n" + STARTUP.report())
         return True
 
     def check_filters(self, symbol: str) -> bool:
@@ -505,24 +863,31 @@ class UltraTradingBot:
         # etc.
         return True
 
-    def get_trading_signal(self, symbol: str) -> Tuple[Optional[str], float]:
+    def get_trading_signal(self, symbol: str,
+                           ml_prediction: Tuple[int, float] = None) -> Tuple[Optional[str], float]:
         """
         Get trading signal for symbol
         Returns: (signal, confidence)
         signal: 'BUY', 'SELL', or None
         confidence: 0.0-1.0
         """
-        # Get ML prediction
+        # Get ML prediction (unless already scored in a batch)
         ml_direction = 2  # NEUTRAL
         ml_confidence = 0.0
 
-        if self.config.use_ml and self.ml_model:
+        if ml_prediction is not None:
+            ml_direction, ml_confidence = ml_prediction
+        elif self.config.use_ml and self.ml_model:
             ml_direction, ml_confidence = self.ml_model.predict(symbol, self.config.timeframe)
 
         # Get traditional signals (simplified here)
         traditional_signal = self.get_traditional_signal(symbol)
 
-        # Combine signals
+        return self.combine_signals(ml_direction, ml_confidence, traditional_signal)
+
+    def combine_signals(self, ml_direction: int, ml_confidence: float,
+                        traditional_signal: Optional[str]) -> Tuple[Optional[str], float]:
+        """Combine the ML prediction with the traditional signal"""
         if ml_direction == 0 and ml_confidence >= self.config.ml_confidence_threshold:
             # ML says BUY with high confidence
             if traditional_signal == 'BUY':
@@ -543,31 +908,80 @@ class UltraTradingBot:
 
         return None, 0.0
 
-    def get_traditional_signal(self, symbol: str) -> Optional[str]:
+    def scan_signals(self, symbols: List[str]) -> Dict[str, Tuple[Optional[str], float]]:
+        """Score every symbol in one batched ML pass, then combine signals per symbol"""
+        snapshots = self.collect_snapshots(symbols)
+
+        predictions = {}
+        if self.config.use_ml and self.ml_model:
+            predictions = self.ml_model.predict_features({
+                symbol: snapshot.features if snapshot else None
+                for symbol, snapshot in snapshots.items()
+            })
+
+        return {
+            symbol: self.combine_signals(
+                *predictions.get(symbol, (2, 0.0)),
+                self.get_traditional_signal(symbol, snapshots[symbol])
+            )
+            for symbol in symbols
+        }
+
+    def collect_snapshots(self, symbols: List[str]) -> Dict[str, Optional[SymbolSnapshot]]:
+        """Fetch data and compute features for every symbol, on the worker pool if configured"""
+        timeframe = self.config.timeframe
+        if self.executor is None:
+            results = [self.feature_streams.snapshot(symbol, timeframe) for symbol in symbols]
+        elif isinstance(self.executor, ProcessPoolExecutor):
+            results = self.executor.map(_snapshot_in_worker, symbols, [timeframe] * len(symbols))
+        else:
+            results = self.executor.map(self.feature_streams.snapshot, symbols, [timeframe] * len(symbols))
+
+        # map() yields in submission order, so the merge is deterministic
+        return dict(zip(symbols, results))
+
+    def start_executor(self):
+        """Create the symbol evaluation pool from config (no-op for sequential scans)"""
+        if self.config.scan_workers <= 0 or self.executor is not None:
+            return
+
+        if self.config.scan_executor == "process":
+            # Each worker attaches to the terminal itself and keeps its own bar cache
+            self.executor = ProcessPoolExecutor(
+                max_workers=self.config.scan_workers,
+                initializer=_init_scan_worker,
+                initargs=(self.config,)
+            )
+        else:
+            self.executor = ThreadPoolExecutor(
+                max_workers=self.config.scan_workers,
+                thread_name_prefix="ultrabot-scan"
+            )
+        self.logger.info(f"✓ Scanning with {self.config.scan_workers} {self.config.scan_executor} workers")
+
+    def get_traditional_signal(self, symbol: str, snapshot: SymbolSnapshot = None) -> Optional[str]:
         """Get traditional technical signal"""
-        rates = mt5.copy_rates_from_pos(symbol, self.config.timeframe, 0, 100)
-        if rates is None or len(rates) < 50:
+        if snapshot is None:
+            snapshot = self.feature_streams.snapshot(symbol, self.config.timeframe)
+        if snapshot is None or not snapshot.previous:
             return None
 
-        close = np.array([r['close'] for r in rates])
-        high = np.array([r['high'] for r in rates])
-        low = np.array([r['low'] for r in rates])
-
-        # Simple MA crossover
-        ma_fast = talib.EMA(close, timeperiod=10)
-        ma_slow = talib.SMA(close, timeperiod=50)
+        # Indicator values on the forming bar and on the last closed bar
+        current, previous = snapshot.current, snapshot.previous
 
-        # RSI
-        rsi = talib.RSI(close, timeperiod=14)
+        # Simple MA crossover (EMA10 / SMA50) with RSI14 band
+        ma_fast, ma_slow = current['ema10'], current['sma50']
+        prev_fast, prev_slow = previous['ema10'], previous['sma50']
+        rsi = current['rsi']
 
         # Check for BUY signal
-        if (ma_fast[-1] > ma_slow[-1] and ma_fast[-2] <= ma_slow[-2] and
-            50 < rsi[-1] < 70):
+        if (ma_fast > ma_slow and prev_fast <= prev_slow and
+            50 < rsi < 70):
             return 'BUY'
 
         # Check for SELL signal
-        if (ma_fast[-1] < ma_slow[-1] and ma_fast[-2] >= ma_slow[-2] and
-            30 < rsi[-1] < 50):
+        if (ma_fast < ma_slow and prev_fast >= prev_slow and
+            30 < rsi < 50):
             return 'SELL'
 
         return None
@@ -575,15 +989,11 @@ class UltraTradingBot:
     def execute_trade(self, symbol: str, signal: str, confidence: float):
         """Execute trade with ML-driven risk management"""
         # Calculate ATR for SL/TP
-        rates = mt5.copy_rates_from_pos(symbol, self.config.timeframe, 0, 20)
-        if rates is None:
+        state = self.feature_streams.update(symbol, self.config.timeframe)
+        if state is None or np.isnan(state[0].current['atr']):
             return
 
-        high = np.array([r['high'] for r in rates])
-        low = np.array([r['low'] for r in rates])
-        close = np.array([r['close'] for r in rates])
-
-        atr = talib.ATR(high, low, close, timeperiod=14)[-1]
+        atr = state[0].current['atr']
         symbol_info = mt5.symbol_info(symbol)
         point = symbol_info.point
 
@@ -684,12 +1094,37 @@ class UltraTradingBot:
         # Implementation here
         pass
 
+    def process_signals(self, symbols: List[str]):
+        """Score symbols and open trades where the combined signal is strong enough"""
+        # Check which symbols we can trade
+        symbols = [symbol for symbol in symbols if self.check_filters(symbol)]
+
+        # Get signals
+        if self.config.batch_inference:
+            signals = self.scan_signals(symbols)
+        else:
+            signals = {symbol: self.get_trading_signal(symbol) for symbol in symbols}
+
+        # Check each symbol
+        for symbol in symbols:
+            signal, confidence = signals[symbol]
+
+            if signal and confidence >= self.config.ml_confidence_threshold:
+                # Check position limits
+                positions = mt5.positions_get(symbol=symbol)
+                if positions and len(positions) >= self.config.max_positions:
+                    continue
+
+                # Execute trade
+                self.execute_trade(symbol, signal, confidence)
+
     def run(self):
         """Main bot loop"""
         self.running = True
         self.logger.info("🤖 Ultra Bot started - Scanning for signals...")
 
         try:
+            next_manage = 0.0
             while self.running:
                 # Check daily loss limit
                 if not self.risk_manager.check_daily_loss_limit():
@@ -697,29 +1132,20 @@ class UltraTradingBot:
                     time.sleep(3600)  # Wait 1 hour
                     continue
 
-                # Check each symbol
-                for symbol in self.config.symbols:
-                    # Check if we can trade
-                    if not self.check_filters(symbol):
-                        continue
-
-                    # Get signal
-                    signal, confidence = self.get_trading_signal(symbol)
-
-                    if signal and confidence >= self.config.ml_confidence_threshold:
-                        # Check position limits
-                        positions = mt5.positions_get(symbol=symbol)
-                        if positions and len(positions) >= self.config.max_positions:
-                            continue
-
-                        # Execute trade
-                        self.execute_trade(symbol, signal, confidence)
+                # Run the signal pipeline only for symbols whose bar has just closed
+                closed = self.scheduler.closed_bars(self.config.symbols)
+                if closed:
+                    self.process_signals(closed)
 
-                # Manage existing positions
-                self.manage_positions()
+                # Manage existing positions on their own cadence
+                if time.monotonic() >= next_manage:
+                    self.manage_positions()
+                    next_manage = time.monotonic() + self.config.manage_interval
 
-                # Wait before next iteration
-                time.sleep(60)  # Check every minute
+                # Sleep until the next bar close (probing just after it) or position check
+                wait = min(self.scheduler.sleep_time(self.config.symbols),
+                           next_manage - time.monotonic())
+                time.sleep(max(wait, 0.0))
 
         except KeyboardInterrupt:
             self.logger.info("Bot stopped by user")
@@ -730,10 +1156,41 @@ class UltraTradingBot:
     def shutdown(self):
         """Shutdown bot gracefully"""
         self.logger.info("Shutting down Ultra Bot...")
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+        if self.ml_model and self.ml_model.registry is not None:
+            self.ml_model.registry.stop_watcher()
         mt5.shutdown()
         self.logger.info("✓ Ultra Bot stopped")
 
 
+# ═══════════════════════════════════════════════════════════════════════════
+# SCAN WORKERS (process pool)
+# ═══════════════════════════════════════════════════════════════════════════
+
+_worker_streams: Optional[FeatureStreams] = None
+
+
+def _init_scan_worker(config: BotConfig):
+    """
+    Attach a pool process to the terminal with its own bar cache and streams.
+    Workers only read bars and quotes; orders are still sent from the main process.
+    """
+    global _worker_streams
+    if not mt5.initialize():
+        error = mt5.last_error()
+        logging.getLogger(__name__).error(f"❌ Scan worker could not attach to MT5: {error}")
+        raise RuntimeError(f"MT5 initialization failed in scan worker: {error}")
+    atexit.register(mt5.shutdown)
+    _worker_streams = FeatureStreams(config, BarCache(config))
+
+
+def _snapshot_in_worker(symbol: str, timeframe: int) -> Optional[SymbolSnapshot]:
+    """Fetch and compute features for one symbol inside a pool process"""
+    return _worker_streams.snapshot(symbol, timeframe)
+
+
 # ═══════════════════════════════════════════════════════════════════════════
 # MAIN EXECUTION
 # ═══════════════════════════════════════════════════════════════════════════
@@ -757,7 +1214,9 @@ def main():
         bot.run()
 
 
-if __name__ == "__main__":
-    main()
+STARTUP.mark_start(_import_started)
+STARTUP.record("import ultrabot_python", time.perf_counter() - _import_started)
 
-mt5.shutdown()
\ No newline at end of file
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+Ultra Trading Bot - Model Registry
+Copyright 2025 - Smart Stock Trader
+Versioned NumPy model exports keyed by (symbol or group, timeframe, version).
+Models load on first use into a memory-bounded LRU; activating a new version
+loads it in the background and swaps it in without blocking predictions.
+
+    python ultrabot_registry.py publish XAUUSD H1 models/xauusd.npz
+    python ultrabot_registry.py publish fx_majors H1 models/fx.npz --no-activate
+    python ultrabot_registry.py activate fx_majors H1 3
+    python ultrabot_registry.py list
+
+Layout: <root>/<KEY>/<TIMEFRAME>/v<version>.npz plus a CURRENT file holding the
+live version. A symbol uses its own model if it has one, else its group's.
+"""
+
+import argparse
+import logging
+import os
+import re
+import shutil
+import sys
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from ultrabot_history import TIMEFRAME_NAMES, parse_timeframe
+from ultrabot_inference import NumpyPredictor
+
+# ═══════════════════════════════════════════════════════════════════════════
+# CONSTANTS
+# ═══════════════════════════════════════════════════════════════════════════
+
+DEFAULT_CACHE_BYTES = 256 * 2**20
+CURRENT_FILE = 'CURRENT'
+_VERSION_FILE = re.compile(r'^v(\d+)\.npz$')
+
+
+def predictor_nbytes(predictor: NumpyPredictor) -> int:
+    """Memory held by a predictor's weights and scaler"""
+    size = predictor.scaler.mean_.nbytes + predictor.scaler.scale_.nbytes
+    for W, b, _ in predictor.layers:
+        size += W.nbytes + b.nbytes
+    return size
+
+
+def _write_atomic(path: str, write):
+    """Write through a temporary file in the same directory, then rename over `path`"""
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp_')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            write(f)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# MODEL REGISTRY
+# ═══════════════════════════════════════════════════════════════════════════
+
+class ModelRegistry:
+    """
+    Per-symbol and per-group predictors served from `root`.
+    get() is safe to call from the scan loop while refresh() runs on the watcher
+    thread: a swap replaces one dict entry under a short lock, and a predictor
+    already handed out stays valid until its batch is done.
+    """
+
+    def __init__(self, root: str, groups: Dict[str, List[str]] = None,
+                 max_bytes: int = DEFAULT_CACHE_BYTES):
+        self.root = root
+        self.groups = {symbol: group for group, members in (groups or {}).items() for symbol in members}
+        self.max_bytes = max_bytes
+
+        self._lock = threading.Lock()
+        self._cache: 'OrderedDict[Tuple[str, int, int], NumpyPredictor]' = OrderedDict()
+        self._sizes: Dict[Tuple[str, int, int], int] = {}
+        self._live: Dict[Tuple[str, int], int] = {}                 # Version served per (key, timeframe)
+        self._routes: Dict[Tuple[str, int], Optional[str]] = {}     # Key serving each (symbol, timeframe)
+        self._bytes = 0
+        self.hits = self.misses = self.evictions = self.swaps = 0
+
+        self._watcher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.logger = logging.getLogger(__name__)
+
+    def path(self, key: str, timeframe: int) -> str:
+        return os.path.join(self.root, key, TIMEFRAME_NAMES.get(timeframe, str(timeframe)))
+
+    def versions(self, key: str, timeframe: int) -> List[int]:
+        """Published versions, oldest first"""
+        try:
+            names = os.listdir(self.path(key, timeframe))
+        except FileNotFoundError:
+            return []
+        return sorted(int(m.group(1)) for m in map(_VERSION_FILE.match, names) if m)
+
+    def current_version(self, key: str, timeframe: int) -> Optional[int]:
+        """The version CURRENT points at, None if the key has no active model"""
+        try:
+            with open(os.path.join(self.path(key, timeframe), CURRENT_FILE)) as f:
+                return int(f.read().strip())
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def resolve(self, symbol: str, timeframe: int) -> Optional[str]:
+        """Registry key serving `symbol`: its own model, else its group's, else None"""
+        routes = self._routes   # refresh() swaps in a new dict rather than mutating this one
+        route = (symbol, timeframe)
+        if route not in routes:
+            routes[route] = self._route(symbol, timeframe)
+        return routes[route]
+
+    def _route(self, symbol: str, timeframe: int) -> Optional[str]:
+        candidates = [symbol] + ([self.groups[symbol]] if symbol in self.groups else [])
+        return next((key for key in candidates if self.current_version(key, timeframe) is not None), None)
+
+    def get(self, symbol: str, timeframe: int, version: int = None) -> Optional[NumpyPredictor]:
+        """Predictor for `symbol` (live version unless pinned), loaded on first use"""
+        key = self.resolve(symbol, timeframe)
+        if key is None:
+            return None
+
+        pinned = version is not None
+        with self._lock:
+            if not pinned:
+                version = self._live.get((key, timeframe))
+            predictor = self._cache.get((key, timeframe, version))
+            if predictor is not None:
+                self._cache.move_to_end((key, timeframe, version))
+                self.hits += 1
+                return predictor
+            self.misses += 1
+
+        if version is None:
+            version = self.current_version(key, timeframe)
+            if version is None:
+                return None
+            with self._lock:
+                version = self._live.setdefault((key, timeframe), version)
+
+        predictor = self._load(key, timeframe, version)
+        if predictor is None:
+            return None
+        cached = self._insert((key, timeframe, version), predictor, pinned)
+        if cached is None:
+            return self.get(symbol, timeframe)      # Swapped out while loading; serve the new version
+        return cached
+
+    def _load(self, key: str, timeframe: int, version: int) -> Optional[NumpyPredictor]:
+        path = os.path.join(self.path(key, timeframe), f"v{version}.npz")
+        try:
+            predictor = NumpyPredictor.load(path)
+        except (OSError, KeyError, ValueError) as e:
+            self.logger.warning(f"Could not load registry model {path}: {e}")
+            return None
+        self.logger.info(f"✓ Registry model {key} {TIMEFRAME_NAMES.get(timeframe, timeframe)} v{version} loaded")
+        return predictor
+
+    def _insert(self, entry: Tuple[str, int, int], predictor: NumpyPredictor,
+                pinned: bool = False) -> Optional[NumpyPredictor]:
+        """
+        Cache a loaded predictor and return the cached one. Versions that stopped
+        being live while loading are refused (None) unless the caller pinned them.
+        """
+        key, timeframe, version = entry
+        with self._lock:
+            cached = self._cache.get(entry)
+            if cached is not None:
+                return cached   # Another thread loaded it first
+            if not pinned and self._live.get((key, timeframe)) != version:
+                return None
+            self._store(entry, predictor)
+            return predictor
+
+    def _store(self, entry: Tuple[str, int, int], predictor: NumpyPredictor):
+        """Add to the LRU, evicting least recently used entries over the memory budget (lock held)"""
+        self._cache[entry] = predictor
+        self._sizes[entry] = predictor_nbytes(predictor)
+        self._bytes += self._sizes[entry]
+        while self._bytes > self.max_bytes and len(self._cache) > 1:
+            evicted, _ = self._cache.popitem(last=False)
+            self._bytes -= self._sizes.pop(evicted)
+            self.evictions += 1
+
+    def refresh(self) -> int:
+        """
+        Pick up versions activated since the last check. New versions of models still
+        cached are loaded first and then swapped in; evicted ones load on next use.
+        Returns how many live versions changed.
+        """
+        swapped = 0
+        with self._lock:
+            live_versions = list(self._live.items())
+        for (key, timeframe), live in live_versions:
+            current = self.current_version(key, timeframe)
+            if current is None or current == live:
+                continue
+
+            with self._lock:
+                cached = (key, timeframe, live) in self._cache
+            predictor = self._load(key, timeframe, current) if cached else None
+            if cached and predictor is None:
+                continue        # Keep serving the previous version
+
+            with self._lock:
+                if self._live.get((key, timeframe)) != live:
+                    continue
+                if predictor is not None and (key, timeframe, current) not in self._cache:
+                    self._store((key, timeframe, current), predictor)
+                self._live[(key, timeframe)] = current
+                if self._cache.pop((key, timeframe, live), None) is not None:
+                    self._bytes -= self._sizes.pop((key, timeframe, live))
+                self.swaps += 1
+            swapped += 1
+            self.logger.info(f"🔄 {key} {TIMEFRAME_NAMES.get(timeframe, timeframe)}: v{live} → v{current}")
+
+        # Symbols may now have a model of their own (or a group model) to route to;
+        # routes are recomputed here so get() never finds the table empty
+        self._routes = {route: self._route(*route) for route in list(self._routes)}
+        return swapped
+
+    def start_watcher(self, interval: float):
+        """Call refresh() every `interval` seconds on a daemon thread"""
+        if self._watcher is not None or interval <= 0:
+            return
+        self._stop.clear()
+        self._watcher = threading.Thread(target=self._watch, args=(interval,),
+                                         name='model-registry', daemon=True)
+        self._watcher.start()
+
+    def stop_watcher(self):
+        if self._watcher is not None:
+            self._stop.set()
+            self._watcher.join()
+            self._watcher = None
+
+    def _watch(self, interval: float):
+        while not self._stop.wait(interval):
+            try:
+                self.refresh()
+            except Exception as e:
+                self.logger.error(f"Model registry refresh failed: {e}")
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'loaded': len(self._cache), 'bytes': self._bytes, 'hits': self.hits,
+                    'misses': self.misses, 'evictions': self.evictions, 'swaps': self.swaps}
+
+    def publish(self, key: str, timeframe: int, source: str, activate: bool = True) -> int:
+        """Copy a .npz export in as the next version (and make it live); returns the version"""
+        NumpyPredictor.load(source)      # Refuse files the scan loop could not load
+        directory = self.path(key, timeframe)
+        os.makedirs(directory, exist_ok=True)
+
+        version = (self.versions(key, timeframe) or [0])[-1] + 1
+        with open(source, 'rb') as src:
+            _write_atomic(os.path.join(directory, f"v{version}.npz"), lambda f: shutil.copyfileobj(src, f))
+        if activate:
+            self.activate(key, timeframe, version)
+        return version
+
+    def activate(self, key: str, timeframe: int, version: int):
+        """Point CURRENT at a published version (also used to roll back)"""
+        if version not in self.versions(key, timeframe):
+            raise ValueError(f"{key} {TIMEFRAME_NAMES.get(timeframe, timeframe)} has no version {version}")
+        _write_atomic(os.path.join(self.path(key, timeframe), CURRENT_FILE),
+                      lambda f: f.write(f"{version}\n".encode()))
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# MAIN EXECUTION
+# ═══════════════════════════════════════════════════════════════════════════
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Per-symbol / per-group model registry")
+    parser.add_argument('--root', default='models/registry', help="Registry directory")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    publish = commands.add_parser('publish', help="Add a .npz export as the next version")
+    publish.add_argument('key', help="Symbol or group name")
+    publish.add_argument('timeframe')
+    publish.add_argument('source')
+    publish.add_argument('--no-activate', action='store_true', help="Publish without making it live")
+
+    activate = commands.add_parser('activate', help="Make a published version live (or roll back)")
+    activate.add_argument('key')
+    activate.add_argument('timeframe')
+    activate.add_argument('version', type=int)
+
+    commands.add_parser('list', help="Show keys, versions and the live one")
+    args = parser.parse_args(argv)
+    registry = ModelRegistry(args.root)
+
+    if args.command == 'publish':
+        version = registry.publish(args.key, parse_timeframe(args.timeframe), args.source, not args.no_activate)
+        print(f"{args.key} {args.timeframe}: published v{version}" + ("" if args.no_activate else " (live)"))
+    elif args.command == 'activate':
+        registry.activate(args.key, parse_timeframe(args.timeframe), args.version)
+        print(f"{args.key} {args.timeframe}: v{args.version} live")
+    else:
+        for key in sorted(os.listdir(args.root)) if os.path.isdir(args.root) else []:
+            for name in sorted(os.listdir(os.path.join(args.root, key))):
+                timeframe = parse_timeframe(name)
+                print(f"{key:<16} {name:<4} versions {registry.versions(key, timeframe)}  "
+                      f"live v{registry.current_version(key, timeframe)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
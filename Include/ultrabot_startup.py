@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Ultra Trading Bot - Startup Profiling and Lazy Imports
+Copyright 2025 - Smart Stock Trader
+Defers heavy dependencies (TensorFlow, scikit-learn, TA-Lib) until first use
+and records how long each import and initialization phase took
+"""
+
+import importlib
+import time
+from contextlib import contextmanager
+from typing import List, Tuple
+
+
+class StartupProfiler:
+    """Collects (phase, seconds) timings for the startup report"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases: List[Tuple[str, float]] = []
+
+    def mark_start(self, started: float):
+        """Count the report total from an earlier perf_counter() reading"""
+        self.started = min(self.started, started)
+
+    def record(self, name: str, seconds: float):
+        self.phases.append((name, seconds))
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time the enclosed block as one phase"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def report(self) -> str:
+        """Human-readable breakdown of every recorded phase"""
+        lines = [f"  {name:<32} {seconds * 1000:9.1f} ms" for name, seconds in self.phases]
+        total = time.perf_counter() - self.started
+        lines.append(f"  {'total since start':<32} {total * 1000:9.1f} ms")
+        return "\n".join(lines)
+
+
+# Process-wide profiler shared by every ultrabot module
+STARTUP = StartupProfiler()
+
+
+class LazyModule:
+    """Module proxy that imports on first attribute access"""
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+
+    def _load(self):
+        if self._module is None:
+            with STARTUP.phase(f"import {self._name}"):
+                self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr: str):
+        return getattr(self._load(), attr)
+
+
+def lazy_import(name: str) -> LazyModule:
+    """Return a proxy for `name` that is only imported when first used"""
+    return LazyModule(name)
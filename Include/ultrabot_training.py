@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Ultra Trading Bot - Multi-Symbol Training Pipeline
+Copyright 2025 - Smart Stock Trader
+Featurizes every training symbol in bounded chunks, spills the rows to
+memory-mapped files and streams shuffled batches to Keras from a generator.
+Validation holds out the newest bars across all symbols (by time), so memory
+stays flat however many symbol-years are used.
+"""
+
+import os
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ultrabot_features import (
+    LABEL_HORIZON, LABEL_THRESHOLD, NUM_FEATURES, WARMUP_BARS,
+    compute_feature_matrix, make_labels, valid_rows
+)
+from ultrabot_startup import lazy_import
+
+tf = lazy_import('tensorflow')
+preprocessing = lazy_import('sklearn.preprocessing')
+
+# ═══════════════════════════════════════════════════════════════════════════
+# CONSTANTS
+# ═══════════════════════════════════════════════════════════════════════════
+
+CHUNK_BARS = 50_000                 # Bars featurized at once (bounds the float64 feature matrix)
+CHUNK_OVERLAP = 5 * WARMUP_BARS     # History replayed before a chunk so recursive indicators converge
+SHUFFLE_BLOCK = 2_048               # Contiguous rows read together from the spill files
+SHUFFLE_BUFFER = 32                 # Blocks mixed per shuffle window
+VALIDATION_BATCH = 4_096
+CUTOFF_SAMPLES = 1_000_000          # Bar times sampled to place the validation cutoff
+
+# Spill file per row column: dtype and width
+_COLUMNS = {
+    'features': (np.dtype('<f4'), NUM_FEATURES),
+    'label': (np.dtype('i1'), 1),
+    'time': (np.dtype('<i8'), 1),
+    'symbol': (np.dtype('<i2'), 1),
+}
+
+Ranges = List[Tuple[int, int]]
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# TRAINING SET
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TrainingSet:
+    """
+    Labelled feature rows of several symbols, spilled to files in `directory`.
+    Each symbol's rows are contiguous and in time order. Call close() after the
+    last add_rates() to map the files for reading.
+    """
+
+    def __init__(self, directory: str, symbols: Sequence[str], symbol_features: bool = False):
+        self.directory = directory
+        self.symbols = list(symbols)
+        self.symbol_features = symbol_features
+        self.segments: List[Tuple[int, int]] = []   # (start, stop) rows of each added symbol
+        self.rows = 0
+        self.columns = {}
+        self._files = {name: open(self._path(name), 'wb') for name in _COLUMNS}
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name + '.bin')
+
+    @property
+    def width(self) -> int:
+        """Model input width: the features plus one column per symbol if enabled"""
+        return NUM_FEATURES + (len(self.symbols) if self.symbol_features else 0)
+
+    def add_rates(self, symbol: str, rates, h4_rates=None, d1_rates=None,
+                  horizon: int = LABEL_HORIZON, threshold: float = LABEL_THRESHOLD) -> int:
+        """Featurize and label one symbol's bars chunk by chunk; returns the rows kept"""
+        index = self.symbols.index(symbol)
+        start_row = self.rows
+        n = len(rates)
+
+        for start in range(0, n, CHUNK_BARS):
+            stop = min(start + CHUNK_BARS, n)
+            lo, hi = max(0, start - CHUNK_OVERLAP), min(n, stop + horizon)
+            window = rates[lo:hi]
+            keep = slice(start - lo, stop - lo)
+
+            X = compute_feature_matrix(window, h4_rates, d1_rates)[keep]
+            y = make_labels(window['close'], horizon, threshold)[keep]
+            mask = valid_rows(X) & np.isfinite(y).all(axis=1)
+
+            self._append(X[mask], np.argmax(y[mask], axis=1),
+                         np.asarray(window['time'])[keep][mask], index)
+
+        if self.rows > start_row:
+            self.segments.append((start_row, self.rows))
+        return self.rows - start_row
+
+    def _append(self, X: np.ndarray, labels: np.ndarray, times: np.ndarray, index: int):
+        values = {'features': X, 'label': labels, 'time': times, 'symbol': np.full(len(X), index)}
+        for name, (dtype, _) in _COLUMNS.items():
+            self._files[name].write(np.ascontiguousarray(values[name], dtype=dtype).tobytes())
+        self.rows += len(X)
+
+    def close(self):
+        """Finish writing and memory-map the rows"""
+        for f in self._files.values():
+            f.close()
+        self._files = {}
+        for name, (dtype, width) in _COLUMNS.items():
+            shape = (self.rows, width) if width > 1 else (self.rows,)
+            self.columns[name] = (np.memmap(self._path(name), dtype=dtype, mode='r', shape=shape)
+                                  if self.rows else np.empty(shape, dtype=dtype))
+
+    def release(self):
+        """Drop the maps so the spill directory can be removed"""
+        self.columns = {}
+
+    def split(self, validation_fraction: float, purge: int = LABEL_HORIZON) -> Tuple[Ranges, Ranges]:
+        """
+        Time-ordered train/validation row ranges. Bars at or after one cutoff time
+        (across all symbols) validate; the `purge` training rows just before it are
+        dropped because their labels look past the cutoff.
+        """
+        times = self.columns['time']
+        step = max(1, self.rows // CUTOFF_SAMPLES)
+        sample = np.concatenate([times[start:stop:step] for start, stop in self.segments] or [times[:0]])
+        if len(sample) == 0 or validation_fraction <= 0:
+            return list(self.segments), []
+        cutoff = np.quantile(sample, 1.0 - validation_fraction)
+
+        train, validation = [], []
+        for start, stop in self.segments:
+            cut = start + int(np.searchsorted(times[start:stop], cutoff, side='left'))
+            if cut - purge > start:
+                train.append((start, cut - purge))
+            if stop > cut:
+                validation.append((cut, stop))
+        return train, validation
+
+    def inputs(self, start: int, stop: int) -> np.ndarray:
+        """Unscaled model inputs of rows start..stop-1"""
+        X = np.asarray(self.columns['features'][start:stop], dtype=np.float32)
+        if not self.symbol_features:
+            return X
+        one_hot = np.eye(len(self.symbols), dtype=np.float32)[self.columns['symbol'][start:stop]]
+        return np.hstack([X, one_hot])
+
+    def fit_scaler(self, ranges: Ranges):
+        """StandardScaler fitted block by block over the given rows"""
+        scaler = preprocessing.StandardScaler()
+        for start, stop in ranges:
+            for a in range(start, stop, CHUNK_BARS):
+                scaler.partial_fit(self.inputs(a, min(a + CHUNK_BARS, stop)).astype(np.float64))
+        return scaler
+
+    def windows(self, ranges: Ranges, scaler,
+                rng: Optional[np.random.Generator] = None) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Scaled (X, one-hot y) windows of at most SHUFFLE_BUFFER blocks over the given
+        rows. With `rng`, blocks are visited in random order and rows are shuffled
+        within each window.
+        """
+        mean = np.asarray(scaler.mean_, dtype=np.float32)
+        scale = np.asarray(scaler.scale_, dtype=np.float32)
+        eye = np.eye(3, dtype=np.float32)
+
+        blocks = [(a, min(a + SHUFFLE_BLOCK, stop)) for start, stop in ranges
+                  for a in range(start, stop, SHUFFLE_BLOCK)]
+        if rng is not None:
+            blocks = [blocks[i] for i in rng.permutation(len(blocks))]
+
+        for w in range(0, len(blocks), SHUFFLE_BUFFER):
+            window = blocks[w:w + SHUFFLE_BUFFER]
+            X = (np.concatenate([self.inputs(a, b) for a, b in window]) - mean) / scale
+            y = eye[np.concatenate([self.columns['label'][a:b] for a, b in window])]
+            if rng is not None:
+                order = rng.permutation(len(X))
+                X, y = X[order], y[order]
+            yield X, y
+
+    def dataset(self, ranges: Ranges, batch_size: int, scaler, seed: Optional[int] = None):
+        """
+        tf.data batches over windows(); a seed enables shuffling, redrawn every epoch.
+        Windows cross into Python once each and are cut into batches inside tf.data.
+        """
+        rng = np.random.default_rng(seed) if seed is not None else None
+        spec = (tf.TensorSpec((None, self.width), tf.float32), tf.TensorSpec((None, 3), tf.float32))
+        steps = -(-count_rows(ranges) // batch_size)
+        return (tf.data.Dataset.from_generator(lambda: self.windows(ranges, scaler, rng), output_signature=spec)
+                .rebatch(batch_size)
+                .apply(tf.data.experimental.assert_cardinality(steps))
+                .prefetch(2))
+
+
+def count_rows(ranges: Ranges) -> int:
+    return sum(stop - start for start, stop in ranges)
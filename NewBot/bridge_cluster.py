@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+"""
+MT5 Bridge - Multi-Process Mode
+One owner process holds the MT5 terminal session, the trade outbox and the
+position monitor. N worker processes accept WebSocket clients on a shared
+listening socket and forward terminal operations to the owner over local IPC.
+Position broadcasts flow from the owner to every worker.
+Enable with BRIDGE_WORKERS=N and run mt5_bridge.py as usual.
+"""
+
+import asyncio
+import json
+import logging
+import multiprocessing
+import secrets
+import socket
+import struct
+import time
+from dataclasses import asdict
+from typing import Dict, List, Optional, Tuple
+
+from bridge_metrics import METRICS
+from mt5_bridge import (
+    MT5Bridge, TradeResult, TradeSignal,
+    BRIDGE_IPC_HOST, BRIDGE_IPC_PORT, METRICS_PORT, WEBSOCKET_HOST, WEBSOCKET_PORT
+)
+
+logger = logging.getLogger(__name__)
+
+# IPC framing: 4-byte big-endian length followed by a JSON document
+_HEADER = struct.Struct('>I')
+
+WORKER_CHECK_INTERVAL = 5           # Seconds between worker liveness checks
+IPC_HELLO_TIMEOUT = 10              # Seconds a worker has to authenticate
+IPC_MAX_BUFFER = 8 * 1024 * 1024    # Unsent bytes after which a stuck worker link is dropped
+
+
+def encode_frame(message: Dict) -> bytes:
+    payload = json.dumps(message).encode()
+    return _HEADER.pack(len(payload)) + payload
+
+
+async def read_frame(reader: asyncio.StreamReader) -> Dict:
+    header = await reader.readexactly(_HEADER.size)
+    return json.loads(await reader.readexactly(_HEADER.unpack(header)[0]))
+
+
+class OwnerBridge(MT5Bridge):
+    """
+    Terminal owner: the only process that calls MetaTrader5.
+    Serves worker requests as `op_<name>` coroutines and pushes position
+    events, encoded once, to every connected worker.
+    """
+
+    def __init__(self, workers: int):
+        super().__init__()
+        self.token = secrets.token_hex(16)
+        self.workers: List[Optional[multiprocessing.Process]] = [None] * workers
+        self.links: set = set()
+        self.listener: Optional[socket.socket] = None
+        self.ipc_server = None
+        self.ipc_address: Optional[Tuple[str, int]] = None
+
+    async def run(self):
+        """Start the terminal, IPC server and workers, then monitor positions and flush the outbox"""
+        self.running = True
+
+        if not await self.initialize_mt5():
+            logger.error("Failed to initialize MT5. Exiting...")
+            return
+
+        # One listening socket, inherited by every worker
+        self.listener = socket.create_server((WEBSOCKET_HOST, WEBSOCKET_PORT), backlog=1024)
+        self.ipc_server = await asyncio.start_server(self.handle_worker, BRIDGE_IPC_HOST, BRIDGE_IPC_PORT)
+        self.ipc_address = self.ipc_server.sockets[0].getsockname()[:2]
+
+        logger.info(f"MT5 owner running with {len(self.workers)} workers on "
+                    f"{WEBSOCKET_HOST}:{WEBSOCKET_PORT} (IPC {self.ipc_address[0]}:{self.ipc_address[1]})")
+
+        await self.start_metrics(METRICS_PORT)
+
+        try:
+            await asyncio.gather(
+                self.supervise_workers(),
+                self.monitor_positions(),
+                self.outbox.run(self.send_trade_batch),
+                METRICS.monitor_loop_lag()
+            )
+        except KeyboardInterrupt:
+            logger.info("Shutting down...")
+        finally:
+            await self.shutdown()
+
+    async def supervise_workers(self):
+        """Start the worker processes and restart any that exit"""
+        context = multiprocessing.get_context('spawn')
+        while self.running:
+            for index, process in enumerate(self.workers):
+                if process is not None and process.is_alive():
+                    continue
+                if process is not None:
+                    logger.warning(f"Worker {index} exited with code {process.exitcode}; restarting")
+                process = context.Process(
+                    target=run_worker,
+                    args=(index, self.listener, self.ipc_address, self.token),
+                    name=f"bridge-worker-{index}",
+                    daemon=True
+                )
+                process.start()
+                self.workers[index] = process
+            await asyncio.sleep(WORKER_CHECK_INTERVAL)
+
+    async def handle_worker(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Authenticate one worker link, then serve its requests concurrently"""
+        try:
+            hello = await asyncio.wait_for(read_frame(reader), IPC_HELLO_TIMEOUT)
+            if not secrets.compare_digest(str(hello.get('token', '')), self.token):
+                logger.warning("Rejected IPC connection with a bad token")
+                return
+
+            self.links.add(writer)
+            logger.info(f"Worker {hello.get('worker')} connected")
+
+            # Baseline for the worker's mirrored position state
+            if self.last_snapshot:
+                writer.write(encode_frame(self.positions_event()))
+
+            # Strong references keep in-flight requests alive until they finish
+            tasks: set = set()
+            while True:
+                request = await read_frame(reader)
+                task = asyncio.ensure_future(self.serve_request(writer, request))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+
+        except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+            pass
+        finally:
+            self.links.discard(writer)
+            writer.close()
+
+    async def serve_request(self, writer: asyncio.StreamWriter, request: Dict):
+        op = getattr(self, f"op_{request.get('op')}", None)
+        try:
+            if op is None:
+                raise ValueError(f"Unknown IPC op: {request.get('op')}")
+            reply = {'id': request['id'], 'result': await op(**request.get('args', {}))}
+        except Exception as e:
+            reply = {'id': request['id'], 'error': str(e) or type(e).__name__}
+
+        if not writer.is_closing():
+            writer.write(encode_frame(reply))
+
+    async def op_get_positions(self) -> List[Dict]:
+        return await self.get_positions()
+
+    async def op_get_account_info(self) -> Dict:
+        return await self.get_account_info()
+
+    async def op_request_signal(self, symbol: str) -> Optional[Dict]:
+        # Backend errors go back to the worker as IPC errors so neither side caches them
+        signal = await self.signal_cache.get(symbol, self._fetch_signal)
+        return asdict(signal) if signal else None
+
+    async def op_execute_trade(self, signal: Dict) -> Dict:
+        return asdict(await self.execute_trade(TradeSignal(**signal)))
+
+    async def op_close_position(self, ticket: int) -> Dict:
+        return await self.close_position(ticket)
+
+    def positions_event(self, delta: Optional[Tuple[List, List, List]] = None) -> Dict:
+        if delta is None:
+            return {'event': 'positions', 'snapshot': self.position_tracker.snapshot()}
+        opened, modified, closed = delta
+        return {'event': 'positions', 'opened': opened, 'modified': modified, 'closed': closed}
+
+    def broadcast_positions(self, delta: Optional[Tuple[List, List, List]] = None):
+        """Forward position changes to every worker, encoded once"""
+        frame = encode_frame(self.positions_event(delta))
+        for writer in list(self.links):
+            if writer.transport.get_write_buffer_size() > IPC_MAX_BUFFER:
+                logger.warning("Dropping a worker link that stopped reading")
+                self.links.discard(writer)
+                writer.close()
+                continue
+            writer.write(frame)
+
+    async def shutdown(self):
+        """Stop the workers, then release the terminal"""
+        self.running = False
+
+        for process in self.workers:
+            if process is not None and process.is_alive():
+                process.terminate()
+        for process in self.workers:
+            if process is not None:
+                process.join(timeout=5)
+
+        if self.ipc_server is not None:
+            self.ipc_server.close()
+        if self.listener is not None:
+            self.listener.close()
+
+        await super().shutdown()
+
+
+class WorkerBridge(MT5Bridge):
+    """
+    WebSocket worker: serves clients exactly like MT5Bridge, but every terminal
+    operation is a request to the owner process and position state is a mirror
+    of the owner's, updated from its events.
+    """
+
+    owns_terminal = False
+
+    def __init__(self, index: int, ipc_address: Tuple[str, int], token: str):
+        super().__init__()
+        self.index = index
+        self.ipc_address = ipc_address
+        self.token = token
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+        self.calls: Dict[int, asyncio.Future] = {}
+        self.next_call = 0
+
+    async def initialize_mt5(self) -> bool:
+        """Connect and authenticate to the owner process"""
+        self.reader, self.writer = await asyncio.open_connection(*self.ipc_address)
+        self.writer.write(encode_frame({'token': self.token, 'worker': self.index}))
+        self.connected = True
+        return True
+
+    async def call(self, op: str, **args):
+        """Run `op` in the owner process and return its result"""
+        self.next_call += 1
+        call_id = self.next_call
+        future = asyncio.get_running_loop().create_future()
+        self.calls[call_id] = future
+        try:
+            self.writer.write(encode_frame({'id': call_id, 'op': op, 'args': args}))
+            return await future
+        finally:
+            self.calls.pop(call_id, None)
+
+    async def listen_owner(self):
+        """Resolve replies and apply position events until the owner link closes"""
+        try:
+            while True:
+                message = await read_frame(self.reader)
+                if 'event' in message:
+                    self.on_owner_event(message)
+                    continue
+
+                future = self.calls.get(message.get('id'))
+                if future is None or future.done():
+                    continue
+                if 'error' in message:
+                    future.set_exception(RuntimeError(message['error']))
+                else:
+                    future.set_result(message.get('result'))
+
+        except (asyncio.IncompleteReadError, ConnectionError):
+            logger.error(f"Worker {self.index} lost its connection to the MT5 owner")
+        finally:
+            for future in self.calls.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("MT5 owner process unavailable"))
+
+    def on_owner_event(self, message: Dict):
+        if message.get('event') != 'positions':
+            return
+        if 'snapshot' in message:
+            self.position_tracker.load(message['snapshot'])
+            self.last_snapshot = time.time()
+            self.broadcast_positions()
+        else:
+            delta = (message['opened'], message['modified'], message['closed'])
+            self.position_tracker.apply(*delta)
+            self.broadcast_positions(delta)
+
+    async def _fetch_signal(self, symbol: str) -> Optional[TradeSignal]:
+        """Owner-side lookup; raises on owner or backend errors so they are not cached"""
+        data = await self.call('request_signal', symbol=symbol)
+        return TradeSignal(**data) if data else None
+
+    async def execute_trade(self, signal: TradeSignal) -> TradeResult:
+        try:
+            return TradeResult(**await self.call('execute_trade', signal=asdict(signal)))
+        except Exception as e:
+            logger.error(f"Error executing trade: {e}")
+            return TradeResult(success=False, error_message=str(e))
+
+    async def get_positions(self) -> List[Dict]:
+        try:
+            return await self.call('get_positions')
+        except Exception as e:
+            logger.error(f"Error getting positions: {e}")
+            return []
+
+    async def get_account_info(self) -> Dict:
+        try:
+            return await self.call('get_account_info')
+        except Exception as e:
+            logger.error(f"Error getting account info: {e}")
+            return {}
+
+    async def close_position(self, ticket: int) -> Dict:
+        try:
+            return await self.call('close_position', ticket=ticket)
+        except Exception as e:
+            logger.error(f"Error closing position: {e}")
+            return {'success': False, 'error': str(e)}
+
+    def get_stats(self) -> Dict:
+        stats = super().get_stats()
+        stats['worker'] = self.index
+        return stats
+
+    async def run(self, sock: socket.socket):
+        """Serve clients on the shared socket until the owner link closes"""
+        self.running = True
+        await self.initialize_mt5()
+        if METRICS_PORT > 0:
+            await self.start_metrics(METRICS_PORT + 1 + self.index)
+
+        server = asyncio.ensure_future(self.start_websocket_server(sock))
+        owner = asyncio.ensure_future(self.listen_owner())
+        lag = asyncio.ensure_future(METRICS.monitor_loop_lag())
+        try:
+            await asyncio.wait({server, owner}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            server.cancel()
+            owner.cancel()
+            lag.cancel()
+            await self.shutdown()
+
+    async def shutdown(self):
+        self.running = False
+
+        if self.clients:
+            await asyncio.gather(
+                *[client.close() for client in self.clients],
+                return_exceptions=True
+            )
+        if self.writer is not None:
+            self.writer.close()
+        await METRICS.stop_server()
+        logger.info(f"Worker {self.index} shutdown complete")
+
+
+def run_worker(index: int, sock: socket.socket, ipc_address: Tuple[str, int], token: str):
+    """Worker process entry point"""
+    bridge = WorkerBridge(index, tuple(ipc_address), token)
+    try:
+        asyncio.run(bridge.run(sock))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+MT5 Bridge - Hot-Path Metrics
+Fixed-bucket latency histograms and callback gauges, served in Prometheus
+text format on a local HTTP endpoint. Recording is a bisect and two increments;
+all formatting happens only when the endpoint is scraped.
+"""
+
+import asyncio
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Tuple
+
+from aiohttp import web
+
+# Seconds; tuned for sub-millisecond dispatch up to multi-second backend calls
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+                   0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LOOP_LAG_INTERVAL = 0.5    # Seconds between event-loop lag probes
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(names: Tuple[str, ...], values: Tuple, extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+class Histogram:
+    """Prometheus histogram; safe to observe from the event loop and worker threads"""
+
+    def __init__(self, name: str, help_text: str, labels: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.label_names = labels
+        self.buckets = buckets
+        self.series: Dict[Tuple, List] = {}    # label values -> [bucket counts..., sum, count]
+        self.lock = threading.Lock()
+
+    def observe(self, value: float, *labels):
+        index = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            series = self.series.get(labels)
+            if series is None:
+                series = self.series[labels] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+            series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    @contextmanager
+    def time(self, *labels):
+        """Observe the duration of the enclosed block"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *labels)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self.lock:
+            snapshot = [(labels, list(series)) for labels, series in self.series.items()]
+
+        for labels, series in sorted(snapshot):
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                bucket = _labels(self.label_names, labels, f'le="{bound}"')
+                lines.append(f"{self.name}_bucket{bucket} {cumulative}")
+            bucket = _labels(self.label_names, labels, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{bucket} {series[-1]}")
+            lines.append(f"{self.name}_sum{_labels(self.label_names, labels)} {series[-2]}")
+            lines.append(f"{self.name}_count{_labels(self.label_names, labels)} {series[-1]}")
+        return lines
+
+
+class CallbackMetric:
+    """Gauge or counter whose value is read from a callback at scrape time"""
+
+    def __init__(self, name: str, help_text: str, read: Callable[[], float], kind: str = 'gauge'):
+        self.name = name
+        self.help = help_text
+        self.read = read
+        self.kind = kind
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}",
+                f"{self.name} {float(self.read())}"]
+
+
+class MetricsRegistry:
+    """Every metric of one bridge process, rendered together on scrape"""
+
+    def __init__(self):
+        self.metrics: Dict[str, object] = {}
+        self.runner = None
+
+    def histogram(self, name: str, help_text: str, labels: Tuple[str, ...] = (),
+                  buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        metric = Histogram(name, help_text, labels, buckets)
+        self.metrics[name] = metric
+        return metric
+
+    def callback(self, name: str, help_text: str, read: Callable[[], float], kind: str = 'gauge'):
+        self.metrics[name] = CallbackMetric(name, help_text, read, kind)
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics.values():
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+    async def handle_scrape(self, request: web.Request) -> web.Response:
+        return web.Response(text=self.render(), content_type='text/plain',
+                            headers={'X-Prometheus-Format': '0.0.4'})
+
+    async def start_server(self, host: str, port: int):
+        """Serve GET /metrics on host:port"""
+        app = web.Application()
+        app.router.add_get('/metrics', self.handle_scrape)
+        self.runner = web.AppRunner(app, access_log=None)
+        await self.runner.setup()
+        await web.TCPSite(self.runner, host, port).start()
+
+    async def stop_server(self):
+        if self.runner is not None:
+            await self.runner.cleanup()
+            self.runner = None
+
+    async def monitor_loop_lag(self, interval: float = LOOP_LAG_INTERVAL):
+        """Record how late the event loop wakes up from a fixed sleep"""
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(interval)
+            LOOP_LAG.observe(max(0.0, time.perf_counter() - start - interval))
+
+
+# Process-wide registry and the hot-path histograms the bridge records into
+METRICS = MetricsRegistry()
+
+MESSAGE_LATENCY = METRICS.histogram(
+    'bridge_message_seconds', 'Time to handle one client message, by message type', ('type',))
+TERMINAL_LATENCY = METRICS.histogram(
+    'bridge_terminal_call_seconds', 'MetaTrader5 call latency on the terminal thread', ('call',))
+BACKEND_LATENCY = METRICS.histogram(
+    'bridge_backend_request_seconds', 'Backend HTTP request latency', ('method', 'route', 'status'))
+LOOP_LAG = METRICS.histogram(
+    'bridge_event_loop_lag_seconds', 'Event-loop scheduling delay')
+FANOUT_LATENCY = METRICS.histogram(
+    'bridge_fanout_seconds', 'Time to fan one broadcast out to subscriber queues', ('topic',))
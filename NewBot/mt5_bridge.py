@@ -7,21 +7,36 @@ Features: Real-time signal processing, trade execution, risk management
 
 import MetaTrader5 as mt5
 import asyncio
+import aiohttp
 import websockets
+from websockets.exceptions import ConnectionClosed
 import json
 import logging
 import os
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional, Tuple
 from dataclasses import dataclass, asdict
-import requests
 from dotenv import load_dotenv
 import numpy as np
 import time
+import functools
+from collections import deque
+import operator
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlparse
+
+try:
+    import msgpack  # Optional compact binary wire format
+except ImportError:
+    msgpack = None
 
 # Load environment variables
 load_dotenv()
 
+from bridge_metrics import (
+    METRICS, MESSAGE_LATENCY, TERMINAL_LATENCY, BACKEND_LATENCY, FANOUT_LATENCY
+)
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -42,11 +57,82 @@ BACKEND_API_KEY = os.getenv('BACKEND_API_KEY', '')
 WEBSOCKET_HOST = os.getenv('WEBSOCKET_HOST', 'localhost')
 WEBSOCKET_PORT = int(os.getenv('WEBSOCKET_PORT', '8765'))
 
+# Multi-process mode: one MT5 owner process plus this many WebSocket worker processes
+# sharing WEBSOCKET_PORT (0 = single process). Workers reach the owner over local IPC.
+BRIDGE_WORKERS = int(os.getenv('BRIDGE_WORKERS', '0'))
+BRIDGE_IPC_HOST = os.getenv('BRIDGE_IPC_HOST', '127.0.0.1')
+BRIDGE_IPC_PORT = int(os.getenv('BRIDGE_IPC_PORT', '0'))
+
+# Prometheus metrics endpoint (GET /metrics; 0 disables). Workers use METRICS_PORT + 1 + index.
+METRICS_HOST = os.getenv('METRICS_HOST', '127.0.0.1')
+METRICS_PORT = int(os.getenv('METRICS_PORT', '9108'))
+
+# Backend HTTP client (one pooled keep-alive session shared by all requests)
+BACKEND_TIMEOUT = float(os.getenv('BACKEND_TIMEOUT', '10'))
+BACKEND_MAX_CONNECTIONS = int(os.getenv('BACKEND_MAX_CONNECTIONS', '20'))
+BACKEND_MAX_CONCURRENCY = int(os.getenv('BACKEND_MAX_CONCURRENCY', '10'))
+BACKEND_KEEPALIVE = float(os.getenv('BACKEND_KEEPALIVE', '30'))
+
+# Trade notification outbox (fills are journaled to disk and posted in batches)
+OUTBOX_PATH = os.getenv('OUTBOX_PATH', 'mt5_bridge_outbox.jsonl')
+OUTBOX_BATCH_SIZE = int(os.getenv('OUTBOX_BATCH_SIZE', '500'))
+OUTBOX_FLUSH_INTERVAL = float(os.getenv('OUTBOX_FLUSH_INTERVAL', '1.0'))
+OUTBOX_RETRY_MAX = float(os.getenv('OUTBOX_RETRY_MAX', '60'))
+TRADE_NOTIFY_BATCH_PATH = os.getenv('TRADE_NOTIFY_BATCH_PATH', '/api/trades/notify/batch')
+OUTBOX_COMPACT_BYTES = 1024 * 1024    # Truncate the journal once this much is fully delivered
+OUTBOX_DELIVERED_MEMORY = 10000       # Recently delivered tickets remembered for dedupe
+
+# Backend signal cache (one backend request per symbol per TTL, shared by all clients)
+SIGNAL_CACHE_TTL = float(os.getenv('SIGNAL_CACHE_TTL', '5'))
+SIGNAL_CACHE_BAR_SECONDS = int(os.getenv('SIGNAL_CACHE_BAR_SECONDS', '0'))  # >0: expire at each bar close instead
+
 # Trading configuration
 MAX_RETRIES = 3
 RETRY_DELAY = 5
 HEARTBEAT_INTERVAL = 30
 
+# Requests one connection may have in flight before the bridge stops reading from it
+CLIENT_MAX_INFLIGHT = int(os.getenv('CLIENT_MAX_INFLIGHT', '16'))
+
+# Outbound backpressure: a client whose queue exceeds this many frames, or whose
+# oldest unsent frame is older than the timeout, is disconnected as a slow consumer
+CLIENT_QUEUE_MAX = int(os.getenv('CLIENT_QUEUE_MAX', '256'))
+CLIENT_SLOW_TIMEOUT = float(os.getenv('CLIENT_SLOW_TIMEOUT', '30'))
+
+# Position broadcasts (deltas every poll, full snapshot for resync)
+POSITION_POLL_INTERVAL = float(os.getenv('POSITION_POLL_INTERVAL', '5'))
+POSITION_SNAPSHOT_INTERVAL = float(os.getenv('POSITION_SNAPSHOT_INTERVAL', '60'))
+
+# Broadcast topics clients can subscribe to
+TOPIC_POSITIONS = 'positions'
+TOPICS = (TOPIC_POSITIONS,)
+
+# Fields whose change makes a position "modified"
+POSITION_FIELDS = ('volume', 'price_current', 'sl', 'tp', 'profit', 'swap')
+
+# Field order of positions packed as arrays by the binary protocol
+POSITION_WIRE_FIELDS = ('ticket', 'symbol', 'type', 'volume', 'price_open', 'price_current',
+                        'sl', 'tp', 'profit', 'swap', 'comment', 'magic')
+
+# State frames conflated latest-wins in a client's outbound queue, by frame type.
+# Replies carrying a request id are never conflated.
+STATE_FRAMES = {
+    'position_update': TOPIC_POSITIONS,
+    'position_delta': TOPIC_POSITIONS,
+    'positions': 'positions_reply',
+    'account_info': 'account_info',
+}
+
+# Queued in place of a superseded position frame; the writer sends a fresh snapshot instead
+RESYNC = object()
+
+# Frame keys that hold position lists, by frame type
+POSITION_LIST_KEYS = {
+    'positions': ('data',),
+    'position_update': ('data',),
+    'position_delta': ('opened', 'modified'),
+}
+
 
 @dataclass
 class TradeSignal:
@@ -87,19 +173,514 @@ class TradeResult:
             self.timestamp = datetime.now().isoformat()
 
 
+def position_to_dict(pos) -> Dict:
+    """Wire representation of one MT5 position"""
+    return {
+        'ticket': pos.ticket,
+        'symbol': pos.symbol,
+        'type': 'BUY' if pos.type == mt5.POSITION_TYPE_BUY else 'SELL',
+        'volume': pos.volume,
+        'price_open': pos.price_open,
+        'price_current': pos.price_current,
+        'sl': pos.sl,
+        'tp': pos.tp,
+        'profit': pos.profit,
+        'swap': pos.swap,
+        'comment': pos.comment,
+        'magic': pos.magic
+    }
+
+
+class PositionTracker:
+    """
+    Last broadcast position state keyed by ticket.
+    update() compares the raw terminal positions on POSITION_FIELDS and only builds
+    records for positions that opened or changed; unchanged records are reused.
+    """
+
+    _key = operator.attrgetter(*POSITION_FIELDS)
+
+    def __init__(self):
+        self.state: Dict[int, Tuple[tuple, Dict]] = {}
+
+    def update(self, positions) -> Tuple[List[Dict], List[Dict], List[Dict]]:
+        """Apply a new snapshot; returns (opened, modified, closed) records"""
+        state = {}
+        opened, modified = [], []
+        for pos in positions:
+            key = self._key(pos)
+            previous = self.state.get(pos.ticket)
+            if previous is not None and previous[0] == key:
+                state[pos.ticket] = previous
+                continue
+            record = position_to_dict(pos)
+            state[pos.ticket] = (key, record)
+            (modified if previous is not None else opened).append(record)
+
+        closed = [record for ticket, (_, record) in self.state.items() if ticket not in state]
+        self.state = state
+        return opened, modified, closed
+
+    def snapshot(self) -> List[Dict]:
+        return [record for _, record in self.state.values()]
+
+    def load(self, records: List[Dict]):
+        """Replace the state with records from another tracker (worker mirrors)"""
+        self.state = {record['ticket']: (None, record) for record in records}
+
+    def apply(self, opened: List[Dict], modified: List[Dict], closed: List[Dict]):
+        """Apply another tracker's delta to a mirrored state"""
+        for record in opened + modified:
+            self.state[record['ticket']] = (None, record)
+        for record in closed:
+            self.state.pop(record['ticket'], None)
+
+
+class JsonCodec:
+    """Default text protocol: JSON frames, ISO-8601 timestamps"""
+
+    name = 'json'
+
+    def encode(self, frame: Dict) -> str:
+        timestamp = frame.get('timestamp')
+        if isinstance(timestamp, float):
+            frame = {**frame, 'timestamp': datetime.fromtimestamp(timestamp).isoformat()}
+        return json.dumps(frame)
+
+    def decode(self, message) -> Dict:
+        return json.loads(message)
+
+
+class MsgpackCodec:
+    """
+    Compact binary protocol: MessagePack frames, epoch-second timestamps and
+    positions packed as arrays in POSITION_WIRE_FIELDS order.
+    """
+
+    name = 'msgpack'
+    _pack_position = operator.itemgetter(*POSITION_WIRE_FIELDS)
+
+    def encode(self, frame: Dict) -> bytes:
+        keys = POSITION_LIST_KEYS.get(frame.get('type'))
+        if keys:
+            frame = dict(frame)
+            for key in keys:
+                frame[key] = [self._pack_position(p) for p in frame[key]]
+        return msgpack.packb(frame, use_bin_type=True)
+
+    def decode(self, message) -> Dict:
+        return msgpack.unpackb(message, raw=False)
+
+
+JSON_CODEC = JsonCodec()
+CODECS = {'json': JSON_CODEC}
+if msgpack is not None:
+    CODECS['msgpack'] = MsgpackCodec()
+
+
+# Message type -> (handler, ordered). Filled by @handles on MT5Bridge methods.
+MESSAGE_HANDLERS: Dict[str, Tuple[Callable, bool]] = {}
+
+
+def handles(message_type: str, ordered: bool = False):
+    """
+    Register an MT5Bridge method as the handler for a message type.
+    Handlers take (client, data) and return the reply frame or None.
+    Ordered handlers (trade-affecting) run one at a time per connection, in arrival order.
+    """
+    def register(fn):
+        MESSAGE_HANDLERS[message_type] = (fn, ordered)
+        return fn
+    return register
+
+
+class BridgeClient:
+    """
+    Per-connection state: the socket, its broadcast subscriptions, request slots and
+    the bounded outbound queue drained by its writer task.
+    A client that never subscribed receives every topic; empty symbol/magic
+    filters match every record.
+    """
+
+    def __init__(self, websocket, codec=JSON_CODEC):
+        self.websocket = websocket
+        self.codec = codec
+        self.topics: Optional[set] = None
+        self.symbols: set = set()
+        self.magics: set = set()
+        self.slots = asyncio.Semaphore(CLIENT_MAX_INFLIGHT)
+        self.ordered = asyncio.Lock()
+        self.tasks: set = set()
+        self.queue: deque = deque()                # [state key, message, enqueued at]
+        self.state_entries: Dict[str, list] = {}   # state key -> its queued entry
+        self.ready = asyncio.Event()
+        self.writer: Optional[asyncio.Future] = None
+        self.closing = False
+        self.conflated = 0
+        self.dropped = 0
+
+    def enqueue(self, message, key: Optional[str] = None) -> bool:
+        """
+        Queue an encoded frame. A state frame whose key is already queued replaces
+        that entry in place (positions become a RESYNC marker, since a delta cannot
+        stand in for the ones it overtakes); returns False when that happened.
+        """
+        if key is not None:
+            entry = self.state_entries.get(key)
+            if entry is not None:
+                entry[1] = RESYNC if key == TOPIC_POSITIONS else message
+                self.conflated += 1
+                return False
+
+        entry = [key, message, time.monotonic()]
+        self.queue.append(entry)
+        if key is not None:
+            self.state_entries[key] = entry
+        self.ready.set()
+        return True
+
+    def lag(self) -> float:
+        """Seconds the oldest unsent frame has been waiting"""
+        return time.monotonic() - self.queue[0][2] if self.queue else 0.0
+
+    def filter_key(self) -> Tuple[frozenset, frozenset]:
+        return frozenset(self.symbols), frozenset(self.magics)
+
+
+def record_filter(symbols: frozenset, magics: frozenset) -> Callable[[Dict], bool]:
+    """Predicate selecting the records a symbol/magic filter lets through"""
+    return lambda record: ((not symbols or record.get('symbol') in symbols) and
+                           (not magics or record.get('magic') in magics))
+
+
+class MT5Executor:
+    """
+    Runs every terminal call on one dedicated thread.
+    Jobs execute strictly in submission order, so order sends stay FIFO.
+    Identical reads (same key) still waiting for the terminal share one call and
+    result, unless a write was queued after them.
+    """
+
+    def __init__(self):
+        self.pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='mt5')
+        self.pending: Dict[str, tuple] = {}
+        self.write_seq = 0
+        self.calls = 0
+        self.coalesced = 0
+
+    async def read(self, key: str, fn, *args):
+        """Run a read-only job, joining an identical pending one if possible"""
+        pending = self.pending.get(key)
+        if pending is not None and pending[1] == self.write_seq:
+            self.coalesced += 1
+            return await asyncio.shield(pending[0])
+
+        future = self._submit(fn, *args)
+        entry = (future, self.write_seq)
+        self.pending[key] = entry
+        future.add_done_callback(
+            lambda _: self.pending.pop(key) if self.pending.get(key) is entry else None
+        )
+        return await asyncio.shield(future)
+
+    async def write(self, fn, *args):
+        """Run a job that changes terminal state; later reads will not reuse earlier results"""
+        self.write_seq += 1
+        return await asyncio.shield(self._submit(fn, *args))
+
+    def _submit(self, fn, *args) -> asyncio.Future:
+        self.calls += 1
+        loop = asyncio.get_running_loop()
+        return loop.run_in_executor(self.pool, functools.partial(fn, *args))
+
+    def shutdown(self):
+        self.pool.shutdown(wait=True)
+
+
+class TradeOutbox:
+    """
+    Append-only on-disk journal of fills waiting to reach the backend.
+    Each fill is fsynced to OUTBOX_PATH before the EA gets its reply; run() posts
+    pending fills in batches and stores the acknowledged byte offset in a sidecar
+    file, so undelivered fills survive backend outages and restarts.
+    Fills are deduplicated by ticket.
+    """
+
+    def __init__(self, path: str = OUTBOX_PATH, batch_size: int = OUTBOX_BATCH_SIZE,
+                 flush_interval: float = OUTBOX_FLUSH_INTERVAL, retry_max: float = OUTBOX_RETRY_MAX):
+        self.path = path
+        self.offset_path = path + '.offset'
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.retry_max = retry_max
+        self.pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='outbox')
+        self.pending: List[Tuple[int, Dict]] = []    # (end offset in journal, fill)
+        self.queued = set()                          # Tickets in pending
+        self.delivered: Dict = {}                    # Recently delivered tickets, oldest first
+        self.wake: Optional[asyncio.Event] = None
+        self.running = False
+        self.sent_batches = 0
+        self.sent_fills = 0
+        self.file = None
+        self._load()
+
+    def _load(self):
+        """Reopen the journal and queue every fill past the acknowledged offset"""
+        offset = 0
+        if os.path.exists(self.offset_path):
+            with open(self.offset_path) as f:
+                offset = int(f.read().strip() or 0)
+
+        self.file = open(self.path, 'a+b')
+        self.file.seek(0, os.SEEK_END)
+        size = self.file.tell()
+        offset = min(offset, size)
+
+        self.file.seek(offset)
+        end = offset
+        for line in self.file:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                break    # Torn write from a crash; drop it below
+            end += len(line)
+            self._queue(end, record)
+
+        if end < size:
+            self.file.truncate(end)
+        self.file.seek(0, os.SEEK_END)
+
+        if self.pending:
+            logger.info(f"Outbox: {len(self.pending)} undelivered fills from previous run")
+
+    def _queue(self, end: int, record: Dict):
+        self.pending.append((end, record))
+        ticket = record.get('ticket')
+        if ticket is not None:
+            self.queued.add(ticket)
+
+    def _is_duplicate(self, ticket) -> bool:
+        return ticket is not None and (ticket in self.queued or ticket in self.delivered)
+
+    async def add(self, record: Dict) -> bool:
+        """Journal one fill; returns False if its ticket is already queued or delivered"""
+        ticket = record.get('ticket')
+        if self._is_duplicate(ticket):
+            return False
+        if ticket is not None:
+            self.queued.add(ticket)
+
+        line = (json.dumps(record) + '\n').encode()
+        loop = asyncio.get_running_loop()
+        try:
+            end = await loop.run_in_executor(self.pool, self._append, line)
+        except Exception:
+            self.queued.discard(ticket)
+            raise
+
+        self.pending.append((end, record))
+        if len(self.pending) > 1 and end < self.pending[-2][0]:
+            self.pending.sort(key=lambda item: item[0])
+        if len(self.pending) >= self.batch_size and self.wake is not None:
+            self.wake.set()
+        return True
+
+    def _append(self, line: bytes) -> int:
+        self.file.write(line)
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        return self.file.tell()
+
+    def _commit(self, offset: int):
+        """Persist the acknowledged offset, compacting the journal when fully delivered"""
+        if offset >= OUTBOX_COMPACT_BYTES and offset == self.file.seek(0, os.SEEK_END):
+            self.file.truncate(0)
+            offset = 0
+        tmp = self.offset_path + '.tmp'
+        with open(tmp, 'w') as f:
+            f.write(str(offset))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.offset_path)
+        return offset
+
+    async def run(self, send: Callable):
+        """
+        Flush loop: waits for a full batch or flush_interval, then posts pending fills
+        with `await send(fills) -> bool`, backing off exponentially while it fails.
+        """
+        self.running = True
+        self.wake = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        delay = 1.0
+
+        while self.running:
+            try:
+                await asyncio.wait_for(self.wake.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self.wake.clear()
+
+            while self.pending and self.running:
+                batch = self.pending[:self.batch_size]
+                if not await send([record for _, record in batch]):
+                    await asyncio.sleep(delay)
+                    delay = min(delay * 2, self.retry_max)
+                    break
+
+                delay = 1.0
+                del self.pending[:len(batch)]
+                for _, record in batch:
+                    self._mark_delivered(record.get('ticket'))
+                self.sent_batches += 1
+                self.sent_fills += len(batch)
+                await loop.run_in_executor(self.pool, self._commit, batch[-1][0])
+
+    def _mark_delivered(self, ticket):
+        if ticket is None:
+            return
+        self.queued.discard(ticket)
+        self.delivered[ticket] = True
+        if len(self.delivered) > OUTBOX_DELIVERED_MEMORY:
+            del self.delivered[next(iter(self.delivered))]
+
+    def close(self):
+        self.running = False
+        if self.wake is not None:
+            self.wake.set()
+        self.pool.shutdown(wait=True)
+        self.file.close()
+
+
+class SignalCache:
+    """
+    Per-symbol cache of backend signals.
+    Entries live for `ttl` seconds, or until the next bar close when `bar_seconds` is set.
+    Concurrent misses for one symbol share a single in-flight fetch; failed fetches are
+    not cached.
+    """
+
+    def __init__(self, ttl: float = SIGNAL_CACHE_TTL, bar_seconds: int = SIGNAL_CACHE_BAR_SECONDS):
+        self.ttl = ttl
+        self.bar_seconds = bar_seconds
+        self.entries: Dict[str, Tuple[float, Optional['TradeSignal']]] = {}
+        self.inflight: Dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.shared = 0
+
+    def expiry(self, now: float) -> float:
+        if self.bar_seconds > 0:
+            return (now // self.bar_seconds + 1) * self.bar_seconds
+        return now + self.ttl
+
+    async def get(self, symbol: str, fetch: Callable):
+        """Cached signal for symbol, calling `await fetch(symbol)` on a miss"""
+        entry = self.entries.get(symbol)
+        if entry is not None and entry[0] > time.time():
+            self.hits += 1
+            return entry[1]
+
+        future = self.inflight.get(symbol)
+        if future is not None:
+            self.shared += 1
+        else:
+            self.misses += 1
+            future = asyncio.ensure_future(self._load(symbol, fetch))
+            self.inflight[symbol] = future
+        return await asyncio.shield(future)
+
+    async def _load(self, symbol: str, fetch: Callable):
+        try:
+            signal = await fetch(symbol)
+            self.entries[symbol] = (self.expiry(time.time()), signal)
+            return signal
+        finally:
+            self.inflight.pop(symbol, None)
+
+    def stats(self) -> Dict:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'shared': self.shared,
+            'symbols': len(self.entries)
+        }
+
+
 class MT5Bridge:
     """Bridge between MT5 and Python backend"""
 
+    # False in processes that reach the terminal through another process
+    owns_terminal = True
+
     def __init__(self):
         self.connected = False
         self.websocket_server = None
-        self.clients = set()
+        self.clients: Dict = {}                  # websocket -> BridgeClient
+        self.topic_index: Dict[str, set] = {}    # topic -> subscribed BridgeClients
+        self.all_topics: set = set()             # Clients that never subscribed
+        self.frames_conflated = 0
+        self.frames_dropped = 0
+        self.slow_disconnects = 0
         self.running = False
         self.positions = {}
         self.signals_queue = asyncio.Queue()
+        self.terminal = MT5Executor()
+        self.outbox = TradeOutbox() if self.owns_terminal else None
+        self.signal_cache = SignalCache()
+        self.position_tracker = PositionTracker()
+        self.last_snapshot = 0.0
+        self.http: Optional[aiohttp.ClientSession] = None
+        self.http_slots: Optional[asyncio.Semaphore] = None
+
+    def get_http_session(self) -> aiohttp.ClientSession:
+        """Shared connection-pooled backend session, created on first use inside the loop"""
+        if self.http is None or self.http.closed:
+            connector = aiohttp.TCPConnector(
+                limit=BACKEND_MAX_CONNECTIONS,
+                keepalive_timeout=BACKEND_KEEPALIVE
+            )
+            self.http = aiohttp.ClientSession(
+                connector=connector,
+                headers={'Authorization': f'Bearer {BACKEND_API_KEY}'},
+                timeout=aiohttp.ClientTimeout(total=BACKEND_TIMEOUT)
+            )
+            self.http_slots = asyncio.Semaphore(BACKEND_MAX_CONCURRENCY)
+        return self.http
+
+    async def backend_request(self, method: str, path: str, timeout: float = None, **kwargs):
+        """
+        Send one backend request without blocking the event loop.
+        Returns (status, parsed JSON body or None). At most BACKEND_MAX_CONCURRENCY
+        requests are in flight; each one is bounded by its own deadline.
+        """
+        session = self.get_http_session()
+        deadline = aiohttp.ClientTimeout(total=timeout or BACKEND_TIMEOUT)
+        route = '/'.join(path.split('/')[:3])    # e.g. /api/signals, without the symbol
+        status = 'error'
+        start = time.perf_counter()
+        try:
+            async with self.http_slots:
+                async with session.request(method, f"{BACKEND_URL}{path}",
+                                           timeout=deadline, **kwargs) as response:
+                    status = response.status
+                    data = None
+                    if response.content_type == 'application/json':
+                        data = await response.json()
+                    return response.status, data
+        except asyncio.TimeoutError:
+            status = 'timeout'
+            raise
+        finally:
+            BACKEND_LATENCY.observe(time.perf_counter() - start, method, route, status)
 
     async def initialize_mt5(self) -> bool:
         """Initialize MT5 connection"""
+        self.connected = await self.terminal.write(self._initialize_mt5)
+        return self.connected
+
+    def _initialize_mt5(self) -> bool:
+        """Connect and log in (runs on the terminal thread)"""
         try:
             if not mt5.initialize():
                 logger.error(f"MT5 initialization failed: {mt5.last_error()}")
@@ -121,346 +702,655 @@ class MT5Bridge:
                 logger.info(f"Account Equity: ${account_info.equity}")
                 logger.info(f"Account Leverage: 1:{account_info.leverage}")
 
-            self.connected = True
             return True
 
         except Exception as e:
             logger.error(f"Error initializing MT5: {e}")
             return False
 
-    async def start_websocket_server(self):
-        """Start WebSocket server for EA communication"""
+    async def start_websocket_server(self, sock=None):
+        """Start WebSocket server for EA communication (on `sock` if given, e.g. a shared listener)"""
         try:
             logger.info(f"Starting WebSocket server on {WEBSOCKET_HOST}:{WEBSOCKET_PORT}")
 
-            async with websockets.serve(self.handle_client, WEBSOCKET_HOST, WEBSOCKET_PORT):
+            if sock is not None:
+                server = websockets.serve(self.handle_client, sock=sock)
+            else:
+                server = websockets.serve(self.handle_client, WEBSOCKET_HOST, WEBSOCKET_PORT)
+
+            async with server:
                 logger.info("WebSocket server started successfully")
                 await asyncio.Future()  # Run forever
 
         except Exception as e:
             logger.error(f"WebSocket server error: {e}")
 
-    async def handle_client(self, websocket, path):
+    async def handle_client(self, websocket, path: Optional[str] = None):
         """Handle individual WebSocket client connections"""
-        self.clients.add(websocket)
+        if path is None:
+            # websockets >= 10.1 no longer passes the path; read it from the handshake
+            request = getattr(websocket, 'request', None)
+            path = request.path if request is not None else getattr(websocket, 'path', '')
+        client = BridgeClient(websocket, self.negotiate_codec(path))
+        self.clients[websocket] = client
+        self.all_topics.add(client)
         client_info = f"{websocket.remote_address[0]}:{websocket.remote_address[1]}"
         logger.info(f"Client connected: {client_info}")
 
+        client.writer = asyncio.ensure_future(self.write_loop(client))
+
         try:
-            # Send welcome message
-            await websocket.send(json.dumps({
+            # Send welcome message (always JSON, so any client can read the negotiated format)
+            self.enqueue(client, JSON_CODEC.encode({
                 'type': 'connection',
                 'status': 'connected',
-                'timestamp': datetime.now().isoformat()
+                'format': client.codec.name,
+                'formats': list(CODECS),
+                'position_fields': POSITION_WIRE_FIELDS,
+                'timestamp': time.time()
             }))
 
+            # Give the new client a baseline for subsequent position deltas
+            if self.last_snapshot:
+                self.send(client, self.position_snapshot_frame())
+
+            # Handle requests concurrently; the slot limit bounds how far we read ahead
             async for message in websocket:
-                await self.process_message(websocket, message)
+                await client.slots.acquire()
+                task = asyncio.ensure_future(self.process_message(client, message))
+                client.tasks.add(task)
+                task.add_done_callback(functools.partial(self._request_done, client))
 
-        except websockets.exceptions.ConnectionClosed:
+        except ConnectionClosed:
             logger.info(f"Client disconnected: {client_info}")
         except Exception as e:
             logger.error(f"Error handling client {client_info}: {e}")
         finally:
-            self.clients.remove(websocket)
+            client.closing = True
+            client.writer.cancel()
+            self.unsubscribe(client)
+            self.all_topics.discard(client)
+            del self.clients[websocket]
+
+    @staticmethod
+    def _request_done(client: BridgeClient, task: asyncio.Future):
+        client.tasks.discard(task)
+        client.slots.release()
+
+    @staticmethod
+    def negotiate_codec(path: Optional[str]):
+        """Wire format requested with ?format=... on the WebSocket URL (JSON by default)"""
+        requested = parse_qs(urlparse(path or '').query).get('format', ['json'])[0]
+        if requested not in CODECS:
+            logger.warning(f"Unsupported wire format '{requested}', using json")
+        return CODECS.get(requested, JSON_CODEC)
+
+    def send(self, client: BridgeClient, frame: Dict):
+        """Encode a frame in the client's format and queue it for the client's writer"""
+        key = STATE_FRAMES.get(frame.get('type')) if 'id' not in frame else None
+        self.enqueue(client, client.codec.encode(frame), key)
+
+    def enqueue(self, client: BridgeClient, message, key: Optional[str] = None):
+        """Queue an encoded frame, conflating state frames and shedding slow consumers"""
+        if client.closing:
+            client.dropped += 1
+            self.frames_dropped += 1
+            return
+
+        if not client.enqueue(message, key):
+            self.frames_conflated += 1
+
+        if len(client.queue) > CLIENT_QUEUE_MAX or client.lag() > CLIENT_SLOW_TIMEOUT:
+            self.disconnect_slow_client(client)
+
+    def disconnect_slow_client(self, client: BridgeClient):
+        """Drop a client that cannot keep up instead of buffering for it without bound"""
+        address = client.websocket.remote_address
+        logger.warning(f"Disconnecting slow client {address[0]}:{address[1]}: "
+                       f"{len(client.queue)} frames queued, oldest {client.lag():.1f}s")
+        self.slow_disconnects += 1
+        client.closing = True
+        client.dropped += len(client.queue)
+        self.frames_dropped += len(client.queue)
+        client.queue.clear()
+        client.state_entries.clear()
+        if client.writer is not None:
+            client.writer.cancel()
+        task = asyncio.ensure_future(client.websocket.close(code=1013, reason='slow consumer'))
+        client.tasks.add(task)
+        task.add_done_callback(client.tasks.discard)
+
+    async def write_loop(self, client: BridgeClient):
+        """Drain one client's outbound queue; a slow socket only ever stalls this task"""
+        try:
+            while True:
+                if not client.queue:
+                    client.ready.clear()
+                    await client.ready.wait()
+                    continue
+
+                entry = client.queue.popleft()
+                key, message, _ = entry
+                if key is not None and client.state_entries.get(key) is entry:
+                    del client.state_entries[key]
+                if message is RESYNC:
+                    keep = record_filter(*client.filter_key()) if client.symbols or client.magics else None
+                    message = client.codec.encode(self.position_snapshot_frame(keep))
+
+                await client.websocket.send(message)
+        except ConnectionClosed:
+            client.closing = True
+
+    def subscribe(self, client: BridgeClient, topics: Optional[List[str]] = None,
+                  symbols: Optional[List[str]] = None, magics: Optional[List[int]] = None):
+        """Add topics and symbol/magic filters to a client's subscription"""
+        if client.topics is None:
+            self.all_topics.discard(client)
+            client.topics = set()
+        for topic in (topics or TOPICS):
+            client.topics.add(topic)
+            self.topic_index.setdefault(topic, set()).add(client)
+        client.symbols.update(symbols or ())
+        client.magics.update(magics or ())
+
+    def unsubscribe(self, client: BridgeClient, topics: Optional[List[str]] = None,
+                    symbols: Optional[List[str]] = None, magics: Optional[List[int]] = None):
+        """Remove topics or filters; with no arguments, drop every subscription"""
+        if client.topics is None:
+            self.all_topics.discard(client)
+            client.topics = set()
+        if not (topics or symbols or magics):
+            topics = list(client.topics)
+            client.symbols.clear()
+            client.magics.clear()
+        for topic in (topics or ()):
+            client.topics.discard(topic)
+            subscribers = self.topic_index.get(topic)
+            if subscribers is not None:
+                subscribers.discard(client)
+                if not subscribers:
+                    del self.topic_index[topic]
+        client.symbols.difference_update(symbols or ())
+        client.magics.difference_update(magics or ())
+
+    def subscription_frame(self, client: BridgeClient) -> Dict:
+        return {
+            'type': 'subscribed',
+            'topics': sorted(client.topics) if client.topics is not None else list(TOPICS),
+            'symbols': sorted(client.symbols),
+            'magics': sorted(client.magics)
+        }
+
+    async def process_message(self, client: BridgeClient, message):
+        """Decode one request (JSON text or MessagePack binary frame) and dispatch it"""
+        try:
+            if isinstance(message, bytes):
+                if msgpack is None:
+                    raise ValueError("binary frame received but msgpack is not installed")
+                data = CODECS['msgpack'].decode(message)
+            else:
+                data = JSON_CODEC.decode(message)
+        except ValueError as e:
+            logger.error(f"Invalid message: {e}")
+            return
+
+        if not isinstance(data, dict):
+            logger.error(f"Invalid message: expected an object, got {type(data).__name__}")
+            self.send(client, {'type': 'error', 'error': "Message must be an object"})
+            return
 
-    async def process_message(self, websocket, message: str):
-        """Process incoming WebSocket messages"""
         try:
-            data = json.loads(message)
             message_type = data.get('type')
 
             logger.debug(f"Received message type: {message_type}")
 
-            if message_type == 'heartbeat':
-                await websocket.send(json.dumps({
-                    'type': 'heartbeat_ack',
-                    'timestamp': datetime.now().isoformat()
-                }))
-
-            elif message_type == 'request_signal':
-                symbol = data.get('symbol')
-                signal = await self.get_signal_from_backend(symbol)
-                await websocket.send(json.dumps({
-                    'type': 'signal',
-                    'data': asdict(signal) if signal else None
-                }))
-
-            elif message_type == 'execute_trade':
-                signal_data = data.get('signal')
-                result = await self.execute_trade(TradeSignal(**signal_data))
-                await websocket.send(json.dumps({
-                    'type': 'trade_result',
-                    'data': asdict(result)
-                }))
-
-            elif message_type == 'get_positions':
-                positions = await self.get_positions()
-                await websocket.send(json.dumps({
-                    'type': 'positions',
-                    'data': positions
-                }))
-
-            elif message_type == 'get_account_info':
-                account_info = await self.get_account_info()
-                await websocket.send(json.dumps({
-                    'type': 'account_info',
-                    'data': account_info
-                }))
-
-            elif message_type == 'close_position':
-                ticket = data.get('ticket')
-                result = await self.close_position(ticket)
-                await websocket.send(json.dumps({
-                    'type': 'close_result',
-                    'data': result
-                }))
-
-            else:
+            entry = MESSAGE_HANDLERS.get(message_type)
+            if entry is None:
                 logger.warning(f"Unknown message type: {message_type}")
+                self.reply(client, data, {'type': 'error', 'error': f"Unknown message type: {message_type}"})
+                return
+
+            handler, ordered = entry
+            with MESSAGE_LATENCY.time(message_type):
+                if ordered:
+                    async with client.ordered:
+                        frame = await handler(self, client, data)
+                else:
+                    frame = await handler(self, client, data)
+
+                if frame is not None:
+                    self.reply(client, data, frame)
 
-        except json.JSONDecodeError as e:
-            logger.error(f"Invalid JSON: {e}")
         except Exception as e:
             logger.error(f"Error processing message: {e}")
+            self.reply(client, data, {'type': 'error', 'error': str(e)})
+
+    def reply(self, client: BridgeClient, request: Dict, frame: Dict):
+        """Send a reply, echoing the request id so the client can correlate it"""
+        request_id = request.get('id') if isinstance(request, dict) else None
+        if request_id is not None:
+            frame['id'] = request_id
+        self.send(client, frame)
+
+    @handles('heartbeat')
+    async def on_heartbeat(self, client: BridgeClient, data: Dict) -> Dict:
+        return {'type': 'heartbeat_ack', 'timestamp': time.time()}
+
+    @handles('request_signal')
+    async def on_request_signal(self, client: BridgeClient, data: Dict) -> Dict:
+        signal = await self.get_signal_from_backend(data.get('symbol'))
+        return {'type': 'signal', 'data': asdict(signal) if signal else None}
+
+    @handles('execute_trade', ordered=True)
+    async def on_execute_trade(self, client: BridgeClient, data: Dict) -> Dict:
+        result = await self.execute_trade(TradeSignal(**data.get('signal')))
+        return {'type': 'trade_result', 'data': asdict(result)}
+
+    @handles('get_positions')
+    async def on_get_positions(self, client: BridgeClient, data: Dict) -> Dict:
+        return {'type': 'positions', 'data': await self.get_positions()}
+
+    @handles('get_account_info')
+    async def on_get_account_info(self, client: BridgeClient, data: Dict) -> Dict:
+        return {'type': 'account_info', 'data': await self.get_account_info()}
+
+    @handles('close_position', ordered=True)
+    async def on_close_position(self, client: BridgeClient, data: Dict) -> Dict:
+        return {'type': 'close_result', 'data': await self.close_position(data.get('ticket'))}
+
+    @handles('subscribe')
+    async def on_subscribe(self, client: BridgeClient, data: Dict) -> None:
+        self.subscribe(client, data.get('topics'), data.get('symbols'), data.get('magics'))
+        self.reply(client, data, self.subscription_frame(client))
+
+        # Fresh baseline for the new filter
+        if TOPIC_POSITIONS in client.topics and self.last_snapshot:
+            keep = record_filter(*client.filter_key())
+            self.send(client, self.position_snapshot_frame(keep))
+
+    @handles('unsubscribe')
+    async def on_unsubscribe(self, client: BridgeClient, data: Dict) -> Dict:
+        self.unsubscribe(client, data.get('topics'), data.get('symbols'), data.get('magics'))
+        return self.subscription_frame(client)
+
+    @handles('set_format')
+    async def on_set_format(self, client: BridgeClient, data: Dict) -> Dict:
+        client.codec = CODECS.get(data.get('format'), client.codec)
+        return {'type': 'format', 'format': client.codec.name}
+
+    @handles('get_stats')
+    async def on_get_stats(self, client: BridgeClient, data: Dict) -> Dict:
+        return {'type': 'stats', 'data': self.get_stats()}
+
+    def get_stats(self) -> Dict:
+        """Cache, terminal, outbox and fan-out counters"""
+        stats = {
+            'signal_cache': self.signal_cache.stats(),
+            'terminal': {'calls': self.terminal.calls, 'coalesced': self.terminal.coalesced},
+            'clients': len(self.clients),
+            'outbound': {
+                'queue_depth': sum(len(c.queue) for c in self.clients.values()),
+                'max_queue_depth': max((len(c.queue) for c in self.clients.values()), default=0),
+                'conflated': self.frames_conflated,
+                'dropped': self.frames_dropped,
+                'slow_disconnects': self.slow_disconnects
+            }
+        }
+        if self.outbox is not None:
+            stats['outbox'] = {
+                'pending': len(self.outbox.pending),
+                'sent_batches': self.outbox.sent_batches,
+                'sent_fills': self.outbox.sent_fills
+            }
+        return stats
 
     async def get_signal_from_backend(self, symbol: str) -> Optional[TradeSignal]:
-        """Get trading signal from backend API"""
+        """Get trading signal from backend API (cached per symbol)"""
         try:
-            headers = {'Authorization': f'Bearer {BACKEND_API_KEY}'}
-            response = requests.get(
-                f"{BACKEND_URL}/api/signals/{symbol}",
-                headers=headers,
-                timeout=10
-            )
-
-            if response.status_code == 200:
-                data = response.json()
-                if data.get('signal'):
-                    return TradeSignal(**data['signal'])
+            return await self.signal_cache.get(symbol, self._fetch_signal)
 
+        except asyncio.TimeoutError:
+            logger.error(f"Backend signal request timed out for {symbol}")
             return None
-
         except Exception as e:
             logger.error(f"Error getting signal from backend: {e}")
             return None
 
+    async def _fetch_signal(self, symbol: str) -> Optional[TradeSignal]:
+        """Uncached backend lookup; raises on transport errors so they are not cached"""
+        status, data = await self.backend_request('GET', f"/api/signals/{symbol}")
+
+        if status == 200 and data:
+            if data.get('signal'):
+                return TradeSignal(**data['signal'])
+            return None
+
+        raise RuntimeError(f"backend returned {status}")
+
     async def execute_trade(self, signal: TradeSignal) -> TradeResult:
         """Execute trade on MT5"""
         try:
-            # Prepare request
-            symbol = signal.symbol
-            order_type = mt5.ORDER_TYPE_BUY if signal.type == 'BUY' else mt5.ORDER_TYPE_SELL
+            trade_result = await self.terminal.write(self._send_trade, signal)
 
-            # Get symbol info
-            symbol_info = mt5.symbol_info(symbol)
-            if symbol_info is None:
-                return TradeResult(
-                    success=False,
-                    error_message=f"Symbol {symbol} not found"
-                )
+            if trade_result.success:
+                # Journal the fill; the outbox flusher delivers it to the backend
+                await self.notify_backend_trade(trade_result)
 
-            # Enable symbol if needed
-            if not symbol_info.visible:
-                if not mt5.symbol_select(symbol, True):
-                    return TradeResult(
-                        success=False,
-                        error_message=f"Failed to select symbol {symbol}"
-                    )
-
-            # Prepare trade request
-            point = symbol_info.point
-            price = signal.entry
-
-            request = {
-                "action": mt5.TRADE_ACTION_DEAL,
-                "symbol": symbol,
-                "volume": signal.lot_size,
-                "type": order_type,
-                "price": price,
-                "sl": signal.stop_loss,
-                "tp": signal.take_profit,
-                "deviation": 20,
-                "magic": 234000,
-                "comment": signal.comment,
-                "type_time": mt5.ORDER_TIME_GTC,
-                "type_filling": mt5.ORDER_FILLING_IOC,
-            }
+            return trade_result
 
-            # Send order
-            result = mt5.order_send(request)
+        except Exception as e:
+            logger.error(f"Error executing trade: {e}")
+            return TradeResult(
+                success=False,
+                error_message=str(e)
+            )
 
-            if result.retcode != mt5.TRADE_RETCODE_DONE:
-                return TradeResult(
-                    success=False,
-                    error_code=result.retcode,
-                    error_message=f"Order failed: {result.comment}"
-                )
+    def _send_trade(self, signal: TradeSignal) -> TradeResult:
+        """Validate the symbol and send the order (runs on the terminal thread)"""
+        # Prepare request
+        symbol = signal.symbol
+        order_type = mt5.ORDER_TYPE_BUY if signal.type == 'BUY' else mt5.ORDER_TYPE_SELL
 
-            # Success
-            trade_result = TradeResult(
-                success=True,
-                ticket=result.order,
-                symbol=symbol,
-                type=signal.type,
-                volume=signal.lot_size,
-                price=result.price,
-                sl=signal.stop_loss,
-                tp=signal.take_profit
+        # Get symbol info
+        symbol_info = mt5.symbol_info(symbol)
+        if symbol_info is None:
+            return TradeResult(
+                success=False,
+                error_message=f"Symbol {symbol} not found"
             )
 
-            logger.info(f"Trade executed: {symbol} {signal.type} {signal.lot_size} @ {result.price}")
-
-            # Notify backend
-            await self.notify_backend_trade(trade_result)
+        # Enable symbol if needed
+        if not symbol_info.visible:
+            if not mt5.symbol_select(symbol, True):
+                return TradeResult(
+                    success=False,
+                    error_message=f"Failed to select symbol {symbol}"
+                )
 
-            return trade_result
+        # Prepare trade request
+        point = symbol_info.point
+        price = signal.entry
+
+        request = {
+            "action": mt5.TRADE_ACTION_DEAL,
+            "symbol": symbol,
+            "volume": signal.lot_size,
+            "type": order_type,
+            "price": price,
+            "sl": signal.stop_loss,
+            "tp": signal.take_profit,
+            "deviation": 20,
+            "magic": 234000,
+            "comment": signal.comment,
+            "type_time": mt5.ORDER_TIME_GTC,
+            "type_filling": mt5.ORDER_FILLING_IOC,
+        }
+
+        # Send order
+        with TERMINAL_LATENCY.time('order_send'):
+            result = mt5.order_send(request)
 
-        except Exception as e:
-            logger.error(f"Error executing trade: {e}")
+        if result.retcode != mt5.TRADE_RETCODE_DONE:
             return TradeResult(
                 success=False,
-                error_message=str(e)
+                error_code=result.retcode,
+                error_message=f"Order failed: {result.comment}"
             )
 
+        # Success
+        trade_result = TradeResult(
+            success=True,
+            ticket=result.order,
+            symbol=symbol,
+            type=signal.type,
+            volume=signal.lot_size,
+            price=result.price,
+            sl=signal.stop_loss,
+            tp=signal.take_profit
+        )
+
+        logger.info(f"Trade executed: {symbol} {signal.type} {signal.lot_size} @ {result.price}")
+
+        return trade_result
+
     async def get_positions(self) -> List[Dict]:
-        """Get all open positions"""
+        """Get all open positions (the list may be shared with concurrent callers; do not mutate)"""
         try:
-            positions = mt5.positions_get()
-            if positions is None:
-                return []
-
-            position_list = []
-            for pos in positions:
-                position_list.append({
-                    'ticket': pos.ticket,
-                    'symbol': pos.symbol,
-                    'type': 'BUY' if pos.type == mt5.POSITION_TYPE_BUY else 'SELL',
-                    'volume': pos.volume,
-                    'price_open': pos.price_open,
-                    'price_current': pos.price_current,
-                    'sl': pos.sl,
-                    'tp': pos.tp,
-                    'profit': pos.profit,
-                    'swap': pos.swap,
-                    'comment': pos.comment
-                })
-
-            return position_list
-
+            return await self.terminal.read('positions', self._read_positions)
         except Exception as e:
             logger.error(f"Error getting positions: {e}")
             return []
 
-    async def get_account_info(self) -> Dict:
-        """Get account information"""
-        try:
-            account_info = mt5.account_info()
-            if account_info is None:
-                return {}
+    def _positions_raw(self):
+        """Timed mt5.positions_get() (runs on the terminal thread)"""
+        with TERMINAL_LATENCY.time('positions_get'):
+            return mt5.positions_get()
 
-            return {
-                'login': account_info.login,
-                'balance': account_info.balance,
-                'equity': account_info.equity,
-                'profit': account_info.profit,
-                'margin': account_info.margin,
-                'margin_free': account_info.margin_free,
-                'margin_level': account_info.margin_level,
-                'leverage': account_info.leverage,
-                'currency': account_info.currency
-            }
+    def _read_positions(self) -> List[Dict]:
+        """Snapshot open positions (runs on the terminal thread)"""
+        positions = self._positions_raw()
+        if positions is None:
+            return []
 
+        return [position_to_dict(pos) for pos in positions]
+
+    async def get_account_info(self) -> Dict:
+        """Get account information (the dict may be shared with concurrent callers; do not mutate)"""
+        try:
+            return await self.terminal.read('account_info', self._read_account_info)
         except Exception as e:
             logger.error(f"Error getting account info: {e}")
             return {}
 
+    def _read_account_info(self) -> Dict:
+        """Snapshot account state (runs on the terminal thread)"""
+        account_info = mt5.account_info()
+        if account_info is None:
+            return {}
+
+        return {
+            'login': account_info.login,
+            'balance': account_info.balance,
+            'equity': account_info.equity,
+            'profit': account_info.profit,
+            'margin': account_info.margin,
+            'margin_free': account_info.margin_free,
+            'margin_level': account_info.margin_level,
+            'leverage': account_info.leverage,
+            'currency': account_info.currency
+        }
+
     async def close_position(self, ticket: int) -> Dict:
         """Close position by ticket"""
         try:
-            position = mt5.positions_get(ticket=ticket)
-            if not position:
-                return {'success': False, 'error': 'Position not found'}
-
-            position = position[0]
-
-            # Prepare close request
-            request = {
-                "action": mt5.TRADE_ACTION_DEAL,
-                "symbol": position.symbol,
-                "volume": position.volume,
-                "type": mt5.ORDER_TYPE_SELL if position.type == mt5.POSITION_TYPE_BUY else mt5.ORDER_TYPE_BUY,
-                "position": ticket,
-                "price": mt5.symbol_info_tick(position.symbol).bid if position.type == mt5.POSITION_TYPE_BUY else mt5.symbol_info_tick(position.symbol).ask,
-                "deviation": 20,
-                "magic": 234000,
-                "comment": "Close by bridge",
-                "type_time": mt5.ORDER_TIME_GTC,
-                "type_filling": mt5.ORDER_FILLING_IOC,
-            }
+            return await self.terminal.write(self._close_position, ticket)
+        except Exception as e:
+            logger.error(f"Error closing position: {e}")
+            return {'success': False, 'error': str(e)}
 
+    def _close_position(self, ticket: int) -> Dict:
+        """Send the closing deal (runs on the terminal thread)"""
+        with TERMINAL_LATENCY.time('positions_get'):
+            position = mt5.positions_get(ticket=ticket)
+        if not position:
+            return {'success': False, 'error': 'Position not found'}
+
+        position = position[0]
+
+        # Prepare close request
+        request = {
+            "action": mt5.TRADE_ACTION_DEAL,
+            "symbol": position.symbol,
+            "volume": position.volume,
+            "type": mt5.ORDER_TYPE_SELL if position.type == mt5.POSITION_TYPE_BUY else mt5.ORDER_TYPE_BUY,
+            "position": ticket,
+            "price": mt5.symbol_info_tick(position.symbol).bid if position.type == mt5.POSITION_TYPE_BUY else mt5.symbol_info_tick(position.symbol).ask,
+            "deviation": 20,
+            "magic": 234000,
+            "comment": "Close by bridge",
+            "type_time": mt5.ORDER_TIME_GTC,
+            "type_filling": mt5.ORDER_FILLING_IOC,
+        }
+
+        with TERMINAL_LATENCY.time('order_send'):
             result = mt5.order_send(request)
 
-            if result.retcode != mt5.TRADE_RETCODE_DONE:
-                return {
-                    'success': False,
-                    'error': result.comment
-                }
-
-            logger.info(f"Position closed: {ticket}")
-            return {'success': True, 'ticket': ticket}
+        if result.retcode != mt5.TRADE_RETCODE_DONE:
+            return {
+                'success': False,
+                'error': result.comment
+            }
 
-        except Exception as e:
-            logger.error(f"Error closing position: {e}")
-            return {'success': False, 'error': str(e)}
+        logger.info(f"Position closed: {ticket}")
+        return {'success': True, 'ticket': ticket}
 
     async def notify_backend_trade(self, trade_result: TradeResult):
-        """Notify backend about trade execution"""
+        """Queue a backend notification for a fill in the durable outbox"""
         try:
-            headers = {
-                'Authorization': f'Bearer {BACKEND_API_KEY}',
-                'Content-Type': 'application/json'
-            }
+            await self.outbox.add(asdict(trade_result))
+        except Exception as e:
+            logger.error(f"Error journaling trade {trade_result.ticket}: {e}")
 
-            response = requests.post(
-                f"{BACKEND_URL}/api/trades/notify",
-                headers=headers,
-                json=asdict(trade_result),
-                timeout=10
+    async def send_trade_batch(self, trades: List[Dict]) -> bool:
+        """Post a batch of fills to the backend; True once acknowledged"""
+        try:
+            status, _ = await self.backend_request(
+                'POST', TRADE_NOTIFY_BATCH_PATH, json={'trades': trades}
             )
 
-            if response.status_code == 200:
-                logger.info("Backend notified successfully")
-            else:
-                logger.warning(f"Backend notification failed: {response.status_code}")
+            if status in (200, 201):
+                logger.info(f"Backend notified of {len(trades)} trades")
+                return True
 
+            logger.warning(f"Backend batch notification failed: {status}")
+            return False
+
+        except asyncio.TimeoutError:
+            logger.error("Backend batch notification timed out")
+            return False
         except Exception as e:
             logger.error(f"Error notifying backend: {e}")
+            return False
+
+    def position_snapshot_frame(self, keep: Optional[Callable] = None) -> Dict:
+        positions = self.position_tracker.snapshot()
+        return {
+            'type': 'position_update',
+            'data': [p for p in positions if keep(p)] if keep else positions,
+            'timestamp': time.time()
+        }
+
+    def subscribers(self, topic: str) -> List[BridgeClient]:
+        subscribers = self.topic_index.get(topic)
+        if subscribers:
+            return list(self.all_topics | subscribers)
+        return list(self.all_topics)
+
+    def publish(self, topic: str, build: Callable[[Callable], Optional[Dict]]):
+        """
+        Fan a frame out to the clients subscribed to `topic`.
+        `build(keep)` makes the frame for one symbol/magic filter (keep is None when
+        unfiltered) and may return None if nothing matches. It is called once per
+        distinct filter and each frame is encoded once per wire format, not once per client.
+        Frames only go into the clients' outbound queues, so no client's socket can
+        hold up the others.
+        """
+        with FANOUT_LATENCY.time(topic):
+            self._publish(topic, build)
+
+    def _publish(self, topic: str, build: Callable[[Callable], Optional[Dict]]):
+        groups: Dict[Tuple[frozenset, frozenset], Dict] = {}
+        for client in self.subscribers(topic):
+            by_codec = groups.setdefault(client.filter_key(), {})
+            by_codec.setdefault(client.codec, []).append(client)
+
+        for (symbols, magics), by_codec in groups.items():
+            frame = build(record_filter(symbols, magics) if symbols or magics else None)
+            if frame is None:
+                continue
+            key = STATE_FRAMES.get(frame['type'])
+            for codec, members in by_codec.items():
+                message = codec.encode(frame)
+                for client in members:
+                    self.enqueue(client, message, key)
+
+    def position_delta_frame(self, opened: List[Dict], modified: List[Dict], closed: List[Dict],
+                             keep: Optional[Callable] = None) -> Optional[Dict]:
+        if keep is not None:
+            opened = [p for p in opened if keep(p)]
+            modified = [p for p in modified if keep(p)]
+            closed = [p for p in closed if keep(p)]
+            if not (opened or modified or closed):
+                return None
+        return {
+            'type': 'position_delta',
+            'opened': opened,
+            'modified': modified,
+            'closed': [p['ticket'] for p in closed],
+            'timestamp': time.time()
+        }
+
+    def broadcast_positions(self, delta: Optional[Tuple[List, List, List]] = None):
+        """Publish the tracked positions: a full snapshot, or an (opened, modified, closed) delta"""
+        if delta is None:
+            self.publish(TOPIC_POSITIONS, self.position_snapshot_frame)
+        else:
+            self.publish(TOPIC_POSITIONS, functools.partial(self.position_delta_frame, *delta))
 
     async def monitor_positions(self):
-        """Monitor and update position status"""
+        """
+        Poll positions and broadcast what changed: a position_delta frame with opened,
+        modified and closed records, plus a full position_update every
+        POSITION_SNAPSHOT_INTERVAL so clients can resync.
+        """
         while self.running:
             try:
-                positions = await self.get_positions()
+                positions = await self.terminal.read('positions_raw', self._positions_raw)
 
-                # Broadcast position updates to all clients
-                if self.clients:
-                    message = json.dumps({
-                        'type': 'position_update',
-                        'data': positions,
-                        'timestamp': datetime.now().isoformat()
-                    })
+                # None means the terminal call failed; keep the last known state
+                if positions is not None:
+                    opened, modified, closed = self.position_tracker.update(positions)
 
-                    await asyncio.gather(
-                        *[client.send(message) for client in self.clients],
-                        return_exceptions=True
-                    )
+                    now = time.time()
+                    if now - self.last_snapshot >= POSITION_SNAPSHOT_INTERVAL:
+                        self.last_snapshot = now
+                        self.broadcast_positions()
+                    elif opened or modified or closed:
+                        self.broadcast_positions((opened, modified, closed))
 
-                await asyncio.sleep(5)  # Update every 5 seconds
+                await asyncio.sleep(POSITION_POLL_INTERVAL)
 
             except Exception as e:
                 logger.error(f"Error monitoring positions: {e}")
-                await asyncio.sleep(5)
+                await asyncio.sleep(POSITION_POLL_INTERVAL)
+
+    async def start_metrics(self, port: int):
+        """Register this bridge's gauges and serve /metrics on METRICS_HOST:port"""
+        if port <= 0:
+            return
+
+        METRICS.callback('bridge_clients', 'Connected WebSocket clients', lambda: len(self.clients))
+        METRICS.callback('bridge_outbound_queue_depth', 'Frames waiting in client outbound queues',
+                         lambda: sum(len(c.queue) for c in self.clients.values()))
+        METRICS.callback('bridge_frames_conflated_total', 'State frames replaced by newer ones before sending',
+                         lambda: self.frames_conflated, 'counter')
+        METRICS.callback('bridge_frames_dropped_total', 'Frames dropped for closing or slow clients',
+                         lambda: self.frames_dropped, 'counter')
+        METRICS.callback('bridge_slow_disconnects_total', 'Clients disconnected as slow consumers',
+                         lambda: self.slow_disconnects, 'counter')
+        METRICS.callback('bridge_signal_cache_hits_total', 'Signal requests served from cache',
+                         lambda: self.signal_cache.hits, 'counter')
+        METRICS.callback('bridge_signal_cache_misses_total', 'Signal requests sent to the backend',
+                         lambda: self.signal_cache.misses, 'counter')
+        if self.outbox is not None:
+            METRICS.callback('bridge_outbox_pending', 'Fills journaled but not yet delivered',
+                             lambda: len(self.outbox.pending))
+
+        try:
+            await METRICS.start_server(METRICS_HOST, port)
+            logger.info(f"Metrics available at http://{METRICS_HOST}:{port}/metrics")
+        except OSError as e:
+            logger.error(f"Metrics endpoint unavailable on port {port}: {e}")
 
     async def run(self):
         """Main run loop"""
@@ -474,11 +1364,15 @@ class MT5Bridge:
         logger.info("MT5 Bridge is running...")
         logger.info("Press Ctrl+C to stop")
 
+        await self.start_metrics(METRICS_PORT)
+
         try:
-            # Run WebSocket server and position monitor concurrently
+            # Run WebSocket server, position monitor and outbox flusher concurrently
             await asyncio.gather(
                 self.start_websocket_server(),
-                self.monitor_positions()
+                self.monitor_positions(),
+                self.outbox.run(self.send_trade_batch),
+                METRICS.monitor_loop_lag()
             )
         except KeyboardInterrupt:
             logger.info("Shutting down...")
@@ -496,14 +1390,28 @@ class MT5Bridge:
                 return_exceptions=True
             )
 
-        # Shutdown MT5
-        mt5.shutdown()
+        # Stop flushing; undelivered fills stay journaled for the next run
+        self.outbox.close()
+
+        # Release pooled backend connections
+        if self.http is not None and not self.http.closed:
+            await self.http.close()
+
+        await METRICS.stop_server()
+
+        # Shutdown MT5 on the terminal thread, after any queued jobs
+        await self.terminal.write(mt5.shutdown)
+        self.terminal.shutdown()
         logger.info("MT5 Bridge shutdown complete")
 
 
 async def main():
     """Main entry point"""
-    bridge = MT5Bridge()
+    if BRIDGE_WORKERS > 0:
+        from bridge_cluster import OwnerBridge
+        bridge = OwnerBridge(BRIDGE_WORKERS)
+    else:
+        bridge = MT5Bridge()
     await bridge.run()
 
 
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+MT5 Bridge - Tests
+Runs the bridge against the in-process fake terminal from Include/ultrabot_fakemt5.py
+"""
+
+import asyncio
+import importlib
+import os
+import sys
+import threading
+
+import pytest
+
+pytest.importorskip('aiohttp')
+pytest.importorskip('websockets')
+pytest.importorskip('dotenv')
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, '..', 'Include'))
+
+import ultrabot_fakemt5  # noqa: E402
+
+
+@pytest.fixture(scope='module')
+def terminal():
+    return ultrabot_fakemt5.install()
+
+
+@pytest.fixture
+def bridge_module(terminal, tmp_path, monkeypatch):
+    """mt5_bridge imported against the fake terminal, with its log file and outbox in tmp_path"""
+    monkeypatch.chdir(tmp_path)
+    if 'mt5_bridge' in sys.modules:
+        return sys.modules['mt5_bridge']
+    return importlib.import_module('mt5_bridge')
+
+
+def test_reads_do_not_coalesce_across_a_queued_trade(bridge_module):
+    async def scenario():
+        bridge = bridge_module.MT5Bridge()
+        executor = bridge.terminal
+        gate = threading.Event()
+        try:
+            # Hold the terminal thread so the jobs below queue up behind it
+            blocked = asyncio.ensure_future(executor.write(gate.wait))
+            await asyncio.sleep(0)
+
+            before = [asyncio.ensure_future(bridge.get_positions()) for _ in range(2)]
+            await asyncio.sleep(0)
+            trade = asyncio.ensure_future(bridge.execute_trade(bridge_module.TradeSignal(
+                symbol='AAPL', type='BUY', entry=0.0, stop_loss=0.0, take_profit=0.0,
+                lot_size=0.1, comment='test', strategy='test', confidence=80)))
+            await asyncio.sleep(0)
+            after = asyncio.ensure_future(bridge.get_positions())
+            await asyncio.sleep(0)
+
+            gate.set()
+            await blocked
+            first, second = await asyncio.gather(*before)
+            result, positions = await trade, await after
+        finally:
+            bridge.outbox.close()
+            executor.shutdown()
+
+        assert result.success
+        assert first is second and first == []     # Identical reads shared one call
+        assert [p['ticket'] for p in positions] == [result.ticket]
+        assert executor.coalesced == 1
+        assert executor.calls == 4                 # gate, one shared read, the trade, a fresh read
+
+    asyncio.run(scenario())
+
+
+def test_outbox_survives_a_restart(bridge_module, tmp_path):
+    path = str(tmp_path / 'outbox.jsonl')
+    backend_down = asyncio.Event()      # Never set: the second batch hangs like an outage
+
+    async def first_run():
+        outbox = bridge_module.TradeOutbox(path, batch_size=2, flush_interval=0.01)
+        batches = []
+
+        async def send(fills):
+            batches.append([f['ticket'] for f in fills])
+            if len(batches) > 1:
+                await backend_down.wait()
+            return True
+
+        for ticket in (1, 2, 3):
+            assert await outbox.add({'ticket': ticket, 'symbol': 'AAPL'})
+        assert not await outbox.add({'ticket': 2, 'symbol': 'AAPL'})
+
+        flusher = asyncio.ensure_future(outbox.run(send))
+        while len(batches) < 2:
+            await asyncio.sleep(0.01)
+        flusher.cancel()
+        outbox.close()
+        return batches
+
+    assert asyncio.run(first_run()) == [[1, 2], [3]]
+    assert os.path.exists(path + '.offset')
+
+    # A crash mid-append leaves a torn line behind
+    with open(path, 'ab') as f:
+        f.write(b'{"ticket": 4, "sym')
+
+    async def second_run():
+        outbox = bridge_module.TradeOutbox(path, batch_size=2, flush_interval=0.01)
+        try:
+            pending = [record['ticket'] for _, record in outbox.pending]
+            duplicate = not await outbox.add({'ticket': 3, 'symbol': 'AAPL'})
+            assert await outbox.add({'ticket': 4, 'symbol': 'AAPL'})
+            return pending, duplicate, [record['ticket'] for _, record in outbox.pending]
+        finally:
+            outbox.close()
+
+    pending, duplicate, requeued = asyncio.run(second_run())
+    assert pending == [3]           # Only the unacknowledged fill is replayed
+    assert duplicate
+    assert requeued == [3, 4]
+    with open(path, 'rb') as f:
+        assert f.read().endswith(b'"ticket": 4, "symbol": "AAPL"}\n')
+
+
+class StalledSocket:
+    """WebSocket stand-in whose sends never complete once `stall` is set"""
+
+    remote_address = ('127.0.0.1', 50000)
+
+    def __init__(self):
+        self.sent = []
+        self.stall = asyncio.Event()
+        self.resume = asyncio.Event()
+        self.closed_with = None
+
+    async def send(self, message):
+        if self.stall.is_set():
+            await self.resume.wait()
+        self.sent.append(message)
+
+    async def close(self, code=1000, reason=''):
+        self.closed_with = code
+
+
+def test_queue_overflow_resyncs_then_disconnects(bridge_module, monkeypatch):
+    monkeypatch.setattr(bridge_module, 'CLIENT_QUEUE_MAX', 8)
+    codec = bridge_module.JSON_CODEC
+
+    async def scenario():
+        bridge = bridge_module.MT5Bridge()
+        socket = StalledSocket()
+        client = bridge_module.BridgeClient(socket)
+        client.writer = asyncio.ensure_future(bridge.write_loop(client))
+        await asyncio.sleep(0)
+        delta = bridge.position_delta_frame([], [], [])
+        try:
+            # A delta superseded while still queued goes out as a fresh snapshot
+            bridge.send(client, delta)
+            bridge.send(client, delta)
+            assert client.queue[0][1] is bridge_module.RESYNC
+            await asyncio.sleep(0.01)
+            assert [codec.decode(m)['type'] for m in socket.sent] == ['position_update']
+
+            # A consumer that stops reading is shed once its queue passes the limit
+            socket.stall.set()
+            bridge.send(client, delta)
+            await asyncio.sleep(0.01)           # The writer is now stuck in send()
+            for i in range(8):
+                bridge.send(client, delta)      # Conflates into a single RESYNC entry
+                bridge.send(client, {'type': 'heartbeat_ack', 'id': i})
+            assert client.closing and not client.queue
+            bridge.send(client, delta)          # Dropped: the client is on its way out
+            await asyncio.sleep(0.01)
+            return bridge, client, socket
+        finally:
+            bridge.outbox.close()
+            bridge.terminal.shutdown()
+
+    bridge, client, socket = asyncio.run(scenario())
+    assert bridge.frames_conflated == 1 + 7
+    assert bridge.slow_disconnects == 1
+    assert socket.closed_with == 1013
+    assert client.writer.cancelled()
+    assert client.dropped == bridge.frames_dropped == 9 + 1
+
+
+def test_replies_echo_ids_and_non_objects_are_rejected(bridge_module):
+    codec = bridge_module.JSON_CODEC
+
+    async def scenario():
+        bridge = bridge_module.MT5Bridge()
+        client = bridge_module.BridgeClient(StalledSocket())
+        try:
+            for message in ('[1, 2]', '"heartbeat"', '{"type": "heartbeat", "id": 7}',
+                            '{"type": "nonsense", "id": 8}', 'not json'):
+                await bridge.process_message(client, message)
+        finally:
+            bridge.outbox.close()
+            bridge.terminal.shutdown()
+        return [codec.decode(message) for _, message, _ in client.queue]
+
+    frames = asyncio.run(scenario())
+    assert [(f['type'], f.get('id')) for f in frames] == [
+        ('error', None), ('error', None), ('heartbeat_ack', 7), ('error', 8)]